@@ -0,0 +1,32 @@
+"""Offline benchmarks and checks for the Film2Subtitle API.
+
+The pages in the `fixtures` directory are synthetic: they were written by hand
+after the markup of film2subtitle.com, they are not recordings of the website.
+They are used instead of the live website, so everything here runs offline.
+"""
+
+import os
+from pathlib import Path
+from typing import Dict
+
+# Importing the handler package loads the application settings, provide
+# dummy values for the required ones so the benchmarks run without a `.env`.
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("FIRST_SUPERUSER", "benchmark")
+os.environ.setdefault("FIRST_SUPERUSER_EMAIL", "benchmark@example.com")
+os.environ.setdefault("FIRST_SUPERUSER_PASSWORD", "benchmark")
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# Maps the fixture file names to the kind of page they contain.
+FIXTURES: Dict[str, str] = {
+    "synthetic_search_page.html": "search",
+    "synthetic_search_page_empty.html": "search",
+    "synthetic_movie_download_page.html": "download",
+    "synthetic_series_download_page.html": "download",
+}
+
+
+def load_fixture(name: str) -> str:
+    """Return the HTML markup of a fixture page."""
+    return (FIXTURES_DIR / name).read_text(encoding="utf-8")
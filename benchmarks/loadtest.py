@@ -0,0 +1,227 @@
+"""Load test the `/api/v1/subs/*` endpoints of a running API at a target rate.
+
+Requests are sent open-loop: they are started on schedule whether or not the
+previous ones have finished, and latencies are measured from the scheduled
+start, so a slow server can't hide its queueing time by slowing the driver down.
+Run the API against the stand-in upstream (`python -m benchmarks.upstream`)
+to avoid requesting the live website.
+
+Scenarios:
+    `search`: `/search/legacy` with a random query and page.
+    `download`: `/download` with a random subtitle URL.
+    `stream`: `/search/legacy/stream` with a random query (reads the whole stream).
+    `mixed`: 60% `search`, 30% `download` and 10% `stream` requests.
+
+Usage:
+    python -m benchmarks.loadtest [--url http://127.0.0.1:8000] [--scenario mixed]
+                                  [--rps 50] [--duration 30] [--keys 100]
+                                  [--max-inflight 1000] [--save results.json]
+                                  [--compare baseline.json]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+API_PREFIX = "/api/v1/subs"
+SLUGS = (
+    "andor-8",
+    "avengers-age-of-ultron-2",
+    "avengers-endgame-0",
+    "avengers-infinity-war-3",
+    "dune-5",
+    "ozark-4",
+    "severance-7",
+    "the-avengers-1",
+    "the-batman-6",
+    "top-gun-maverick-9",
+)
+
+# (path, query parameters) of a request
+Target = Tuple[str, Dict[str, str]]
+
+
+def _search(keys: int) -> Target:
+    params = {"query": f"query {random.randrange(keys)}", "page": random.randint(1, 3)}
+    return f"{API_PREFIX}/search/legacy", params
+
+
+def _download(keys: int) -> Target:
+    slug = f"{random.choice(SLUGS)}-{random.randrange(keys)}"
+    return f"{API_PREFIX}/download", {"url": f"https://film2subtitle.com/{slug}/"}
+
+
+def _stream(keys: int) -> Target:
+    params = {"query": f"query {random.randrange(keys)}", "max_pages": 3}
+    return f"{API_PREFIX}/search/legacy/stream", params
+
+
+SCENARIOS: Dict[str, List[Tuple[Callable[[int], Target], float]]] = {
+    "search": [(_search, 1.0)],
+    "download": [(_download, 1.0)],
+    "stream": [(_stream, 1.0)],
+    "mixed": [(_search, 0.6), (_download, 0.3), (_stream, 0.1)],
+}
+
+
+@dataclass
+class Report:
+    """Summary of a load test run."""
+
+    scenario: str
+    target_rps: float
+    duration: float
+    sent: int = 0
+    completed: int = 0
+    throughput: float = 0.0
+    p50_ms: float = 0.0
+    p95_ms: float = 0.0
+    p99_ms: float = 0.0
+    max_ms: float = 0.0
+    errors: Dict[str, int] = field(default_factory=dict)
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Return the :param:`q` percentile (nearest rank) of sorted values."""
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(q / 100 * len(values)) - 1)]
+
+
+async def run(
+    url: str,
+    scenario: str,
+    rps: float,
+    duration: float,
+    keys: int,
+    max_inflight: int,
+    timeout: float,
+) -> Report:
+    """Send the requests of a scenario at :param:`rps` for :param:`duration`
+    seconds and return the report of the run. Only the latencies of the
+    successful responses are counted in the percentiles.
+    """
+    choices, weights = zip(*SCENARIOS[scenario])
+    latencies: List[float] = []
+    errors: Counter = Counter()
+    inflight = 0
+
+    async def send(client: httpx.AsyncClient, scheduled: float) -> None:
+        nonlocal inflight
+        path, params = random.choices(choices, weights)[0](keys)
+        try:
+            async with client.stream("GET", path, params=params) as response:
+                await response.aread()
+            if response.status_code >= 400:
+                errors[str(response.status_code)] += 1
+            else:
+                latencies.append(time.perf_counter() - scheduled)
+        except httpx.HTTPError as e:
+            errors[type(e).__name__] += 1
+        finally:
+            inflight -= 1
+
+    limits = httpx.Limits(max_connections=max_inflight, max_keepalive_connections=None)
+    async with httpx.AsyncClient(
+        base_url=url,
+        limits=limits,
+        timeout=timeout,
+    ) as client:
+        tasks = []
+        total = int(rps * duration)
+        started = time.perf_counter()
+        for i in range(total):
+            scheduled = started + i / rps
+            if (delay := scheduled - time.perf_counter()) > 0:
+                await asyncio.sleep(delay)
+            if inflight >= max_inflight:
+                # the server can't keep up, don't pile up more requests
+                errors["dropped"] += 1
+                continue
+            inflight += 1
+            tasks.append(asyncio.ensure_future(send(client, scheduled)))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return Report(
+        scenario=scenario,
+        target_rps=rps,
+        duration=elapsed,
+        sent=len(tasks),
+        completed=len(latencies),
+        throughput=len(latencies) / elapsed,
+        p50_ms=percentile(latencies, 50) * 1000,
+        p95_ms=percentile(latencies, 95) * 1000,
+        p99_ms=percentile(latencies, 99) * 1000,
+        max_ms=(latencies[-1] if latencies else 0.0) * 1000,
+        errors=dict(errors),
+    )
+
+
+def print_report(report: Report, baseline: Optional[dict] = None) -> None:
+    print(f"scenario     {report.scenario} @ {report.target_rps:g} rps")
+    print(f"duration     {report.duration:.1f} s")
+    print(f"sent         {report.sent}")
+    print(f"completed    {report.completed}")
+    for name in ("throughput", "p50_ms", "p95_ms", "p99_ms", "max_ms"):
+        value = getattr(report, name)
+        line = f"{name:<13}{value:.2f}"
+        if baseline and baseline.get(name):
+            line += f"  ({(value - baseline[name]) / baseline[name]:+.1%})"
+        print(line)
+    for error, count in sorted(report.errors.items()):
+        print(f"error        {error}: {count}")
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--url", default="http://127.0.0.1:8000")
+    arg_parser.add_argument("--scenario", choices=SCENARIOS, default="mixed")
+    arg_parser.add_argument("--rps", type=float, default=50)
+    arg_parser.add_argument("--duration", type=float, default=30, help="in seconds")
+    arg_parser.add_argument(
+        "--keys",
+        type=int,
+        default=100,
+        help="number of distinct queries and URLs (lower means more cache hits)",
+    )
+    arg_parser.add_argument("--max-inflight", type=int, default=1000)
+    arg_parser.add_argument("--timeout", type=float, default=30, help="in seconds")
+    arg_parser.add_argument("--save", help="save the report to a JSON file")
+    arg_parser.add_argument("--compare", help="compare with a saved JSON report")
+    args = arg_parser.parse_args()
+
+    report = asyncio.run(
+        run(
+            args.url,
+            args.scenario,
+            args.rps,
+            args.duration,
+            args.keys,
+            args.max_inflight,
+            args.timeout,
+        ),
+    )
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+    print_report(report, baseline)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(asdict(report), file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""Measure the memory used by cached search results and download pages.
+
+Every fixture page is parsed :param:`--copies` times (like the distinct pages
+of a busy worker) and the results are stored in a `MemoryCache`. The benchmark
+reports the bytes allocated per cached entry and per cached article, measured
+with :mod:`tracemalloc`. Save the results of a build with `--save` and compare
+another build with `--compare` to see the difference.
+
+Usage:
+    python -m benchmarks.memory [--copies N] [--save results.json]
+                                [--compare baseline.json]
+"""
+
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from typing import Dict, List, Tuple
+
+from benchmarks import FIXTURES, load_fixture
+from film2subtitle.app.handler import Film2Subtitle
+from film2subtitle.app.handler.cache import MemoryCache
+
+
+def cache_pages(fixture: str, kind: str, copies: int) -> Tuple[int, int]:
+    """Parse a fixture :param:`copies` times and cache the results.
+
+    Returns:
+        `Tuple[int, int]`: The allocated bytes and the number of cached articles.
+    """
+    parsers = (
+        Film2Subtitle.LEGACY_SEARCH_PARSERS
+        if kind == "search"
+        else Film2Subtitle.DOWNLOAD_PAGE_PARSERS
+    )
+    parser = parsers["lxml"]
+    markup = load_fixture(fixture)
+    cache = MemoryCache(ttl=float("inf"), max_entries=copies)
+    articles = 0
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i in range(copies):
+        result = parser.from_markup(markup).parse()
+        articles += len(result.results if kind == "search" else result.articles)
+        cache.set(f"{fixture}:{i}", result)
+        del result
+    gc.collect()
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return allocated, articles
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--copies", type=int, default=500)
+    arg_parser.add_argument("--save", help="save the results to a JSON file")
+    arg_parser.add_argument("--compare", help="compare with a saved JSON file")
+    args = arg_parser.parse_args()
+
+    baseline: Dict[str, dict] = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    print(
+        f"{'fixture':<38}{'entries':>8}{'articles':>10}{'bytes/entry':>13}"
+        f"{'bytes/article':>15}{'baseline':>10}{'change':>9}",
+    )
+    results: Dict[str, dict] = {}
+    rows: List[str] = []
+    for fixture, kind in FIXTURES.items():
+        allocated, articles = cache_pages(fixture, kind, args.copies)
+        per_entry = allocated / args.copies
+        per_article = allocated / articles if articles else 0.0
+        results[fixture] = {"per_entry": per_entry, "per_article": per_article}
+        row = (
+            f"{fixture:<38}{args.copies:>8}{articles:>10}{per_entry:>13.0f}"
+            f"{per_article:>15.0f}"
+        )
+        if fixture in baseline:
+            before = baseline[fixture]["per_entry"]
+            row += f"{before:>10.0f}{(per_entry - before) / before:>+9.0%}"
+        rows.append(row)
+    print("\n".join(rows))
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""Compare building the whole soup with building only the subtrees declared
+by the `PARSE_ONLY` filter of the `bs4` parsers.
+
+For each fixture page and HTML parser it reports the time to build the soup
+and parse it, the number of memory blocks allocated by a run and the peak
+memory (see :func:`benchmarks.utils.measure`).
+
+Usage:
+    python -m benchmarks.parse_only [--repeat N]
+"""
+
+import argparse
+
+from bs4 import BeautifulSoup
+
+from benchmarks import FIXTURES, load_fixture
+from benchmarks.utils import measure
+from film2subtitle.app.handler import Film2Subtitle
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--repeat", type=int, default=20)
+    args = arg_parser.parse_args()
+
+    header = f"{'fixture':<38}{'html parser':<13}{'mode':<12}"
+    print(f"{header}{'time (ms)':>11}{'blocks':>10}{'peak (KiB)':>12}")
+    for fixture, kind in FIXTURES.items():
+        parser_cls = (
+            Film2Subtitle.LEGACY_SEARCH_PARSERS
+            if kind == "search"
+            else Film2Subtitle.DOWNLOAD_PAGE_PARSERS
+        )["bs4"]
+        markup = load_fixture(fixture)
+        # html5lib doesn't support parse-only filters
+        for html_parser in ("lxml", "html.parser"):
+            modes = {
+                "full": lambda: parser_cls(BeautifulSoup(markup, html_parser)).parse(),
+                "parse only": lambda: parser_cls.from_markup(
+                    markup, html_parser
+                ).parse(),
+            }
+            for mode, func in modes.items():
+                m = measure(func, args.repeat)
+                print(
+                    f"{fixture:<38}{html_parser:<13}{mode:<12}"
+                    f"{m.best_ms:>11.2f}{m.blocks:>10}{m.peak_kib:>12.0f}",
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Benchmark the page parsers on the fixture pages.
+
+For every `html_parser` choice (`lxml`, `html5lib`, `html.parser`) it reports
+the run time, allocated memory blocks and peak memory of:
+
+- building the soup of each page,
+- `LegacySearchParser` and `DownloadPageParser` (end to end and on a prebuilt soup),
+- `_parse_metadata` on all the articles of the page,
+- `_metadata_mapper` on all the metadata of the page,
+
+and of the `lxml` parser backend for comparison. Results can be saved as JSON
+and compared with a previous run to catch regressions.
+
+Usage:
+    python -m benchmarks.parsers [--repeat N] [--filter TEXT]
+                                 [--save results.json]
+                                 [--compare baseline.json] [--threshold 0.2]
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import asdict
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from bs4 import BeautifulSoup
+
+from benchmarks import FIXTURES, load_fixture
+from benchmarks.utils import Measurement, measure
+from film2subtitle.app.handler import Film2Subtitle
+
+from film2subtitle.app.handler.parsers import (  # isort:skip
+    _metadata_mapper,
+    _parse_metadata,
+)
+
+# (case name, fixture, html parser) -> function to benchmark
+Case = Tuple[str, str, str]
+
+
+def _metadata_pairs(soup: BeautifulSoup) -> List[Tuple[str, str]]:
+    """Return the cleaned up (key, value) metadata pairs of all the articles."""
+    pairs = []
+    for side in soup.find_all(class_=["sub-meta-left", "sub-meta-right"]):
+        key, value = side.get_text(strip=True).split(":", 1)
+        key = key.replace(" ", "").replace("-", "").lower()
+        pairs.append((key, value.replace("\n", "").strip()))
+    return pairs
+
+
+def iter_cases() -> Iterator[Tuple[Case, Callable[[], object]]]:
+    """Iterate over the benchmark cases and the functions to measure.
+
+    The functions use the loop variables, so each one must be measured before
+    the iteration continues.
+    """
+    for fixture, kind in FIXTURES.items():
+        markup = load_fixture(fixture)
+        parsers = (
+            Film2Subtitle.LEGACY_SEARCH_PARSERS
+            if kind == "search"
+            else Film2Subtitle.DOWNLOAD_PAGE_PARSERS
+        )
+        bs4_parser, lxml_parser = parsers["bs4"], parsers["lxml"]
+        for html_parser in sorted(Film2Subtitle.VALID_HTML_PARSERS):
+            soup = BeautifulSoup(markup, html_parser)
+            articles = soup.find_all(class_="sub-article-detail")
+            pairs = _metadata_pairs(soup)
+            yield (
+                ("BeautifulSoup", fixture, html_parser),
+                lambda: BeautifulSoup(markup, html_parser),
+            )
+            yield (
+                (f"{bs4_parser.__name__}.from_markup", fixture, html_parser),
+                lambda: bs4_parser.from_markup(markup, html_parser).parse(),
+            )
+            if kind == "download" and not soup.find(class_="sub-download-box"):
+                continue
+            yield (
+                (f"{bs4_parser.__name__}.parse", fixture, html_parser),
+                lambda: bs4_parser(soup).parse(),
+            )
+            if articles:
+                yield (
+                    ("_parse_metadata", fixture, html_parser),
+                    lambda: [_parse_metadata(article) for article in articles],
+                )
+                yield (
+                    ("_metadata_mapper", fixture, html_parser),
+                    lambda: [_metadata_mapper({}, k, v) for k, v in pairs],
+                )
+        yield (
+            (f"{lxml_parser.__name__}.from_markup", fixture, "-"),
+            lambda: lxml_parser.from_markup(markup).parse(),
+        )
+
+
+def compare(
+    results: Dict[str, Measurement],
+    baseline: Dict[str, dict],
+    threshold: float,
+) -> List[str]:
+    """Return the cases that got slower than the baseline by more than the threshold."""
+    regressions = []
+    for key, m in results.items():
+        if key not in baseline:
+            continue
+        before = baseline[key]["best_ms"]
+        if before and (m.best_ms - before) / before > threshold:
+            regressions.append(f"{key}: {before:.2f} ms -> {m.best_ms:.2f} ms")
+    return regressions
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--repeat", type=int, default=10)
+    arg_parser.add_argument("--filter", default="", help="only run matching cases")
+    arg_parser.add_argument("--save", help="save the results to a JSON file")
+    arg_parser.add_argument("--compare", help="compare with a saved JSON file")
+    arg_parser.add_argument("--threshold", type=float, default=0.2)
+    args = arg_parser.parse_args()
+
+    print(
+        f"{'case':<40}{'fixture':<38}{'parser':<13}{'best (ms)':>10}"
+        f"{'mean (ms)':>11}{'blocks':>9}{'alloc (KiB)':>13}{'peak (KiB)':>12}",
+    )
+    results: Dict[str, Measurement] = {}
+    for (name, fixture, html_parser), func in iter_cases():
+        if args.filter not in f"{name} {fixture} {html_parser}":
+            continue
+        m = measure(func, args.repeat)
+        results[f"{name}|{fixture}|{html_parser}"] = m
+        print(
+            f"{name:<40}{fixture:<38}{html_parser:<13}{m.best_ms:>10.2f}"
+            f"{m.mean_ms:>11.2f}{m.blocks:>9}{m.allocated_kib:>13.1f}{m.peak_kib:>12.1f}",
+        )
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump({k: asdict(m) for k, m in results.items()}, file, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""Compare `Film2Subtitle.search` (wp-json) with `Film2Subtitle.legacy_search`.
+
+Both methods search the local stand-in server (`benchmarks.upstream`) and the
+benchmark reports:
+
+- whether both methods return the same articles,
+- the size of the upstream responses,
+- the time and memory of decoding a response into a `LegacySearchResult`,
+- the end to end throughput of the methods (without caching).
+
+By default the stand-in runs in process (no network). Pass the URL of a running
+stand-in (`python -m benchmarks.upstream`) to include the network and its
+latency settings.
+
+Usage:
+    python -m benchmarks.search_backends [--url http://127.0.0.1:8080]
+                                         [--repeat N] [--requests N]
+                                         [--concurrency N]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from dataclasses import asdict
+from typing import Awaitable, Callable, Optional
+
+import httpx
+
+from benchmarks.upstream import UpstreamConfig, create_app
+from benchmarks.utils import measure
+from film2subtitle.app.handler import Film2Subtitle
+from film2subtitle.app.handler.wp_json import POST_FIELDS, parse_posts
+
+
+def create_handler(url: Optional[str]) -> Film2Subtitle:
+    """Create an API handler (without caches) requesting the stand-in server."""
+    api = Film2Subtitle(max_validators=0, base_url=url)
+    if url is None:
+        transport = httpx.ASGITransport(create_app(UpstreamConfig()))
+        api._client = httpx.AsyncClient(transport=transport)
+    return api
+
+
+async def run_load(
+    func: Callable[[int], Awaitable[object]],
+    requests: int,
+    concurrency: int,
+) -> float:
+    """Call :param:`func` :param:`requests` times and return the calls per second."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call(i: int) -> None:
+        async with semaphore:
+            await func(i)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(call(i) for i in range(requests)))
+    return requests / (time.perf_counter() - started)
+
+
+async def main_async(args: argparse.Namespace) -> int:
+    api = create_handler(args.url)
+    query = "avengers"
+    try:
+        # parity of the search methods
+        legacy = await api.legacy_search(query)
+        wp = await api.search(query)
+        same = [asdict(a) for a in legacy.results] == [asdict(a) for a in wp.results]
+        print(f"{'same articles':<28}{'yes' if same else 'NO'}")
+
+        # size of the responses and decoding cost
+        html = (await api.request("GET", f"/?s={query}")).content
+        response = await api.request(
+            "GET",
+            "/wp-json/wp/v2/posts",
+            params={"search": query, "_fields": POST_FIELDS},
+        )
+        parser = api.LEGACY_SEARCH_PARSERS[api.parser_backend]
+        print(f"{'legacy response (KiB)':<28}{len(html) / 1024:.1f}")
+        print(f"{'wp-json response (KiB)':<28}{len(response.content) / 1024:.1f}")
+        for name, func in (
+            (
+                "legacy decode",
+                lambda: parser.from_markup(html, api.html_parser).parse(),
+            ),
+            ("wp-json decode", lambda: parse_posts(json.loads(response.content), 1)),
+        ):
+            m = measure(func, args.repeat)
+            print(
+                f"{name + ' (ms)':<28}{m.best_ms:.2f} best, {m.mean_ms:.2f} mean, "
+                f"{m.peak_kib:.1f} KiB peak",
+            )
+
+        # end to end throughput, every call searches another query
+        for name, search in (
+            ("legacy_search", api.legacy_search),
+            ("search", api.search),
+        ):
+            rate = await run_load(
+                lambda i: search(f"{query} {i}"),
+                args.requests,
+                args.concurrency,
+            )
+            print(f"{name + ' (calls/sec)':<28}{rate:.1f}")
+    finally:
+        await api.close()
+    return 0 if same else 1
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--url", help="URL of a running stand-in server")
+    arg_parser.add_argument("--repeat", type=int, default=20)
+    arg_parser.add_argument("--requests", type=int, default=200)
+    arg_parser.add_argument("--concurrency", type=int, default=10)
+    return asyncio.run(main_async(arg_parser.parse_args()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
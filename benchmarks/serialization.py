@@ -0,0 +1,96 @@
+"""Compare the serialization of the `/subs` responses before and after the
+`ORJSONResponse` fast path.
+
+For every result page parsed from the fixtures, the benchmark reports the time
+and peak memory of:
+
+- `response_model`: what FastAPI does when an endpoint returns the dataclasses
+  (convert them to dicts, validate them into the pydantic response model, run
+  `jsonable_encoder` on it and encode it with `json`),
+- `orjson`: encoding the dataclasses with `ORJSONResponse` directly,
+
+and checks that both produce the same JSON document.
+
+Usage:
+    python -m benchmarks.serialization [--repeat N]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from dataclasses import replace
+from typing import Any, Iterator, Tuple
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from benchmarks import FIXTURES, load_fixture
+from benchmarks.utils import measure
+from film2subtitle.app.api.v1.endpoints.subtitles import router
+from film2subtitle.app.handler import Film2Subtitle
+
+
+def response_field(path: str) -> Any:
+    """Return the response model field FastAPI validates the results of
+    :param:`path` with.
+    """
+    route = next(r for r in router.routes if isinstance(r, APIRoute) and r.path == path)
+    return route.secure_cloned_response_field
+
+
+def iter_results() -> Iterator[Tuple[str, str, Any]]:
+    """Iterate over the (case name, endpoint path, result) of the fixtures."""
+    for fixture, kind in FIXTURES.items():
+        if kind == "search":
+            parser = Film2Subtitle.LEGACY_SEARCH_PARSERS["lxml"]
+            result = parser.from_markup(load_fixture(fixture)).parse()
+            yield f"{fixture} ({len(result.results)})", "/search", result
+            if result.results:
+                # a full page of the wp-json search (`per_page=100`)
+                full = replace(result, results=(result.results * 100)[:100])
+                yield f"{fixture} (100)", "/search", full
+        else:
+            parser = Film2Subtitle.DOWNLOAD_PAGE_PARSERS["lxml"]
+            result = parser.from_markup(load_fixture(fixture)).parse()
+            yield fixture, "/download", result
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--repeat", type=int, default=200)
+    args = arg_parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    same = True
+    print(
+        f"{'case':<38}{'size (KiB)':>11}{'response_model (ms)':>21}"
+        f"{'orjson (ms)':>13}{'speedup':>9}{'peak (KiB)':>16}",
+    )
+    for name, path, result in iter_results():
+        field = response_field(path)
+
+        def before() -> bytes:
+            content = loop.run_until_complete(
+                serialize_response(field=field, response_content=result),
+            )
+            return JSONResponse(content).body
+
+        def after() -> bytes:
+            return ORJSONResponse(result).body
+
+        same = same and json.loads(before()) == json.loads(after())
+        slow = measure(before, args.repeat)
+        fast = measure(after, args.repeat)
+        print(
+            f"{name:<38}{len(after()) / 1024:>11.1f}{slow.best_ms:>21.3f}"
+            f"{fast.best_ms:>13.3f}{slow.best_ms / fast.best_ms:>8.1f}x"
+            f"{slow.peak_kib:>8.1f} / {fast.peak_kib:<6.1f}",
+        )
+    loop.close()
+    print(f"\n{'same JSON documents':<38}{'yes' if same else 'NO'}")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
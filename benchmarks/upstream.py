@@ -0,0 +1,313 @@
+"""A local stand-in for the film2subtitle.com website.
+
+It serves the fixture pages with configurable latency, jitter, error rates and
+slow bodies, so the API can be load tested without requesting the live website.
+Point the API at it with the `UPSTREAM_BASE_URL` setting.
+
+Routes:
+    `/?s=QUERY`, `/page/N/?s=QUERY`: a search page (`404` after `--pages` pages,
+    the empty search page for queries starting with `empty`).
+    `/SLUG/`: a movie or series download page (chosen by the slug).
+    `/wp-json/wp/v2/posts?search=QUERY&page=N&per_page=N`: the articles of the
+    search page as WordPress REST API posts (repeated for `--pages` pages).
+    `/wp-sitemap.xml`, `/wp-sitemap-posts-post-1.xml`: the WordPress sitemap
+    of the articles of the search page.
+    `/YEAR/NAME.zip`: a subtitle archive (a Persian SRT file encoded in cp1256),
+    like the links of the download boxes.
+
+Usage:
+    python -m benchmarks.upstream [--host 127.0.0.1] [--port 8080]
+                                  [--latency MS] [--jitter MS]
+                                  [--error STATUS=RATE ...]
+                                  [--slow-rate RATE] [--chunk-size BYTES]
+                                  [--chunk-delay MS] [--etag] [--pages N]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import html
+import io
+import json
+import math
+import random
+import re
+import sys
+import zipfile
+import zlib
+from dataclasses import asdict, dataclass, field
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import (
+    JSONResponse,
+    PlainTextResponse,
+    Response,
+    StreamingResponse,
+)
+from starlette.routing import Route
+
+from benchmarks import load_fixture
+from film2subtitle.app.handler.parsers import METADATA_MAP, LegacySearchParser
+
+DOWNLOAD_PAGES = (
+    "synthetic_movie_download_page.html",
+    "synthetic_series_download_page.html",
+)
+SITEMAP_TEMPLATE = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<{tag}set xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</{tag}set>'
+)
+
+
+@dataclass
+class UpstreamConfig:
+    """Behavior of the stand-in server.
+
+    Parameters:
+        latency (`float`): Time to first byte of every response in seconds.
+        jitter (`float`): Maximum random time added to the latency in seconds.
+        errors (`Dict[int, float]`): Maps status codes to the ratio of the
+        responses that fail with them (e.g. `{404: 0.01, 503: 0.05}`).
+        slow_rate (`float`): Ratio of the responses that send their body in
+        chunks of `chunk_size` bytes with `chunk_delay` seconds between them.
+        etag (`bool`): Whether to send `ETag` headers and answer conditional
+        requests with `304 Not Modified`.
+        pages (`int`): Number of pages of every search query.
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    errors: Dict[int, float] = field(default_factory=dict)
+    slow_rate: float = 0.0
+    chunk_size: int = 4096
+    chunk_delay: float = 0.01
+    etag: bool = False
+    pages: int = 7
+
+    def __post_init__(self) -> None:
+        if sum(self.errors.values()) > 1:
+            raise ValueError("The sum of the error rates must not exceed 1.")
+
+
+def _pick_error(errors: Dict[int, float]) -> Optional[int]:
+    """Return a status code to fail with or `None` to succeed."""
+    roll = random.random()
+    for status_code, rate in errors.items():
+        if roll < rate:
+            return status_code
+        roll -= rate
+    return None
+
+
+def _posts(markup: str) -> List[dict]:
+    """Return the articles of a search page as posts of the WordPress REST API
+    (only the fields requested by `Film2Subtitle.search`).
+    """
+    posts = []
+    for article in LegacySearchParser.from_markup(markup, "lxml").iter_articles():
+        metadata = asdict(article.metadata)
+        lines = [
+            f"{label}: {', '.join(value) if isinstance(value, list) else value}"
+            for label, key in METADATA_MAP.items()
+            if (value := metadata.get(key))
+        ]
+        if metadata["imdb_id"]:
+            lines.append(
+                f'<a href="https://www.imdb.com/title/{metadata["imdb_id"]}/">IMDb</a>',
+            )
+        posts.append(
+            {
+                "link": article.url,
+                "title": {"rendered": html.escape(article.title)},
+                "excerpt": {"rendered": f"<p>{'<br />'.join(lines)}</p>"},
+                "jetpack_featured_media_url": article.thumbnail,
+            },
+        )
+    return posts
+
+
+def subtitle_archive(name: str, cues: int = 800) -> bytes:
+    """Return a zip archive with a Persian SRT file (encoded in cp1256, like
+    most of the subtitles of the website) for an archive :param:`name`.
+    """
+    lines = []
+    for i in range(cues):
+        start, end = i * 3, i * 3 + 2
+        lines.append(
+            f"{i + 1}\r\n"
+            f"00:{start // 60 % 60:02}:{start % 60:02},{i % 1000:03} --> "
+            f"00:{end // 60 % 60:02}:{end % 60:02},500\r\n"
+            # the Arabic yeh (not the Persian one, which cp1256 lacks)
+            f"<i>اين زيرنويس شماره {i + 1} است</i>\r\n"
+            f"ترجمه از تيم Film2Subtitle\r\n\r\n",
+        )
+    stem = name.rsplit(".", 1)[0]
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(f"{stem}.srt", "".join(lines).encode("cp1256"))
+    return buffer.getvalue()
+
+
+def create_app(config: UpstreamConfig) -> Starlette:
+    """Create the stand-in server application."""
+    pages = {
+        name: load_fixture(name).encode()
+        for name in (
+            "synthetic_search_page.html",
+            "synthetic_search_page_empty.html",
+            *DOWNLOAD_PAGES,
+        )
+    }
+    posts = _posts(load_fixture("synthetic_search_page.html"))
+
+    async def serve(
+        request: Request,
+        body: bytes,
+        media_type: str = "text/html",
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Response:
+        await asyncio.sleep(config.latency + random.uniform(0, config.jitter))
+        if status_code := _pick_error(config.errors):
+            return PlainTextResponse(f"Error {status_code}", status_code=status_code)
+        headers = dict(headers or {})
+        if config.etag:
+            headers["ETag"] = etag = f'"{hashlib.md5(body).hexdigest()}"'
+            if request.headers.get("If-None-Match") == etag:
+                return Response(status_code=304, headers=headers)
+        if random.random() >= config.slow_rate:
+            return Response(body, media_type=media_type, headers=headers)
+
+        async def chunks() -> AsyncIterator[bytes]:
+            for start in range(0, len(body), config.chunk_size):
+                yield body[start : start + config.chunk_size]
+                await asyncio.sleep(config.chunk_delay)
+
+        return StreamingResponse(chunks(), media_type=media_type, headers=headers)
+
+    async def search(request: Request) -> Response:
+        page = int(request.path_params.get("page", 1))
+        if page > config.pages:
+            return PlainTextResponse("Not Found", status_code=404)
+        query = request.query_params.get("s", "")
+        if query.startswith("empty"):
+            return await serve(request, pages["synthetic_search_page_empty.html"])
+        return await serve(request, pages["synthetic_search_page.html"])
+
+    async def wp_posts(request: Request) -> Response:
+        page = int(request.query_params.get("page", 1))
+        per_page = int(request.query_params.get("per_page", 10))
+        query = request.query_params.get("search", "")
+        total = 0 if query.startswith("empty") else config.pages * len(posts)
+        total_pages = math.ceil(total / per_page)
+        if page > max(total_pages, 1):
+            return JSONResponse(
+                {
+                    "code": "rest_post_invalid_page_number",
+                    "message": "The page number requested is larger than "
+                    "the number of pages available.",
+                    "data": {"status": 400},
+                },
+                status_code=400,
+            )
+        start = (page - 1) * per_page
+        body = json.dumps(
+            [posts[i % len(posts)] for i in range(start, min(start + per_page, total))],
+        ).encode()
+        headers = {"X-WP-Total": str(total), "X-WP-TotalPages": str(total_pages)}
+        return await serve(request, body, "application/json", headers)
+
+    article_urls = sorted(
+        set(
+            re.findall(
+                r'href="(https://film2subtitle\.com/[\w-]+/)"',
+                load_fixture("synthetic_search_page.html"),
+            ),
+        ),
+    )
+    sitemap_index = SITEMAP_TEMPLATE.format(
+        tag="sitemapindex",
+        entries=(
+            "<sitemap><loc>https://film2subtitle.com/wp-sitemap-posts-post-1.xml"
+            "</loc></sitemap>"
+        ),
+    )
+    posts_sitemap = SITEMAP_TEMPLATE.format(
+        tag="url",
+        entries="".join(
+            f"<url><loc>{url}</loc><lastmod>2022-06-01T00:00:00+00:00</lastmod></url>"
+            for url in article_urls
+        ),
+    )
+
+    async def sitemap(request: Request) -> Response:
+        await asyncio.sleep(config.latency + random.uniform(0, config.jitter))
+        body = sitemap_index if request.url.path == "/wp-sitemap.xml" else posts_sitemap
+        return Response(body, media_type="application/xml")
+
+    async def download(request: Request) -> Response:
+        slug = request.path_params["slug"]
+        name = DOWNLOAD_PAGES[zlib.crc32(slug.encode()) % len(DOWNLOAD_PAGES)]
+        return await serve(request, pages[name])
+
+    async def archive(request: Request) -> Response:
+        body = subtitle_archive(request.path_params["name"])
+        return await serve(request, body, "application/zip")
+
+    return Starlette(
+        routes=[
+            Route("/", search),
+            Route("/page/{page:int}/", search),
+            Route("/wp-json/wp/v2/posts", wp_posts),
+            Route("/wp-sitemap.xml", sitemap),
+            Route("/wp-sitemap-posts-post-1.xml", sitemap),
+            Route("/{slug}/", download),
+            Route("/{year:int}/{name}", archive),
+        ],
+    )
+
+
+def _parse_error(value: str) -> Tuple[int, float]:
+    status_code, rate = value.split("=", 1)
+    return int(status_code), float(rate)
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--port", type=int, default=8080)
+    arg_parser.add_argument("--latency", type=float, default=0, help="in ms")
+    arg_parser.add_argument("--jitter", type=float, default=0, help="in ms")
+    arg_parser.add_argument(
+        "--error",
+        type=_parse_error,
+        action="append",
+        default=[],
+        metavar="STATUS=RATE",
+        help="fail the given ratio of the responses (e.g. 503=0.05)",
+    )
+    arg_parser.add_argument("--slow-rate", type=float, default=0)
+    arg_parser.add_argument("--chunk-size", type=int, default=4096)
+    arg_parser.add_argument("--chunk-delay", type=float, default=10, help="in ms")
+    arg_parser.add_argument("--etag", action="store_true")
+    arg_parser.add_argument("--pages", type=int, default=7)
+    args = arg_parser.parse_args()
+
+    config = UpstreamConfig(
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        errors=dict(args.error),
+        slow_rate=args.slow_rate,
+        chunk_size=args.chunk_size,
+        chunk_delay=args.chunk_delay / 1000,
+        etag=args.etag,
+        pages=args.pages,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable
+
+__all__ = ["Measurement", "measure"]
+
+
+@dataclass
+class Measurement:
+    """Time and memory usage of a benchmarked function."""
+
+    best_ms: float
+    mean_ms: float
+    blocks: int
+    allocated_kib: float
+    peak_kib: float
+
+
+def measure(func: Callable[[], object], repeat: int = 10) -> Measurement:
+    """Run a function :param:`repeat` times and measure it.
+
+    The run times are measured first. Then one more run is traced with
+    :mod:`tracemalloc` to count the memory blocks it allocated (and didn't
+    free) and its peak memory usage. The garbage collector is disabled while
+    tracing, since BeautifulSoup trees have reference cycles and would
+    otherwise be freed at random points of the measurement.
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    gc.collect()
+    gc.disable()
+    try:
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        result = func()
+        current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        del result
+    finally:
+        gc.enable()
+    diff = after.compare_to(before, "lineno")
+    return Measurement(
+        best_ms=min(timings) * 1000,
+        mean_ms=sum(timings) / len(timings) * 1000,
+        blocks=sum(stat.count_diff for stat in diff),
+        allocated_kib=sum(stat.size_diff for stat in diff) / 1024,
+        peak_kib=peak / 1024,
+    )
@@ -1,10 +1,16 @@
+from typing import List
+
 from fastapi import APIRouter, Depends, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
-from film2subtitle.app import schemas
+from film2subtitle.app import crud, schemas
 from film2subtitle.app.api.dependency import get_db
+from film2subtitle.app.core.config import settings
+from film2subtitle.app.handler import api_handler
+from film2subtitle.app.models import CrawlState
 
 router = APIRouter(prefix="/health", tags=["Health"])
 
@@ -28,3 +34,164 @@ async def health_check(db: Session = Depends(get_db)) -> JSONResponse:
     return JSONResponse(
         content={"status": "available"},
     )
+
+
+@router.get(
+    "/cache",
+    response_model=schemas.CacheStats,
+    response_description="Result cache statistics.",
+)
+async def cache_stats() -> schemas.CacheStats:
+    """Report the hit/miss counters of the search and download page cache."""
+    if api_handler.cache is None:
+        return schemas.CacheStats(enabled=False)
+    # the size of the sqlite cache is counted with a query
+    stats = await run_in_threadpool(lambda: api_handler.cache.stats)
+    return schemas.CacheStats(
+        enabled=True,
+        backend=stats.backend,
+        hits=stats.hits,
+        stale_hits=stats.stale_hits,
+        misses=stats.misses,
+        evictions=stats.evictions,
+        size=stats.size,
+        max_entries=stats.max_entries,
+        hit_ratio=stats.hit_ratio,
+    )
+
+
+@router.get(
+    "/files",
+    response_model=schemas.FileCacheStats,
+    response_description="Subtitle file cache statistics.",
+)
+async def file_cache_stats() -> schemas.FileCacheStats:
+    """Report the disk usage and hit/miss counters of the subtitle file cache."""
+    if api_handler.files is None:
+        return schemas.FileCacheStats(enabled=False)
+    stats = api_handler.files.stats
+    return schemas.FileCacheStats(
+        enabled=True,
+        files=stats.files,
+        size=stats.size,
+        max_size=stats.max_size,
+        hits=stats.hits,
+        misses=stats.misses,
+        evictions=stats.evictions,
+        hit_ratio=stats.hit_ratio,
+    )
+
+
+@router.get(
+    "/upstream",
+    response_model=schemas.ConnectionPoolStats,
+    response_description="Upstream connection pool statistics.",
+)
+async def upstream_stats() -> schemas.ConnectionPoolStats:
+    """Report the occupancy and wait times of the upstream connection pool."""
+    limits = api_handler.limits
+    stats = api_handler.pool_stats
+    return schemas.ConnectionPoolStats(
+        http2=api_handler.http2,
+        max_connections=limits.max_connections or 0,
+        max_keepalive_connections=limits.max_keepalive_connections or 0,
+        keepalive_expiry=limits.keepalive_expiry or 0.0,
+        max_connections_per_host=stats.max_connections_per_host,
+        in_use=stats.in_use,
+        waiting=stats.waiting,
+        requests=stats.requests,
+        avg_wait=stats.avg_wait,
+        max_wait=stats.max_wait,
+        per_host=stats.per_host,
+    )
+
+
+@router.get(
+    "/limiter",
+    response_model=schemas.LimiterStats,
+    response_description="Upstream limiter statistics.",
+)
+async def limiter_stats() -> schemas.LimiterStats:
+    """Report the concurrency window, rate and queue wait times of the upstream
+    limiter.
+    """
+    stats = api_handler.limiter_stats
+    if stats is None:
+        return schemas.LimiterStats(enabled=False)
+    return schemas.LimiterStats(
+        enabled=True,
+        limit=stats.limit,
+        min_limit=stats.min_limit,
+        max_limit=stats.max_limit,
+        rate=stats.rate,
+        in_flight=stats.in_flight,
+        waiting=stats.waiting,
+        max_queue=stats.max_queue,
+        requests=stats.requests,
+        rejected=stats.rejected,
+        increases=stats.increases,
+        decreases=stats.decreases,
+        avg_wait=stats.avg_wait,
+        max_wait=stats.max_wait,
+    )
+
+
+@router.get(
+    "/proxies",
+    response_model=List[schemas.ProxyStats],
+    response_description="Upstream proxy statistics.",
+)
+async def proxy_stats() -> List[schemas.ProxyStats]:
+    """Report the health, success rate and latency of the upstream proxies."""
+    return [
+        schemas.ProxyStats(
+            url=stats.url,
+            healthy=stats.healthy,
+            in_flight=stats.in_flight,
+            requests=stats.requests,
+            failures=stats.failures,
+            ejections=stats.ejections,
+            success_rate=stats.success_rate,
+            latency=stats.latency,
+        )
+        for stats in api_handler.proxy_stats
+    ]
+
+
+@router.get(
+    "/resilience",
+    response_model=schemas.ResilienceStats,
+    response_description="Upstream retry, circuit breaker and hedging statistics.",
+)
+async def resilience_stats() -> schemas.ResilienceStats:
+    """Report the retries, circuit breaker state and hedged upstream requests."""
+    stats = api_handler.resilience_stats
+    return schemas.ResilienceStats(
+        retries=stats.retries,
+        breaker_state=stats.breaker_state,
+        breaker_opened=stats.breaker_opened,
+        breaker_rejected=stats.breaker_rejected,
+        hedges=stats.hedges,
+        hedge_wins=stats.hedge_wins,
+        hedge_delay=stats.hedge_delay,
+    )
+
+
+@router.get(
+    "/crawler",
+    response_model=schemas.CrawlerStats,
+    response_description="Crawl state of the download pages.",
+)
+def crawler_stats(db: Session = Depends(get_db)) -> schemas.CrawlerStats:
+    """Report the backlog and progress of the crawler.
+
+    The crawler runs in its own process (`python -m film2subtitle.app.crawler`),
+    so its progress is read from the crawl state in the database.
+    """
+    counts = crud.crawl_state.count_by_status(db)
+    return schemas.CrawlerStats(
+        pending=counts.get(CrawlState.PENDING, 0),
+        done=counts.get(CrawlState.DONE, 0),
+        failed=counts.get(CrawlState.FAILED, 0),
+        last_crawled_at=crud.crawl_state.last_crawled_at(db),
+    )
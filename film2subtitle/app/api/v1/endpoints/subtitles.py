@@ -1,11 +1,53 @@
-from fastapi import APIRouter, Query, status
+import asyncio
+import logging
+import math
+import shutil
+import sys
+import tempfile
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+import orjson
+from fastapi import APIRouter, Body, Depends, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.exceptions import HTTPException
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from httpx import RequestError
+from sqlalchemy.orm import Session
+from starlette.background import BackgroundTask
 
-from film2subtitle.app import schemas
+from film2subtitle.app import crud, schemas
+from film2subtitle.app.api.dependency import get_db
+from film2subtitle.app.core.config import settings
+from film2subtitle.app.core.http import (
+    conditional_response,
+    content_disposition,
+    file_response,
+)
 from film2subtitle.app.handler import api_handler
-from film2subtitle.app.handler.errors import InvalidUrlError, NotFoundError
-from film2subtitle.app.handler.types import DownloadPage, LegacySearchResult
+from film2subtitle.app.handler.cache import CacheStatus
+from film2subtitle.app.handler.errors import (
+    CircuitOpenError,
+    FileTooLargeError,
+    Film2SubtitleAPIError,
+    InvalidArchiveError,
+    InvalidUrlError,
+    NotFoundError,
+    OverloadedError,
+)
+from film2subtitle.app.handler.files import FileCache, StoredFile
+from film2subtitle.app.handler.types import (
+    EpisodeIndex,
+    LegacySearchResult,
+    SubtitleArticle,
+)
 
+logger = logging.getLogger(__name__)
+
+# The endpoints return the trusted results of the handler (dataclasses) in an
+# `ORJSONResponse`, which serializes them as they are. The `response_model`s
+# only document the responses in the OpenAPI schema and are not validated.
+# The responses of the GET endpoints carry a strong ETag of their body, and are
+# answered with `304 Not Modified` when the client sends the same ETag back.
 router = APIRouter(
     responses={
         400: {
@@ -18,6 +60,70 @@ router = APIRouter(
 )
 
 
+def _cache_headers(cache_status: CacheStatus) -> Dict[str, str]:
+    """Return the `X-Cache` (`HIT`, `STALE` or `MISS`) and `Age` headers of a
+    cached result.
+    """
+    if cache_status.state == "BYPASS":
+        return {}
+    return {"X-Cache": cache_status.state, "Age": str(int(cache_status.age))}
+
+
+def _search_response(
+    request: Request,
+    result: LegacySearchResult,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """Return the conditional response of a search result."""
+    return conditional_response(
+        request,
+        ORJSONResponse(result, headers=headers),
+        cache_control=settings.HTTP_CACHE_CONTROL_SEARCH,
+        vary=settings.HTTP_VARY_SEARCH,
+    )
+
+
+@router.get(
+    "/search",
+    response_model=schemas.LegacySearchResult,
+    status_code=status.HTTP_200_OK,
+    summary="Search for a subtitle using the WordPress REST API of the website.",
+    response_description="The subtitle search result.",
+)
+async def search(
+    request: Request,
+    query: str = Query(
+        ...,
+        title="Search query",
+        description="The query to search for.",
+        example="Avengers",
+    ),
+    page: int = Query(
+        1,
+        title="Page number",
+        description="The page number to return.",
+        gt=0,
+    ),
+    page_size: int = Query(
+        settings.SEARCH_PAGE_SIZE,
+        title="Page size",
+        description="The number of articles in each page.",
+        gt=0,
+        le=100,
+    ),
+) -> Response:
+    """Search endpoint for subtitles (`wp-json` posts of the website)."""
+    with api_handler.track_cache() as cache_status:
+        try:
+            result = await api_handler.search(query, page, per_page=page_size)
+        except NotFoundError:
+            return _search_response(
+                request,
+                LegacySearchResult(total_pages=0, results=[]),
+            )
+    return _search_response(request, result, headers=_cache_headers(cache_status))
+
+
 @router.get(
     "/search/legacy",
     response_model=schemas.LegacySearchResult,
@@ -26,6 +132,7 @@ router = APIRouter(
     response_description="The subtitle legacy search result.",
 )
 async def legacy_search(
+    request: Request,
     query: str = Query(
         ...,
         title="Search query",
@@ -38,17 +145,170 @@ async def legacy_search(
         description="The page number to return.",
         gt=0,
     ),
-) -> LegacySearchResult:
+) -> Response:
     """Legacy search endpoint for subtitles."""
     empty_result = LegacySearchResult(
         total_pages=0,
         results=[],
     )
 
-    try:
-        return await api_handler.legacy_search(query, page)
-    except NotFoundError:
-        return empty_result
+    with api_handler.track_cache() as cache_status:
+        try:
+            result = await api_handler.legacy_search(query, page)
+        except NotFoundError:
+            return _search_response(request, empty_result)
+    return _search_response(request, result, headers=_cache_headers(cache_status))
+
+
+@router.get(
+    "/search/indexed",
+    response_model=schemas.LegacySearchResult,
+    status_code=status.HTTP_200_OK,
+    summary="Search for a subtitle in the local index of subtitle articles.",
+    response_description="The ranked search result.",
+)
+async def indexed_search(
+    request: Request,
+    query: str = Query(
+        ...,
+        title="Search query",
+        description="The query to search for (in Persian or English).",
+        example="Avengers",
+    ),
+    page: int = Query(
+        1,
+        title="Page number",
+        description="The page number to return.",
+        gt=0,
+    ),
+    page_size: int = Query(
+        settings.INDEX_PAGE_SIZE,
+        title="Page size",
+        description="The number of articles in each page.",
+        gt=0,
+        le=settings.INDEX_MAX_PAGE_SIZE,
+    ),
+    db: Session = Depends(get_db),
+) -> Response:
+    """Search the local full-text index of subtitle articles.
+
+    The first page of the query on film2subtitle.com (the legacy search,
+    through its cache) is added to the index before the index is searched, so
+    new articles are found too. The results and the pages always come from the
+    index, and the index is searched as is if film2subtitle.com is unavailable.
+    """
+    fetched: Sequence[SubtitleArticle] = ()
+    with api_handler.track_cache() as cache_status:
+        try:
+            result = await api_handler.legacy_search(query, 1)
+        except NotFoundError:
+            pass
+        except (Film2SubtitleAPIError, RequestError) as e:
+            logger.warning("Indexed search of %r without upstream: %s", query, e)
+        else:
+            # the cached results are already in the index
+            if cache_status.state in ("MISS", "BYPASS"):
+                fetched = result.results
+    articles, total = await run_in_threadpool(
+        _search_index,
+        db,
+        fetched,
+        query,
+        (page - 1) * page_size,
+        page_size,
+    )
+    return _search_response(
+        request,
+        LegacySearchResult(
+            total_pages=math.ceil(total / page_size),
+            results=articles,
+        ),
+    )
+
+
+def _search_index(
+    db: Session,
+    fetched: Sequence[SubtitleArticle],
+    query: str,
+    skip: int,
+    limit: int,
+) -> Tuple[List[SubtitleArticle], int]:
+    """Add the :param:`fetched` articles to the index and search it (blocking)."""
+    if fetched:
+        crud.article.upsert_many(db, articles=fetched)
+    return crud.article.search(db, query=query, skip=skip, limit=limit)
+
+
+@router.get(
+    "/search/legacy/stream",
+    status_code=status.HTTP_200_OK,
+    summary="Stream the results of all the search pages as NDJSON.",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": (
+                "Newline-delimited JSON stream of subtitle articles. "
+                "Each line is a `SubtitleArticle` object. If the search fails "
+                "after the response has started, the last line is an error "
+                'object (e.g. `{"error": "BAD_GATEWAY", "message": "..."}`).'
+            ),
+            "content": {"application/x-ndjson": {}},
+        },
+    },
+)
+async def legacy_search_stream(
+    query: str = Query(
+        ...,
+        title="Search query",
+        description="The query to search for.",
+        example="Avengers",
+    ),
+    max_pages: Optional[int] = Query(
+        None,
+        title="Maximum pages",
+        description="The maximum number of search pages to fetch.",
+        gt=0,
+        le=settings.SEARCH_STREAM_MAX_PAGES,
+    ),
+    unique: bool = Query(
+        True,
+        title="Unique results",
+        description="Whether to skip articles with duplicate URLs.",
+    ),
+) -> StreamingResponse:
+    """Fetch all the search pages concurrently and stream the articles as
+    soon as each page is parsed.
+    """
+
+    async def ndjson() -> AsyncIterator[bytes]:
+        try:
+            async for article in api_handler.iter_legacy_search(
+                query,
+                max_pages=max_pages or settings.SEARCH_STREAM_MAX_PAGES,
+                concurrency=settings.SEARCH_STREAM_CONCURRENCY,
+                unique=unique,
+            ):
+                yield orjson.dumps(article) + b"\n"
+        except Exception as e:  # noqa
+            # the status line is already sent, end the stream with the error
+            yield orjson.dumps(_stream_error(e)) + b"\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+def _stream_error(exc: Exception) -> Dict[str, str]:
+    """Return the error record that ends a search stream."""
+    if isinstance(exc, (OverloadedError, CircuitOpenError)):
+        error = "SERVICE_UNAVAILABLE"
+        message = "Film2Subtitle is busy or unavailable, please try again later."
+    elif isinstance(exc, (Film2SubtitleAPIError, RequestError)):
+        error = "BAD_GATEWAY"
+        message = "The search pages could not be fetched from Film2Subtitle."
+    else:
+        logger.exception("Failed to stream the search results", exc_info=exc)
+        error = "INTERNAL_SERVER_ERROR"
+        message = "The search pages could not be processed."
+    return {"error": error, "message": message}
 
 
 @router.get(
@@ -59,15 +319,17 @@ async def legacy_search(
     response_description="The subtitle download page.",
 )
 async def download_page(
+    request: Request,
     url: str = Query(
         ...,
         title="Subtitle URL",
         description="The URL of the subtitle to download.",
     ),
-) -> DownloadPage:
+) -> Response:
     """Download page endpoint for subtitles."""
     try:
-        return await api_handler.download_page(url)
+        with api_handler.track_cache() as cache_status:
+            result = await api_handler.download_page(url)
     except NotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -78,3 +340,454 @@ async def download_page(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="The given URL is not a valid Film2Subtitle URL.",
         ) from e
+    return conditional_response(
+        request,
+        ORJSONResponse(result, headers=_cache_headers(cache_status)),
+        cache_control=settings.HTTP_CACHE_CONTROL_DOWNLOAD,
+        vary=settings.HTTP_VARY_DOWNLOAD,
+    )
+
+
+async def _episode_index(url: str) -> EpisodeIndex:
+    """Return the episode index of a series download page, or raise the
+    :class:`HTTPException` of its error.
+    """
+    try:
+        return await api_handler.episode_index(url)
+    except NotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Requested series download page not found.",
+        ) from e
+    except InvalidUrlError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The given URL is not a valid Film2Subtitle URL.",
+        ) from e
+
+
+@router.get(
+    "/download/episode",
+    response_model=schemas.EpisodeLink,
+    status_code=status.HTTP_200_OK,
+    summary="Get the download link of an episode of a series.",
+    response_description="The download link of the episode.",
+)
+async def download_episode(
+    request: Request,
+    url: str = Query(
+        ...,
+        title="Subtitle URL",
+        description="The URL of the series subtitle.",
+    ),
+    season: int = Query(..., alias="s", title="Season number", ge=0),
+    episode: int = Query(..., alias="e", title="Episode number", ge=0),
+) -> Response:
+    """Look up the download link of a single episode from the cached
+    season/episode index of the download page.
+    """
+    with api_handler.track_cache() as cache_status:
+        index = await _episode_index(url)
+    link = index.get(season, episode)
+    if link is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Requested episode not found.",
+        )
+    return conditional_response(
+        request,
+        ORJSONResponse(
+            {"season": season, "episode": episode, "url": link},
+            headers=_cache_headers(cache_status),
+        ),
+        cache_control=settings.HTTP_CACHE_CONTROL_DOWNLOAD,
+        vary=settings.HTTP_VARY_DOWNLOAD,
+    )
+
+
+@router.get(
+    "/download/season",
+    response_model=schemas.SeasonLinks,
+    status_code=status.HTTP_200_OK,
+    summary="Get the download links of a season of a series.",
+    response_description="The download links of the season.",
+)
+async def download_season(
+    request: Request,
+    url: str = Query(
+        ...,
+        title="Subtitle URL",
+        description="The URL of the series subtitle.",
+    ),
+    season: int = Query(..., alias="s", title="Season number", ge=0),
+    first: Optional[int] = Query(
+        None,
+        title="First episode",
+        description="The first episode number of the range (inclusive).",
+        ge=0,
+    ),
+    last: Optional[int] = Query(
+        None,
+        title="Last episode",
+        description="The last episode number of the range (inclusive).",
+        ge=0,
+    ),
+) -> Response:
+    """Return the download links of a season (or a range of its episodes)
+    from the cached season/episode index of the download page.
+    """
+    with api_handler.track_cache() as cache_status:
+        index = await _episode_index(url)
+    if not index.episodes(season) and index.season_pack(season) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Requested season not found.",
+        )
+    result = {
+        "season": season,
+        "pack": index.season_pack(season),
+        "episodes": [
+            {"season": season, "episode": episode, "url": link}
+            for episode, link in index.range(season, first, last)
+        ],
+    }
+    return conditional_response(
+        request,
+        ORJSONResponse(result, headers=_cache_headers(cache_status)),
+        cache_control=settings.HTTP_CACHE_CONTROL_DOWNLOAD,
+        vary=settings.HTTP_VARY_DOWNLOAD,
+    )
+
+
+def _file_too_large() -> HTTPException:
+    """Return the :class:`HTTPException` of a file larger than `FILE_MAX_SIZE`."""
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail="The subtitle file is larger than the maximum file size.",
+    )
+
+
+@router.get(
+    "/download/file",
+    status_code=status.HTTP_200_OK,
+    summary="Download a subtitle file (e.g. a link of a download box).",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "The subtitle file (usually a zip archive).",
+            "content": {"application/octet-stream": {}},
+        },
+        206: {"description": "The requested byte range of the subtitle file."},
+        413: {"description": "The file is larger than the maximum file size."},
+        416: {"description": "The requested byte range is not satisfiable."},
+    },
+)
+async def download_file(
+    request: Request,
+    url: str = Query(
+        ...,
+        title="File URL",
+        description="The URL of the subtitle file to download.",
+    ),
+) -> Response:
+    """Stream a subtitle file from film2subtitle.com chunk by chunk.
+
+    The file is stored in the on-disk file cache while it is streamed, and
+    the next downloads (and the `Range` requests) are served from the disk.
+    """
+    try:
+        stored = await run_in_threadpool(api_handler.cached_file, url)
+        cache_state = "HIT" if stored is not None else "MISS"
+        if (
+            stored is None
+            and api_handler.files is not None
+            and "range" in request.headers
+        ):
+            # store the whole file first, then serve the range of it
+            stored = await api_handler.store_file(url)
+        if stored is None:
+            download = await api_handler.open_file(
+                url,
+                range_header=request.headers.get("range"),
+            )
+    except NotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Requested subtitle file not found.",
+        ) from e
+    except InvalidUrlError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The given URL is not a valid Film2Subtitle URL.",
+        ) from e
+    except FileTooLargeError as e:
+        raise _file_too_large() from e
+    except Film2SubtitleAPIError as e:
+        if e.status_code != status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE:
+            raise
+        raise HTTPException(
+            status_code=e.status_code,
+            detail="The requested range of the file is not satisfiable.",
+        ) from e
+    if stored is not None:
+        return file_response(
+            request,
+            stored.path,
+            stored.size,
+            stored.etag,
+            stored.media_type,
+            headers={
+                "Content-Disposition": content_disposition(stored.filename),
+                "X-Cache": cache_state,
+            },
+        )
+    return StreamingResponse(
+        download.body,
+        status_code=download.status_code,
+        media_type=download.media_type,
+        headers={
+            **download.headers,
+            "Content-Disposition": content_disposition(download.filename),
+            "X-Cache": cache_state,
+        },
+    )
+
+
+def _scratch_files() -> Optional[FileCache]:
+    """Return a temporary file cache to download the archives into if the
+    subtitle file cache is disabled (`None` if it's enabled).
+
+    The caller removes its directory (see :func:`_remove_files`).
+    """
+    if api_handler.files is not None:
+        return None
+    return FileCache(
+        tempfile.mkdtemp(prefix="film2subtitle-"),
+        max_size=sys.maxsize,
+        max_file_size=settings.FILE_MAX_SIZE,
+    )
+
+
+def _remove_files(files: Optional[FileCache]) -> None:
+    """Remove the directory of a temporary file cache."""
+    if files is not None:
+        shutil.rmtree(files.path, ignore_errors=True)
+
+
+@router.get(
+    "/download/archive",
+    response_model=List[schemas.ArchiveEntry],
+    status_code=status.HTTP_200_OK,
+    summary="List the files in a subtitle archive.",
+    response_description="The files in the archive.",
+    responses={
+        413: {"description": "The archive is larger than the maximum file size."},
+        502: {"description": "The file is not a valid zip archive."},
+    },
+)
+async def archive_entries(
+    url: str = Query(
+        ...,
+        title="Archive URL",
+        description="The URL of the subtitle archive (a link of a download box).",
+    ),
+) -> ORJSONResponse:
+    """List the files in a subtitle archive, to choose the one to download.
+
+    The archive is downloaded into the file cache (or a temporary directory
+    if the cache is disabled) before its files are listed.
+    """
+    files = await run_in_threadpool(_scratch_files)
+    try:
+        entries = await api_handler.archive_entries(url, files)
+    except NotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Requested subtitle archive not found.",
+        ) from e
+    except InvalidUrlError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The given URL is not a valid Film2Subtitle URL.",
+        ) from e
+    except InvalidArchiveError as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="The subtitle archive is not a valid zip archive.",
+        ) from e
+    except FileTooLargeError as e:
+        raise _file_too_large() from e
+    finally:
+        await run_in_threadpool(_remove_files, files)
+    return ORJSONResponse(entries)
+
+
+async def _convert_subtitle(
+    url: str,
+    entry: Optional[str],
+    subtitle_format: schemas.SubtitleFormat,
+    files: Optional[FileCache],
+) -> StoredFile:
+    """Convert a subtitle file of an archive, raising the :class:`HTTPException`
+    of the handler errors.
+    """
+    try:
+        return await api_handler.convert_subtitle(
+            url,
+            entry,
+            subtitle_format.value,
+            files,
+        )
+    except NotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Requested subtitle archive or file not found.",
+        ) from e
+    except InvalidUrlError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The given URL is not a valid Film2Subtitle URL.",
+        ) from e
+    except InvalidArchiveError as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="The subtitle archive is not a valid zip archive.",
+        ) from e
+    except FileTooLargeError as e:
+        raise _file_too_large() from e
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"The subtitle file can't be converted to {subtitle_format.value}.",
+        ) from e
+
+
+@router.get(
+    "/download/subtitle",
+    status_code=status.HTTP_200_OK,
+    summary="Download a subtitle file from an archive as WebVTT or SRT.",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "The subtitle file, converted and encoded in UTF-8.",
+            "content": {"text/vtt": {}, "application/x-subrip": {}},
+        },
+        206: {"description": "The requested byte range of the subtitle file."},
+        413: {"description": "The archive is larger than the maximum file size."},
+        502: {"description": "The file is not a valid zip archive."},
+    },
+)
+async def download_subtitle(
+    request: Request,
+    url: str = Query(
+        ...,
+        title="Archive URL",
+        description="The URL of the subtitle archive (a link of a download box).",
+    ),
+    entry: Optional[str] = Query(
+        None,
+        title="Archive entry",
+        description="The name of the file in the archive (see `/download/archive`). "
+        "Defaults to the first subtitle file.",
+    ),
+    subtitle_format: schemas.SubtitleFormat = Query(
+        schemas.SubtitleFormat.VTT,
+        alias="format",
+        title="Subtitle format",
+        description="The format to convert the subtitle file to.",
+    ),
+) -> Response:
+    """Extract a subtitle file from an archive and convert it (e.g. SRT to
+    WebVTT for the video players) to UTF-8.
+
+    Persian subtitles encoded in cp1256 are detected and converted to UTF-8.
+    The whole archive is downloaded before the subtitle file is converted. The
+    converted files are cached by the digest of their archive (if the file
+    cache is disabled, they are converted into a temporary directory that is
+    removed once the response is sent).
+    """
+    files = await run_in_threadpool(_scratch_files)
+    try:
+        stored = await _convert_subtitle(url, entry, subtitle_format, files)
+        response = file_response(
+            request,
+            stored.path,
+            stored.size,
+            stored.etag,
+            stored.media_type,
+            headers={"Content-Disposition": content_disposition(stored.filename)},
+        )
+    except BaseException:
+        await run_in_threadpool(_remove_files, files)
+        raise
+    if files is not None:
+        # the response has opened the file, remove it once it's sent
+        response.background = BackgroundTask(_remove_files, files)
+    return response
+
+
+def _batch_error(exc: Exception) -> schemas.BatchDownloadError:
+    """Return the error of a download page in a batch."""
+    if isinstance(exc, NotFoundError):
+        return schemas.BatchDownloadError(
+            error="NOT_FOUND",
+            message="Requested download page not found.",
+        )
+    if isinstance(exc, InvalidUrlError):
+        return schemas.BatchDownloadError(
+            error="BAD_REQUEST",
+            message="The given URL is not a valid Film2Subtitle URL.",
+        )
+    if isinstance(exc, (OverloadedError, CircuitOpenError)):
+        return schemas.BatchDownloadError(
+            error="SERVICE_UNAVAILABLE",
+            message="Film2Subtitle is busy or unavailable, please try again later.",
+        )
+    if isinstance(exc, asyncio.TimeoutError):
+        return schemas.BatchDownloadError(
+            error="GATEWAY_TIMEOUT",
+            message="The download page took too long to respond.",
+        )
+    if isinstance(exc, (Film2SubtitleAPIError, RequestError)):
+        return schemas.BatchDownloadError(
+            error="BAD_GATEWAY",
+            message="The download page could not be fetched from Film2Subtitle.",
+        )
+    return schemas.BatchDownloadError(
+        error="INTERNAL_SERVER_ERROR",
+        message="The download page could not be processed.",
+    )
+
+
+@router.post(
+    "/download/batch",
+    response_model=schemas.BatchDownloadResult,
+    status_code=status.HTTP_200_OK,
+    summary="Download multiple subtitles by their URLs.",
+    response_description="The download page or error of every URL.",
+)
+async def download_pages(
+    batch: schemas.BatchDownloadRequest = Body(...),
+) -> ORJSONResponse:
+    """Batch download page endpoint for subtitles.
+
+    The download pages are fetched concurrently and a failed (or slow) page
+    doesn't fail the whole batch, its error is returned in its place instead.
+    """
+    pages = await api_handler.download_pages(
+        batch.urls,
+        concurrency=settings.BATCH_DOWNLOAD_CONCURRENCY,
+        timeout=settings.BATCH_DOWNLOAD_TIMEOUT,
+    )
+    return ORJSONResponse(
+        {
+            "results": [
+                (
+                    {"url": url, "result": None, "error": _batch_error(page).dict()}
+                    if isinstance(page, Exception)
+                    else {"url": url, "result": page, "error": None}
+                )
+                for url, page in zip(batch.urls, pages)
+            ],
+        },
+    )
@@ -0,0 +1,274 @@
+import hashlib
+import io
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple
+from urllib.parse import quote
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+__all__ = [
+    "make_etag",
+    "match_etag",
+    "conditional_response",
+    "content_disposition",
+    "file_response",
+    "CompressionMiddleware",
+]
+
+
+def make_etag(body: bytes) -> str:
+    """Return a strong ETag of a response :param:`body`."""
+    return f'"{hashlib.sha1(body).hexdigest()}"'
+
+
+def _opaque_tag(tag: str) -> str:
+    """Return an entity tag without the weak indicator."""
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def match_etag(if_none_match: str, etag: str) -> Optional[str]:
+    """Return the entity tag of an `If-None-Match` header that matches
+    :param:`etag`, or `None` if no tag matches.
+
+    Note:
+        The tags are compared with the weak comparison of RFC 7232 (as required
+        for `If-None-Match`).
+    """
+    if if_none_match.strip() == "*":
+        return etag
+    for tag in if_none_match.split(","):
+        if _opaque_tag(tag) == etag:
+            return tag.strip()
+    return None
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    cache_control: str = "",
+    vary: str = "",
+) -> Response:
+    """Add the `ETag`, `Cache-Control` and `Vary` headers to :param:`response`.
+
+    A `304 Not Modified` response (with the same headers) is returned instead
+    when the `If-None-Match` header of :param:`request` matches the ETag. Its
+    ETag is the matching tag.
+
+    Parameters:
+        request (`Request`): The request that is responded.
+        response (`Response`): The response with the whole body.
+        cache_control (`str`): The `Cache-Control` header (empty omits it).
+        vary (`str`): The `Vary` header (empty omits it).
+
+    Returns:
+        `Response`: The :param:`response` or the `304 Not Modified` response.
+    """
+    etag = make_etag(response.body)
+    headers: Dict[str, str] = {"ETag": etag}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    if vary:
+        headers["Vary"] = vary
+    if_none_match = request.headers.get("if-none-match")
+    matched = match_etag(if_none_match, etag) if if_none_match else None
+    if matched is not None:
+        headers["ETag"] = matched
+        for name in ("age", "x-cache"):
+            if name in response.headers:
+                headers[name] = response.headers[name]
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return response
+
+
+def content_disposition(filename: str) -> str:
+    """Return the `Content-Disposition` header to download a file as
+    :param:`filename` (which may have non-ASCII characters).
+    """
+    fallback = filename.encode("ascii", "replace").decode().replace('"', "")
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename)}"
+
+
+def _byte_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Return the first and last byte positions of a `Range` header.
+
+    Returns `None` for the headers that should be ignored (invalid syntax and
+    multiple ranges), so the whole file is sent instead.
+
+    Raises:
+        `ValueError`: If the range is not satisfiable.
+    """
+    unit, _, ranges = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in ranges:
+        return None
+    first, _, last = ranges.strip().partition("-")
+    if not (first or last) or not all(p.isdigit() for p in (first, last) if p):
+        return None
+    if not first:
+        # the last N bytes
+        if int(last) == 0 or size == 0:
+            raise ValueError("The suffix range is empty")
+        return max(size - int(last), 0), size - 1
+    start, end = int(first), int(last) if last else size - 1
+    if last and end < start:
+        return None
+    if start >= size:
+        raise ValueError("The range starts after the end of the file")
+    return start, min(end, size - 1)
+
+
+def _iter_file(
+    file: BinaryIO, start: int, length: int, chunk_size: int
+) -> Iterator[bytes]:
+    """Read :param:`length` bytes of a file from :param:`start` in chunks."""
+    with file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(chunk_size, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def file_response(
+    request: Request,
+    path: str,
+    size: int,
+    etag: str,
+    media_type: str,
+    headers: Optional[Dict[str, str]] = None,
+    chunk_size: int = 64 * 1024,
+) -> Response:
+    """Stream a file from disk, or the byte range of it the request asks for.
+
+    A single range of the `Range` header is answered with `206 Partial
+    Content` (and a range outside the file with `416 Range Not Satisfiable`),
+    unless the `If-Range` header doesn't match :param:`etag`. A matching
+    `If-None-Match` header is answered with `304 Not Modified`.
+
+    Parameters:
+        request (`Request`): The request that is responded.
+        path (`str`): The path of the file.
+        size (`int`): The size of the file in bytes.
+        etag (`str`): The strong ETag of the file.
+        media_type (`str`): The media type of the file.
+        headers (`dict`): Additional headers of the response.
+        chunk_size (`int`): The size of the chunks to read the file in.
+
+    Returns:
+        `Response`: The response with the (partial) file.
+    """
+    headers = {"ETag": etag, "Accept-Ranges": "bytes", **(headers or {})}
+    if_none_match = request.headers.get("if-none-match")
+    matched = match_etag(if_none_match, etag) if if_none_match else None
+    if matched is not None:
+        return Response(status_code=304, headers={**headers, "ETag": matched})
+    start, length, status_code = 0, size, 200
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or if_range.strip() == etag):
+        try:
+            byte_range = _byte_range(range_header, size)
+        except ValueError:
+            return Response(
+                status_code=416,
+                headers={**headers, "Content-Range": f"bytes */{size}"},
+            )
+        if byte_range is not None:
+            start, end = byte_range
+            length, status_code = end - start + 1, 206
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(length)
+    # open the file now, in case it's evicted before the response is sent
+    file = open(path, "rb")  # noqa: SIM115
+    return StreamingResponse(
+        _iter_file(file, start, length, chunk_size),
+        status_code=status_code,
+        media_type=media_type,
+        headers=headers,
+    )
+
+
+class _BrotliFile:
+    """Write the brotli-compressed data to :param:`fileobj` (the interface of
+    the gzip file of :class:`GZipResponder`).
+    """
+
+    __slots__ = ("fileobj", "_compressor")
+
+    def __init__(self, fileobj: BinaryIO, quality: int) -> None:
+        self.fileobj = fileobj
+        self._compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=quality)
+
+    def write(self, data: bytes) -> None:
+        # flush, so every chunk of a streaming response is sent right away
+        self.fileobj.write(self._compressor.process(data) + self._compressor.flush())
+
+    def close(self) -> None:
+        self.fileobj.write(self._compressor.finish())
+
+
+class _BrotliResponder(GZipResponder):
+    """A :class:`GZipResponder` that compresses with brotli instead."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int) -> None:
+        super().__init__(app, minimum_size)
+        self.gzip_buffer = io.BytesIO()
+        self.gzip_file = _BrotliFile(self.gzip_buffer, quality)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        async def send_with_brotli(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                if headers.get("content-encoding") == "gzip":
+                    headers["Content-Encoding"] = "br"
+            await send(message)
+
+        await super().__call__(scope, receive, send_with_brotli)
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """A :class:`GZipMiddleware` that compresses the responses with brotli
+    when the client accepts it.
+
+    The requests with a `Range` header are not compressed, since the byte
+    ranges refer to the uncompressed file.
+
+    Parameters:
+        app (`ASGIApp`): The ASGI application.
+        minimum_size (`int`): The size (in bytes) of the smallest compressed response.
+        gzip_level (`int`): The gzip compression level (1-9).
+        brotli_quality (`int`): The brotli compression quality (0-11).
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        super().__init__(app, minimum_size=minimum_size, compresslevel=gzip_level)
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            headers = Headers(scope=scope)
+            if "range" in headers:
+                await self.app(scope, receive, send)
+                return
+            if "br" in headers.get("accept-encoding", ""):
+                responder = _BrotliResponder(
+                    self.app,
+                    self.minimum_size,
+                    quality=self.brotli_quality,
+                )
+                await responder(scope, receive, send)
+                return
+        await super().__call__(scope, receive, send)
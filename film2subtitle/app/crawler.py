@@ -0,0 +1,381 @@
+"""Crawler that populates and refreshes the article index.
+
+Every round, the crawler discovers download pages from the configured sources
+(the WordPress sitemap, the listing pages of the website and the search pages
+of seed queries), marks the new pages, the pages whose listing entry has changed
+and the pages not crawled for a while as pending, then crawls the pending pages
+with bounded concurrency and a politeness rate limit. Pages whose parsed content
+has changed are written to the article index and the result cache.
+
+The crawl state is stored in the database, so a restarted crawler resumes
+with the pages that were still pending. The crawler runs in its own process
+(and not in the workers of the app) so only one instance crawls at a time.
+
+Usage:
+    python -m film2subtitle.app.crawler [--once]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, ClassVar, Dict, Iterable, List, Optional, Set
+from urllib.parse import urlencode
+
+from lxml import etree
+from sqlalchemy.orm import Session
+
+from film2subtitle.app import crud
+from film2subtitle.app.core.config import settings
+from film2subtitle.app.db.session import SessionLocal
+from film2subtitle.app.handler import Film2Subtitle
+from film2subtitle.app.handler.cache import page_key
+from film2subtitle.app.handler.errors import (
+    CircuitOpenError,
+    Film2SubtitleAPIError,
+    NotFoundError,
+    OverloadedError,
+)
+from film2subtitle.app.models import CrawlState
+
+if TYPE_CHECKING:
+    from httpx import Response
+
+    from film2subtitle.app.handler.types import SubtitleArticle
+
+__all__ = ["CrawlerStats", "Crawler", "create_crawler"]
+
+logger = logging.getLogger(__name__)
+
+_SITEMAP_NAMESPACES = {"sm": "http://www.sitemaps.org/schemas/sitemap/0.9"}
+# the sitemaps are remote documents, don't expand their entities or load
+# anything they reference
+_SITEMAP_PARSER = etree.XMLParser(resolve_entities=False, no_network=True)
+
+
+def _hash(value: object) -> str:
+    """Return a stable hash of a dataclass (or any JSON serializable value)."""
+    if hasattr(value, "__dataclass_fields__"):
+        value = asdict(value)
+    data = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(data.encode()).hexdigest()
+
+
+@dataclass
+class CrawlerStats:
+    """Progress counters of the crawler."""
+
+    rounds: int = 0
+    crawled: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    errors: int = 0
+    backlog: int = 0
+    pages_per_sec: float = 0.0
+    last_round_at: Optional[datetime] = None
+
+
+class _RateLimiter:
+    """Space out the calls to :meth:`wait` by at least `1 / rate` seconds."""
+
+    __slots__ = ("interval", "_next", "_lock")
+
+    def __init__(self, rate: float) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0.")
+        self.interval = 1 / rate
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        async with self._lock:
+            delay = self._next - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next = time.monotonic() + self.interval
+
+
+class Crawler:
+    """Crawl the download pages of film2subtitle.com into the article index.
+
+    Parameters:
+        api (:class:`Film2Subtitle`): The API handler to request the pages with.
+        sources (`List[str]`): Where to discover the download pages from
+        (`sitemap`, `listing` and/or `search`).
+        seed_queries (`List[str]`): The queries to search for with the `search` source.
+        listing_pages (`int`): The number of listing (and search) pages to walk.
+        concurrency (`int`): The maximum number of pages to crawl at the same time.
+        rate_limit (`float`): The maximum number of requests per second.
+        interval (`float`): Seconds to wait between the crawl rounds.
+        refresh_interval (`float`): Seconds after which crawled pages are crawled again
+        even if their listing entry hasn't changed.
+        max_failures (`int`): Number of failed crawls in a row to give up on a page.
+    """
+
+    VALID_SOURCES: ClassVar[Set[str]] = {"sitemap", "listing", "search"}
+    BATCH_SIZE: ClassVar[int] = 100
+
+    def __init__(
+        self,
+        api: Film2Subtitle,
+        sources: Iterable[str] = ("sitemap",),
+        seed_queries: Iterable[str] = (),
+        listing_pages: int = 5,
+        concurrency: int = 4,
+        rate_limit: float = 2.0,
+        interval: float = 60 * 30,
+        refresh_interval: float = 60 * 60 * 24,
+        max_failures: int = 3,
+    ) -> None:
+        self.sources = set(sources)
+        if invalid := self.sources - self.VALID_SOURCES:
+            raise ValueError(
+                f"Invalid crawler sources: {', '.join(invalid)}. "
+                f"Valid crawler sources: {', '.join(self.VALID_SOURCES)}",
+            )
+        if concurrency < 1:
+            raise ValueError("Concurrency must be an integer greater than 0.")
+        self.api = api
+        self.seed_queries = list(seed_queries)
+        self.listing_pages = listing_pages
+        self.concurrency = concurrency
+        self.interval = interval
+        self.refresh_interval = refresh_interval
+        self.max_failures = max_failures
+        self._rate_limiter = _RateLimiter(rate_limit)
+        self._stats = CrawlerStats()
+        self._crawl_time = 0.0
+
+    @property
+    def stats(self) -> CrawlerStats:
+        """Return a snapshot of the crawler progress."""
+        db = SessionLocal()
+        try:
+            backlog = crud.crawl_state.count_pending(db)
+        finally:
+            db.close()
+        stats = self._stats
+        return CrawlerStats(
+            rounds=stats.rounds,
+            crawled=stats.crawled,
+            changed=stats.changed,
+            unchanged=stats.unchanged,
+            errors=stats.errors,
+            backlog=backlog,
+            pages_per_sec=stats.crawled / self._crawl_time if self._crawl_time else 0.0,
+            last_round_at=stats.last_round_at,
+        )
+
+    async def _get(self, url: str) -> "Response":
+        await self._rate_limiter.wait()
+        return await self.api.request("GET", url)
+
+    async def _discover_sitemap(self) -> Dict[str, str]:
+        """Return the post URLs of the WordPress sitemap and their `lastmod`."""
+        index = etree.fromstring(
+            (await self._get("/wp-sitemap.xml")).content,
+            _SITEMAP_PARSER,
+        )
+        sources = {}
+        for loc in index.iterfind("sm:sitemap/sm:loc", _SITEMAP_NAMESPACES):
+            if "posts-post" not in loc.text:
+                continue
+            sitemap = etree.fromstring(
+                (await self._get(loc.text.strip())).content,
+                _SITEMAP_PARSER,
+            )
+            for url in sitemap.iterfind("sm:url", _SITEMAP_NAMESPACES):
+                loc = url.findtext("sm:loc", "", _SITEMAP_NAMESPACES).strip()
+                lastmod = url.findtext("sm:lastmod", "", _SITEMAP_NAMESPACES)
+                sources[loc] = lastmod.strip()
+        return sources
+
+    async def _discover_listing(self, path: str) -> Dict[str, str]:
+        """Return the article URLs of the pages of a listing and their hashes."""
+        parser = self.api.LEGACY_SEARCH_PARSERS[self.api.parser_backend]
+        sources = {}
+        total_pages = self.listing_pages
+        page = 1
+        while page <= total_pages:
+            await self._rate_limiter.wait()
+            url = f"/page/{page}/{path}" if page > 1 else f"/{path}"
+            try:
+                result = await self.api.scrape(url, parser)
+            except NotFoundError:
+                break
+            sources.update(self._article_sources(result.results))
+            total_pages = min(result.total_pages, self.listing_pages)
+            page += 1
+        return sources
+
+    @staticmethod
+    def _article_sources(articles: List["SubtitleArticle"]) -> Dict[str, str]:
+        return {article.url: _hash(article) for article in articles}
+
+    async def discover(self, db: Session) -> int:
+        """Discover the download pages and mark the ones to crawl as pending.
+
+        Returns:
+            `int`: The number of pages marked as pending.
+        """
+        listings = []
+        if "sitemap" in self.sources:
+            listings.append(("sitemap", self._discover_sitemap))
+        if "listing" in self.sources:
+            listings.append(("listing", lambda: self._discover_listing("")))
+        if "search" in self.sources:
+            for query in self.seed_queries:
+                listings.append(
+                    (
+                        f"search {query!r}",
+                        lambda q=query: self._discover_listing(
+                            "?" + urlencode({"s": q}),
+                        ),
+                    ),
+                )
+        sources: Dict[str, str] = {}
+        for name, discover in listings:
+            try:
+                for url, source_hash in (await discover()).items():
+                    # keep the hash of the first listing a page was found in
+                    sources.setdefault(url, source_hash)
+            except Film2SubtitleAPIError as e:
+                # the other listings can still be crawled
+                self._stats.errors += 1
+                logger.warning("Failed to discover the pages of %s: %s", name, e)
+        pending = crud.crawl_state.mark_seen(db, sources=sources)
+        before = datetime.utcnow() - timedelta(seconds=self.refresh_interval)
+        return pending + crud.crawl_state.mark_due(db, before=before)
+
+    async def _crawl_page(self, db: Session, state: CrawlState) -> None:
+        parser = self.api.DOWNLOAD_PAGE_PARSERS[self.api.parser_backend]
+        url = state.url
+        await self._rate_limiter.wait()
+        try:
+            page = await self.api.scrape(url, parser)
+        except (OverloadedError, CircuitOpenError):
+            # rejected before reaching the upstream, keep it pending
+            self._stats.errors += 1
+            return
+        except (Film2SubtitleAPIError, NotFoundError) as e:
+            self._stats.errors += 1
+            crud.crawl_state.mark_failed(
+                db,
+                db_obj=state,
+                max_failures=self.max_failures,
+                permanent=isinstance(e, NotFoundError),
+            )
+            return
+        except Exception:  # noqa
+            self._stats.errors += 1
+            logger.exception("Failed to crawl %s", url)
+            crud.crawl_state.mark_failed(
+                db, db_obj=state, max_failures=self.max_failures
+            )
+            return
+        self._stats.crawled += 1
+        if crud.crawl_state.mark_crawled(db, db_obj=state, content_hash=_hash(page)):
+            self._stats.changed += 1
+            crud.article.upsert_many(db, articles=page.articles)
+            if self.api.cache is not None:
+                await self.api.cache.aset(page_key(url), page)
+        else:
+            self._stats.unchanged += 1
+
+    async def crawl_pending(self, db: Session) -> None:
+        """Crawl all the pending pages (in batches of :attr:`BATCH_SIZE`).
+
+        The pages are crawled concurrently, each with its own session.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def crawl(state_id: int) -> None:
+            async with semaphore:
+                task_db = SessionLocal()
+                try:
+                    await self._crawl_page(task_db, task_db.get(CrawlState, state_id))
+                finally:
+                    task_db.close()
+
+        last_id = 0
+        while batch := crud.crawl_state.get_pending(
+            db,
+            after_id=last_id,
+            limit=self.BATCH_SIZE,
+        ):
+            last_id = batch[-1].id_
+            started = time.perf_counter()
+            await asyncio.gather(*(crawl(state.id_) for state in batch))
+            self._crawl_time += time.perf_counter() - started
+
+    async def crawl_once(self) -> None:
+        """Run a single crawl round."""
+        db = SessionLocal()
+        try:
+            # crawl the pages left pending by a previous (interrupted) run first
+            await self.crawl_pending(db)
+            await self.discover(db)
+            await self.crawl_pending(db)
+        finally:
+            db.close()
+        self._stats.rounds += 1
+        self._stats.last_round_at = datetime.utcnow()
+
+    async def run(self) -> None:
+        """Run the crawl rounds forever."""
+        while True:
+            try:
+                await self.crawl_once()
+            except Exception:  # noqa
+                logger.exception("Crawl round failed")
+            await asyncio.sleep(self.interval)
+
+
+def create_crawler() -> Crawler:
+    """Create a crawler of the shared API handler, configured by the settings."""
+    from film2subtitle.app.handler import api_handler
+
+    return Crawler(
+        api_handler,
+        sources=settings.CRAWLER_SOURCES,
+        seed_queries=settings.CRAWLER_SEED_QUERIES,
+        listing_pages=settings.CRAWLER_LISTING_PAGES,
+        concurrency=settings.CRAWLER_CONCURRENCY,
+        rate_limit=settings.CRAWLER_RATE_LIMIT,
+        interval=settings.CRAWLER_INTERVAL,
+        refresh_interval=settings.CRAWLER_REFRESH_INTERVAL,
+        max_failures=settings.CRAWLER_MAX_FAILURES,
+    )
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Crawl film2subtitle.com.")
+    arg_parser.add_argument("--once", action="store_true", help="run a single round")
+    args = arg_parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    async def run() -> None:
+        crawler = create_crawler()
+        try:
+            await (crawler.crawl_once() if args.once else crawler.run())
+        finally:
+            await crawler.api.close()
+        stats = crawler.stats
+        logger.info(
+            "Crawled %d pages (%d changed, %d errors) at %.2f pages/sec, backlog: %d",
+            stats.crawled,
+            stats.changed,
+            stats.errors,
+            stats.pages_per_sec,
+            stats.backlog,
+        )
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
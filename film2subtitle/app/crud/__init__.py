@@ -1,5 +1,9 @@
-from film2subtitle.app.models import User
+from film2subtitle.app.models import Article, CrawlState, User
 
+from .crud_article import CRUDArticle
+from .crud_crawl_state import CRUDCrawlState
 from .crud_user import CRUDUser
 
+article = CRUDArticle(Article)
+crawl_state = CRUDCrawlState(CrawlState)
 user = CRUDUser(User)
@@ -0,0 +1,217 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import case, func, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Query, Session
+
+from film2subtitle.app.crud.base import CRUDBase
+from film2subtitle.app.handler.types import SubtitleArticle, SubtitleMetadata
+from film2subtitle.app.handler.utils import normalize_text
+from film2subtitle.app.models import Article
+from film2subtitle.app.schemas import SubtitleArticle as SubtitleArticleSchema
+
+
+def _search_text(title: str, metadata: SubtitleMetadata) -> str:
+    """Return the normalized searchable text of an article."""
+    return normalize_text(
+        " ".join(
+            [
+                title,
+                metadata.name,
+                *metadata.actors,
+                *metadata.writers,
+                metadata.language,
+                metadata.quality,
+                metadata.imdb_id,
+            ],
+        ),
+    )
+
+
+# the metadata fields stored in the columns of the same name
+_METADATA_FIELDS = (
+    "name",
+    "duration",
+    "language",
+    "country",
+    "subtitle_file_format",
+    "quality",
+    "imdb_id",
+    "imdb_rating",
+    "actors",
+    "writers",
+)
+
+
+def _article_row(article: SubtitleArticle) -> Dict[str, Any]:
+    """Return the column values of an article."""
+    metadata = article.metadata
+    return {
+        "url": article.url,
+        "title": article.title,
+        "thumbnail": article.thumbnail,
+        **{field: getattr(metadata, field) for field in _METADATA_FIELDS},
+        "search_text": _search_text(article.title, metadata),
+        "indexed_at": datetime.utcnow(),
+    }
+
+
+def _escape_like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class CRUDArticle(CRUDBase[Article, SubtitleArticleSchema, SubtitleArticleSchema]):
+    """CRUD operations and full-text search for the indexed subtitle articles."""
+
+    # noinspection PyMethodMayBeStatic
+    def get_by_url(self, db: Session, *, url: str) -> Optional[Article]:  # PYL-R0201
+        return db.query(Article).filter(Article.url == url).first()
+
+    # noinspection PyMethodMayBeStatic
+    def _merge_rows(  # PYL-R0201
+        self,
+        db: Session,
+        rows: Dict[str, Dict[str, Any]],
+    ) -> None:
+        """Update the existing articles and add the new ones to the session."""
+        existing = {
+            db_obj.url: db_obj
+            for db_obj in db.query(Article).filter(Article.url.in_(rows))
+        }
+        for url, row in rows.items():
+            db_obj = existing.get(url) or Article()
+            for column, value in row.items():
+                setattr(db_obj, column, value)
+            db.add(db_obj)
+
+    def upsert_many(
+        self,
+        db: Session,
+        *,
+        articles: Iterable[SubtitleArticle],
+        retries: int = 2,
+    ) -> int:
+        """Insert the new articles and update the existing ones (by URL).
+
+        On PostgreSQL the articles are upserted with a single
+        `INSERT ... ON CONFLICT (url) DO UPDATE` statement. On other databases
+        the existing articles are selected and updated, and when a concurrent
+        transaction inserts one of the new URLs first, the transaction is
+        rolled back and retried (up to :param:`retries` times).
+
+        Returns:
+            `int`: The number of inserted or updated articles.
+
+        Raises:
+            :class:`IntegrityError`: If the upsert still conflicts after the retries.
+        """
+        rows = {article.url: _article_row(article) for article in articles}
+        if not rows:
+            return 0
+        if db.get_bind().dialect.name == "postgresql":
+            stmt = pg_insert(Article).values(list(rows.values()))
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Article.url],
+                set_={
+                    column: stmt.excluded[column]
+                    for column in next(iter(rows.values()))
+                    if column != "url"
+                },
+            )
+            db.execute(stmt)
+            db.commit()
+            return len(rows)
+        for attempt in range(retries + 1):
+            try:
+                self._merge_rows(db, rows)
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+                if attempt == retries:
+                    raise
+            else:
+                break
+        return len(rows)
+
+    # noinspection PyMethodMayBeStatic
+    def _matching(self, db: Session, words: List[str]) -> Query:  # PYL-R0201
+        """Return the query of the articles matching all the words, best first."""
+        if db.get_bind().dialect.name == "postgresql":
+            # prefix match every word using the full-text index
+            tsvector = func.to_tsvector(literal_column("'simple'"), Article.search_text)
+            tsquery = func.to_tsquery(
+                literal_column("'simple'"),
+                " & ".join(f"{word}:*" for word in words),
+            )
+            return (
+                db.query(Article)
+                .filter(tsvector.op("@@")(tsquery))
+                .order_by(
+                    func.ts_rank(tsvector, tsquery).desc(),
+                    Article.imdb_rating.desc(),
+                    Article.id_.desc(),
+                )
+            )
+        # other databases don't have full-text indexes, match the substrings
+        # and rank the articles containing the words as a phrase first
+        query = db.query(Article)
+        for word in words:
+            query = query.filter(
+                Article.search_text.like(f"%{_escape_like(word)}%", escape="\\"),
+            )
+        phrase = f"%{_escape_like(' '.join(words))}%"
+        return query.order_by(
+            case((Article.search_text.like(phrase, escape="\\"), 0), else_=1),
+            Article.imdb_rating.desc(),
+            Article.id_.desc(),
+        )
+
+    def search(
+        self,
+        db: Session,
+        *,
+        query: str,
+        skip: int = 0,
+        limit: int = 10,
+    ) -> Tuple[List[SubtitleArticle], int]:
+        """Search the indexed articles with full-text search.
+
+        The query and the indexed text are normalized with
+        :func:`normalize_text`, and every word of the query must match the
+        beginning (or a part, on databases other than PostgreSQL) of a word of
+        the title, name, actors, writers, language, quality or IMDb ID.
+
+        Returns:
+            `Tuple[List[SubtitleArticle], int]`: The ranked articles of the
+            requested page and the total number of matching articles.
+        """
+        words = normalize_text(query).split()
+        if not words:
+            return [], 0
+        matching = self._matching(db, words)
+        total = matching.order_by(None).count()
+        db_objs = matching.offset(skip).limit(limit).all() if total > skip else []
+        return [to_subtitle_article(db_obj) for db_obj in db_objs], total
+
+
+def to_subtitle_article(db_obj: Article) -> SubtitleArticle:
+    """Convert an indexed article to a :class:`SubtitleArticle` object."""
+    return SubtitleArticle(
+        title=db_obj.title,
+        url=db_obj.url,
+        thumbnail=db_obj.thumbnail,
+        metadata=SubtitleMetadata(
+            name=db_obj.name,
+            duration=db_obj.duration,
+            language=db_obj.language,
+            country=db_obj.country,
+            subtitle_file_format=db_obj.subtitle_file_format,
+            quality=db_obj.quality,
+            imdb_id=db_obj.imdb_id,
+            imdb_rating=db_obj.imdb_rating,
+            actors=list(db_obj.actors),
+            writers=list(db_obj.writers),
+        ),
+    )
@@ -0,0 +1,155 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from film2subtitle.app.crud.base import CRUDBase
+from film2subtitle.app.models import CrawlState
+
+
+class CRUDCrawlState(CRUDBase[CrawlState, BaseModel, BaseModel]):
+    """CRUD operations for the crawl state of the download pages."""
+
+    # noinspection PyMethodMayBeStatic
+    def mark_seen(  # PYL-R0201
+        self,
+        db: Session,
+        *,
+        sources: Dict[str, str],
+    ) -> int:
+        """Record the URLs found in a listing with their source hashes.
+
+        New URLs and URLs whose source hash has changed are marked as pending.
+
+        Returns:
+            `int`: The number of URLs marked as pending.
+        """
+        if not sources:
+            return 0
+        existing = {
+            db_obj.url: db_obj
+            for db_obj in db.query(CrawlState).filter(CrawlState.url.in_(sources))
+        }
+        now = datetime.utcnow()
+        pending = 0
+        for url, source_hash in sources.items():
+            db_obj = existing.get(url)
+            if db_obj is None:
+                db_obj = CrawlState(url=url, status=CrawlState.PENDING)
+                pending += 1
+            elif db_obj.status != CrawlState.PENDING and (
+                source_hash and source_hash != db_obj.source_hash
+            ):
+                db_obj.status = CrawlState.PENDING
+                db_obj.failures = 0
+                pending += 1
+            db_obj.source_hash = source_hash
+            db_obj.last_seen_at = now
+            db.add(db_obj)
+        db.commit()
+        return pending
+
+    # noinspection PyMethodMayBeStatic
+    def mark_due(self, db: Session, *, before: datetime) -> int:  # PYL-R0201
+        """Mark the pages last crawled before :param:`before` as pending.
+
+        Returns:
+            `int`: The number of URLs marked as pending.
+        """
+        count = (
+            db.query(CrawlState)
+            .filter(
+                CrawlState.status != CrawlState.PENDING,
+                or_(
+                    CrawlState.last_crawled_at.is_(None),
+                    CrawlState.last_crawled_at < before,
+                ),
+            )
+            .update(
+                {CrawlState.status: CrawlState.PENDING, CrawlState.failures: 0},
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+        return count
+
+    # noinspection PyMethodMayBeStatic
+    def get_pending(  # PYL-R0201
+        self,
+        db: Session,
+        *,
+        after_id: int = 0,
+        limit: int = 100,
+    ) -> List[CrawlState]:
+        return (
+            db.query(CrawlState)
+            .filter(CrawlState.status == CrawlState.PENDING)
+            .filter(CrawlState.id_ > after_id)
+            .order_by(CrawlState.id_)
+            .limit(limit)
+            .all()
+        )
+
+    # noinspection PyMethodMayBeStatic
+    def count_pending(self, db: Session) -> int:  # PYL-R0201
+        return (
+            db.query(CrawlState).filter(CrawlState.status == CrawlState.PENDING).count()
+        )
+
+    # noinspection PyMethodMayBeStatic
+    def count_by_status(self, db: Session) -> Dict[str, int]:  # PYL-R0201
+        return dict(
+            db.query(CrawlState.status, func.count(CrawlState.id_)).group_by(
+                CrawlState.status,
+            ),
+        )
+
+    # noinspection PyMethodMayBeStatic
+    def last_crawled_at(self, db: Session) -> Optional[datetime]:  # PYL-R0201
+        return db.query(func.max(CrawlState.last_crawled_at)).scalar()
+
+    # noinspection PyMethodMayBeStatic
+    def mark_crawled(  # PYL-R0201
+        self,
+        db: Session,
+        *,
+        db_obj: CrawlState,
+        content_hash: str,
+    ) -> bool:
+        """Record a successful crawl of a page.
+
+        Returns:
+            `bool`: Whether the content of the page has changed.
+        """
+        changed = content_hash != db_obj.content_hash
+        db_obj.content_hash = content_hash
+        db_obj.status = CrawlState.DONE
+        db_obj.failures = 0
+        db_obj.last_crawled_at = datetime.utcnow()
+        db.add(db_obj)
+        db.commit()
+        return changed
+
+    # noinspection PyMethodMayBeStatic
+    def mark_failed(  # PYL-R0201
+        self,
+        db: Session,
+        *,
+        db_obj: CrawlState,
+        max_failures: int,
+        permanent: bool = False,
+    ) -> None:
+        """Record a failed crawl of a page.
+
+        The page stays pending (and is retried in the next round) until it
+        fails :param:`max_failures` times in a row or the failure is permanent
+        (e.g. the page doesn't exist anymore).
+        """
+        db_obj.failures += 1
+        if permanent or db_obj.failures >= max_failures:
+            db_obj.status = CrawlState.FAILED
+            db_obj.last_crawled_at = datetime.utcnow()
+        db.add(db_obj)
+        db.commit()
@@ -1,2 +1,4 @@
 from film2subtitle.app.db.base_class import Base  # noqa: F401
+from film2subtitle.app.models.article import Article  # noqa: F401
+from film2subtitle.app.models.crawl_state import CrawlState  # noqa: F401
 from film2subtitle.app.models.user import User  # noqa: F401
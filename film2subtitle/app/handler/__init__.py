@@ -1,3 +1,112 @@
+from typing import Any, Dict
+
+from httpx import Limits, Timeout
+
+from film2subtitle.app.core.config import settings
+
+from .cache import create_cache
+from .executor import create_executor
+from .files import FileCache
 from .handler import Film2Subtitle
+from .limiter import AdaptiveLimiter
+from .resilience import CircuitBreaker, Hedger, RetryPolicy
+
+# The shared handler and parser executor are built on first access rather than on
+# import: the workers of a `process` parser executor import this package to
+# unpickle the parsers and must not open the caches and HTTP clients of the app.
+_shared: Dict[str, Any] = {}
+
+
+def _create_shared() -> Dict[str, Any]:
+    """Build the parser executor and the api handler of the app."""
+    # The executor is shut down in the shutdown event handler of the app.
+    parser_executor = create_executor(
+        settings.PARSER_EXECUTOR,
+        max_workers=settings.PARSER_WORKERS,
+    )
+
+    handler = Film2Subtitle(
+        parser_backend=settings.PARSER_BACKEND,
+        cache=create_cache(
+            settings.CACHE_BACKEND,
+            ttl=settings.CACHE_TTL,
+            max_entries=settings.CACHE_MAX_ENTRIES,
+            path=settings.CACHE_SQLITE_PATH,
+            grace=settings.CACHE_STALE_GRACE,
+        ),
+        files=(
+            FileCache(
+                settings.FILE_CACHE_PATH,
+                max_size=settings.FILE_CACHE_MAX_SIZE,
+                max_file_size=settings.FILE_MAX_SIZE,
+            )
+            if settings.FILE_CACHE_MAX_SIZE > 0
+            else None
+        ),
+        max_file_downloads=settings.FILE_MAX_DOWNLOADS,
+        max_file_size=settings.FILE_MAX_SIZE,
+        max_validators=settings.UPSTREAM_MAX_VALIDATORS,
+        limits=Limits(
+            max_connections=settings.UPSTREAM_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.UPSTREAM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.UPSTREAM_KEEPALIVE_EXPIRY,
+        ),
+        max_connections_per_host=settings.UPSTREAM_MAX_CONNECTIONS_PER_HOST,
+        http2=settings.UPSTREAM_HTTP2,
+        timeout=Timeout(
+            settings.UPSTREAM_TIMEOUT,
+            connect=settings.UPSTREAM_CONNECT_TIMEOUT,
+        ),
+        executor=parser_executor,
+        base_url=settings.UPSTREAM_BASE_URL,
+        limiter=(
+            AdaptiveLimiter(
+                rate=settings.UPSTREAM_RATE_LIMIT,
+                burst=settings.UPSTREAM_RATE_BURST,
+                min_limit=settings.UPSTREAM_CONCURRENCY_MIN,
+                max_limit=settings.UPSTREAM_CONCURRENCY_MAX,
+                initial_limit=settings.UPSTREAM_CONCURRENCY_INITIAL,
+                latency_target=settings.UPSTREAM_LATENCY_TARGET,
+                max_queue=settings.UPSTREAM_MAX_QUEUE,
+            )
+            if settings.UPSTREAM_RATE_LIMIT > 0
+            else None
+        ),
+        retry=(
+            RetryPolicy(
+                retries=settings.UPSTREAM_RETRIES,
+                backoff=settings.UPSTREAM_RETRY_BACKOFF,
+                max_backoff=settings.UPSTREAM_RETRY_MAX_BACKOFF,
+            )
+            if settings.UPSTREAM_RETRIES > 0
+            else None
+        ),
+        breaker=(
+            CircuitBreaker(
+                failure_threshold=settings.UPSTREAM_BREAKER_THRESHOLD,
+                recovery_timeout=settings.UPSTREAM_BREAKER_RECOVERY,
+            )
+            if settings.UPSTREAM_BREAKER_THRESHOLD > 0
+            else None
+        ),
+        hedger=(
+            Hedger(
+                quantile=settings.UPSTREAM_HEDGE_QUANTILE,
+                max_ratio=settings.UPSTREAM_HEDGE_MAX_RATIO,
+            )
+            if settings.UPSTREAM_HEDGING
+            else None
+        ),
+        proxies=settings.UPSTREAM_PROXIES,
+        proxy_max_failures=settings.UPSTREAM_PROXY_MAX_FAILURES,
+        proxy_ejection_time=settings.UPSTREAM_PROXY_EJECTION_TIME,
+    )
+    return {"api_handler": handler, "parser_executor": parser_executor}
+
 
-api_handler = Film2Subtitle()
+def __getattr__(name: str) -> Any:
+    if name in ("api_handler", "parser_executor"):
+        if not _shared:
+            _shared.update(_create_shared())
+        return _shared[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
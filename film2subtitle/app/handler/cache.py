@@ -0,0 +1,415 @@
+import asyncio
+import pickle
+import re
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, TypeVar
+from urllib.parse import urlsplit, urlunsplit
+
+__all__ = [
+    "CacheEntry",
+    "CacheStatus",
+    "CacheStats",
+    "CacheBackend",
+    "MemoryCache",
+    "SQLiteCache",
+    "create_cache",
+    "search_key",
+    "page_key",
+]
+
+T = TypeVar("T")
+
+_WHITESPACE_REGEX = re.compile(r"\s+")
+
+
+def search_key(query: str, page: int, kind: str = "search") -> str:
+    """Return a normalized cache key for a search query and page number.
+
+    Queries that only differ in letter case or whitespace share the same key.
+    The :param:`kind` separates the results of the different search methods.
+    """
+    query = _WHITESPACE_REGEX.sub(" ", query).strip().lower()
+    return f"{kind}:{page}:{query}"
+
+
+def page_key(url: str) -> str:
+    """Return a normalized cache key for a download page URL.
+
+    The scheme and host are lower-cased, the fragment is dropped and trailing
+    slashes are ignored, so equivalent URLs share the same key.
+    """
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip("/") or "/"
+    normalized = urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ""),
+    )
+    return f"page:{normalized}"
+
+
+@dataclass
+class CacheEntry:
+    """A cached value with the time it was stored and the time it expires."""
+
+    value: Any
+    stored_at: float
+    expires_at: float
+
+    @property
+    def age(self) -> float:
+        """Return the number of seconds since the value was stored."""
+        return max(0.0, time.time() - self.stored_at)
+
+    @property
+    def fresh(self) -> bool:
+        """Return `True` if the entry has not expired yet."""
+        return time.time() < self.expires_at
+
+
+@dataclass
+class CacheStatus:
+    """How a lookup was answered: `HIT`, `STALE`, `MISS` or `BYPASS` (no
+    cache), and the age of the returned value in seconds.
+    """
+
+    state: str = "BYPASS"
+    age: float = 0.0
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters of a cache backend."""
+
+    backend: str
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+    max_entries: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Return the ratio of cache hits (fresh or stale) to total lookups."""
+        hits = self.hits + self.stale_hits
+        total = hits + self.misses
+        return hits / total if total else 0.0
+
+
+class CacheBackend(ABC):
+    """Abstract base class for the result cache backends.
+
+    Parameters:
+        ttl (`float`): Default time-to-live of the entries in seconds.
+        max_entries (`int`): Maximum number of entries to keep. When the cache
+        is full, the least recently used entries are evicted first.
+        grace (`float`): Number of seconds expired entries are kept for, so
+        they can be served stale while they are being refreshed.
+    """
+
+    name: str = "base"
+
+    def __init__(
+        self,
+        ttl: float = 300,
+        max_entries: int = 1024,
+        grace: float = 0,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be greater than 0.")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.grace = grace
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for :param:`key` or `None` on a miss.
+
+        Expired entries are misses, even within the grace period.
+        """
+        entry = self._get(key)
+        if entry is None or not entry.fresh:
+            self._misses += 1
+            return None
+        self._hits += 1
+        return entry.value
+
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        """Return the cached entry for :param:`key`, which may have expired
+        less than :attr:`grace` seconds ago, or `None` on a miss.
+        """
+        return self._count(self._get(key))
+
+    async def aget_entry(self, key: str) -> Optional[CacheEntry]:
+        """Like :meth:`get_entry`, but does not block the event loop."""
+        return self._count(await self._run(self._get, key))
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store :param:`value` under :param:`key` for :param:`ttl` seconds."""
+        self._evictions += self._set(key, self._entry(value, ttl))
+
+    async def aset(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Like :meth:`set`, but does not block the event loop."""
+        self._evictions += await self._run(self._set, key, self._entry(value, ttl))
+
+    def _entry(self, value: Any, ttl: Optional[float]) -> CacheEntry:
+        now = time.time()
+        return CacheEntry(value, now, now + (self.ttl if ttl is None else ttl))
+
+    def _count(self, entry: Optional[CacheEntry]) -> Optional[CacheEntry]:
+        if entry is None:
+            self._misses += 1
+        elif entry.fresh:
+            self._hits += 1
+        else:
+            self._stale_hits += 1
+        return entry
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a storage operation for the asynchronous methods.
+
+        Backends doing blocking I/O run it in a worker thread.
+        """
+        return func(*args)
+
+    @property
+    def stats(self) -> CacheStats:
+        """Return the hit/miss counters of the cache."""
+        return CacheStats(
+            backend=self.name,
+            hits=self._hits,
+            stale_hits=self._stale_hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            size=len(self),
+            max_entries=self.max_entries,
+        )
+
+    @abstractmethod
+    def _get(self, key: str) -> Optional[CacheEntry]:
+        """Return an entry that has not expired or is in its grace period,
+        or `None`.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def _set(self, key: str, entry: CacheEntry) -> int:
+        """Store the entry and return the number of evicted entries."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove an entry from the cache."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release the resources held by the backend."""
+
+
+class MemoryCache(CacheBackend):
+    """An in-process LRU cache with per-entry expiration time."""
+
+    name = "memory"
+
+    def __init__(
+        self,
+        ttl: float = 300,
+        max_entries: int = 1024,
+        grace: float = 0,
+    ) -> None:
+        super().__init__(ttl, max_entries, grace)
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+
+    def _get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at + self.grace <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _set(self, key: str, entry: CacheEntry) -> int:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        evicted = 0
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            evicted += 1
+        return evicted
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache(CacheBackend):
+    """An LRU cache stored in a SQLite database file.
+
+    Since every worker process opens the same database file, the entries are
+    shared between all the gunicorn workers running on the same machine.
+    Values are serialized using :mod:`pickle`.
+
+    Note:
+        Hit/miss counters are kept per process. The asynchronous methods run
+        the queries in a worker thread.
+    """
+
+    name = "sqlite"
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 300,
+        max_entries: int = 1024,
+        grace: float = 0,
+    ) -> None:
+        super().__init__(ttl, max_entries, grace)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path,
+            timeout=5,
+            isolation_level=None,  # autocommit mode
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, "
+            "value BLOB NOT NULL, "
+            "expires_at REAL NOT NULL, "
+            "accessed_at REAL NOT NULL, "
+            "stored_at REAL NOT NULL DEFAULT 0)",
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(cache)")}
+        if "stored_at" not in columns:
+            # created by an older version
+            self._conn.execute(
+                "ALTER TABLE cache ADD COLUMN stored_at REAL NOT NULL DEFAULT 0",
+            )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_cache_accessed_at ON cache (accessed_at)",
+        )
+
+    def _get(self, key: str) -> Optional[CacheEntry]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at, expires_at FROM cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            if row[2] + self.grace <= now:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                return None
+            try:
+                value = pickle.loads(row[0])
+            except (pickle.UnpicklingError, AttributeError, TypeError):
+                # pickled by an older version with a different layout
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                return None
+            self._conn.execute(
+                "UPDATE cache SET accessed_at = ? WHERE key = ?",
+                (now, key),
+            )
+        return CacheEntry(value, row[1], row[2])
+
+    def _set(self, key: str, entry: CacheEntry) -> int:
+        blob = pickle.dumps(entry.value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache "
+                "(key, value, stored_at, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, blob, entry.stored_at, entry.expires_at, time.time()),
+            )
+            overflow = self._size() - self.max_entries
+            if overflow <= 0:
+                return 0
+            self._conn.execute(
+                "DELETE FROM cache WHERE key IN "
+                "(SELECT key FROM cache ORDER BY accessed_at LIMIT ?)",
+                (overflow,),
+            )
+        return overflow
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+
+    def _size(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._size()
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        return await asyncio.to_thread(func, *args)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def create_cache(
+    backend: str,
+    *,
+    ttl: float = 300,
+    max_entries: int = 1024,
+    path: Optional[str] = None,
+    grace: float = 0,
+) -> Optional[CacheBackend]:
+    """Create a cache backend by its name.
+
+    Parameters:
+        backend (`str`): The name of the backend (`memory`, `sqlite` or `none`).
+        ttl (`float`): Default time-to-live of the entries in seconds.
+        max_entries (`int`): Maximum number of entries to keep.
+        path (`str`): Path of the database file (only used by `sqlite` backend).
+        grace (`float`): Number of seconds expired entries can be served stale.
+
+    Returns:
+        :class:`CacheBackend`: The cache backend or `None` if caching is disabled.
+    """
+    if backend == "none":
+        return None
+    if backend == "memory":
+        return MemoryCache(ttl=ttl, max_entries=max_entries, grace=grace)
+    if backend == "sqlite":
+        if not path:
+            raise ValueError("The sqlite cache backend requires a database path.")
+        return SQLiteCache(path, ttl=ttl, max_entries=max_entries, grace=grace)
+    raise ValueError(
+        f"Invalid cache backend: {backend}. "
+        "Valid cache backends: memory, sqlite, none",
+    )
@@ -0,0 +1,177 @@
+import codecs
+import posixpath
+import re
+import zipfile
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator, List, Optional
+
+from film2subtitle.app.handler.errors import InvalidArchiveError, NotFoundError
+
+__all__ = [
+    "SUBTITLE_FORMATS",
+    "ArchiveEntry",
+    "list_entries",
+    "find_entry",
+    "entry_format",
+    "detect_encoding",
+    "iter_subtitle",
+]
+
+# The output formats and the entry formats they can be converted from
+SUBTITLE_FORMATS = {"vtt": (".srt", ".vtt"), "srt": (".srt",)}
+SUBTITLE_EXTENSIONS = (".srt", ".vtt")
+
+# Entries larger than this (uncompressed) are refused, e.g. zip bombs
+MAX_ENTRY_SIZE = 20 * 1024 * 1024
+
+# `00:01:02,345` (SRT) or `00:01:02.345` (VTT) timestamps
+_TIMESTAMP_REGEX = re.compile(r"(\d+):(\d{2}):(\d{2})[,.](\d{3})")
+# The Arabic letters of the cp1256 subtitles that have Persian forms
+_PERSIAN_LETTERS = str.maketrans({"ي": "ی", "ك": "ک"})
+
+
+@dataclass
+class ArchiveEntry:
+    """A file in a subtitle archive."""
+
+    name: str
+    size: int
+    compressed_size: int
+    subtitle: bool
+
+
+def list_entries(path: str) -> List[ArchiveEntry]:
+    """Return the files in the zip archive at :param:`path`.
+
+    Only the central directory at the end of the archive is read.
+
+    Raises:
+        :class:`InvalidArchiveError`: If the file is not a zip archive.
+    """
+    try:
+        with zipfile.ZipFile(path) as archive:
+            return [
+                ArchiveEntry(
+                    name=info.filename,
+                    size=info.file_size,
+                    compressed_size=info.compress_size,
+                    subtitle=info.filename.lower().endswith(SUBTITLE_EXTENSIONS),
+                )
+                for info in archive.infolist()
+                if not info.is_dir()
+            ]
+    except zipfile.BadZipFile as e:
+        raise InvalidArchiveError() from e
+
+
+def find_entry(archive: zipfile.ZipFile, name: Optional[str] = None) -> zipfile.ZipInfo:
+    """Return the entry :param:`name` of an archive, or its first subtitle file.
+
+    Raises:
+        :class:`NotFoundError`: If the entry is not in the archive.
+        :class:`InvalidArchiveError`: If the entry is too large.
+    """
+    if name is not None:
+        try:
+            info = archive.getinfo(name)
+        except KeyError as e:
+            raise NotFoundError("The archive entry is not found.") from e
+    else:
+        subtitles = sorted(
+            (
+                info
+                for info in archive.infolist()
+                if info.filename.lower().endswith(SUBTITLE_EXTENSIONS)
+            ),
+            key=lambda info: info.filename,
+        )
+        if not subtitles:
+            raise NotFoundError("The archive has no subtitle files.")
+        info = subtitles[0]
+    if info.file_size > MAX_ENTRY_SIZE:
+        raise InvalidArchiveError("The archive entry is too large.")
+    return info
+
+
+def entry_format(name: str) -> str:
+    """Return the format (file extension without the dot) of an archive entry."""
+    return posixpath.splitext(name)[1].lstrip(".").lower()
+
+
+def detect_encoding(head: bytes) -> str:
+    """Return the text encoding of a subtitle file from its first bytes.
+
+    UTF-8 files (with or without a BOM) and UTF-16 files (with a BOM) are
+    detected, and any other file is assumed to be in cp1256 (Windows Arabic), which most of the
+    Persian subtitles are written in.
+    """
+    if head.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    try:
+        # the head may end in the middle of a character
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+    except UnicodeDecodeError:
+        return "cp1256"
+    return "utf-8"
+
+
+def _vtt_timing(match: "re.Match[str]") -> str:
+    hours, minutes, seconds, milliseconds = match.groups()
+    return f"{int(hours):02}:{minutes}:{seconds}.{milliseconds}"
+
+
+def iter_subtitle(
+    stream: BinaryIO,
+    source: str,
+    target: str,
+    chunk_size: int = 64 * 1024,
+) -> Iterator[bytes]:
+    """Convert a subtitle file chunk by chunk and yield it encoded in UTF-8.
+
+    The text is decoded incrementally, so only a single chunk of the file is
+    held in memory. SRT files are converted to WebVTT by adding the `WEBVTT`
+    header and writing the timestamps with dots, and the Arabic letters of
+    cp1256 files are replaced with their Persian forms.
+
+    Parameters:
+        stream (`BinaryIO`): The subtitle file (e.g. an opened archive entry).
+        source (`str`): The format of the file (`srt` or `vtt`).
+        target (`str`): The format to convert to (see :data:`SUBTITLE_FORMATS`).
+        chunk_size (`int`): The number of bytes to read at a time.
+
+    Yields:
+        `bytes`: The converted chunks.
+    """
+    if f".{source}" not in SUBTITLE_FORMATS[target]:
+        raise ValueError(f"Cannot convert {source} subtitles to {target}.")
+    chunk = stream.read(chunk_size)
+    encoding = detect_encoding(chunk)
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    to_vtt = source == "srt" and target == "vtt"
+    if to_vtt:
+        yield b"WEBVTT\n\n"
+
+    def convert(lines: List[str]) -> bytes:
+        output = []
+        for line in lines:
+            line = line.rstrip("\r")
+            if encoding == "cp1256":
+                line = line.translate(_PERSIAN_LETTERS)
+            if to_vtt and "-->" in line:
+                line = _TIMESTAMP_REGEX.sub(_vtt_timing, line)
+            output.append(line)
+        return "".join(f"{line}\n" for line in output).encode()
+
+    pending = ""
+    while chunk:
+        lines = (pending + decoder.decode(chunk)).split("\n")
+        # the last line may continue in the next chunk
+        pending = lines.pop()
+        if lines:
+            yield convert(lines)
+        chunk = stream.read(chunk_size)
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield convert([pending])
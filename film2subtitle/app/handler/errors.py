@@ -4,6 +4,10 @@ __all__ = [
     "NotFoundError",
     "UnauthorizedError",
     "InvalidUrlError",
+    "OverloadedError",
+    "CircuitOpenError",
+    "InvalidArchiveError",
+    "FileTooLargeError",
 ]
 
 
@@ -57,3 +61,47 @@ class InvalidUrlError(Film2SubtitleAPIError):
     ) -> None:
         super().__init__(message, status_code)
         self.url = url
+
+
+class OverloadedError(Film2SubtitleAPIError):
+    """Raised when too many requests are waiting to be sent to the server."""
+
+    def __init__(
+        self,
+        message: str = "Too many pending requests",
+        status_code: int = 503,
+    ) -> None:
+        super().__init__(message, status_code)
+
+
+class CircuitOpenError(Film2SubtitleAPIError):
+    """Raised when the circuit breaker is open because the server keeps failing."""
+
+    def __init__(
+        self,
+        message: str = "The server is temporarily unavailable",
+        status_code: int = 503,
+    ) -> None:
+        super().__init__(message, status_code)
+
+
+class InvalidArchiveError(Film2SubtitleAPIError):
+    """Raised when a downloaded subtitle archive is not a valid zip archive."""
+
+    def __init__(
+        self,
+        message: str = "Invalid subtitle archive",
+        status_code: int = 502,
+    ) -> None:
+        super().__init__(message, status_code)
+
+
+class FileTooLargeError(Film2SubtitleAPIError):
+    """Raised when a subtitle file is larger than the maximum file size."""
+
+    def __init__(
+        self,
+        message: str = "The file is too large",
+        status_code: int = 413,
+    ) -> None:
+        super().__init__(message, status_code)
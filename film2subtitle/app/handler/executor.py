@@ -0,0 +1,47 @@
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Optional, Type, Union
+
+if TYPE_CHECKING:
+    from film2subtitle.app.handler.lxml_parsers import LxmlParser
+    from film2subtitle.app.handler.parsers import Parser
+
+__all__ = ["create_executor", "parse_markup"]
+
+
+def parse_markup(
+    parser_cls: Type[Union["Parser", "LxmlParser"]],
+    markup: str,
+    html_parser: str,
+) -> Any:
+    """Parse the HTML markup of a page with a parser class and return the result.
+
+    It's a module level function so it can be sent to a process pool.
+    """
+    return parser_cls.from_markup(markup, html_parser).parse()
+
+
+def create_executor(mode: str, max_workers: Optional[int] = None) -> Optional[Executor]:
+    """Create the executor to run the page parsers in.
+
+    Parameters:
+        mode (`str`): The executor mode (`process`, `thread` or `none`).
+        max_workers (`int`): The maximum number of workers of the pool.
+
+    Returns:
+        :class:`concurrent.futures.Executor`: The executor or `None` if the pages
+        should be parsed in the event loop.
+    """
+    if mode == "none":
+        return None
+    if mode == "thread":
+        return ThreadPoolExecutor(max_workers, thread_name_prefix="parser")
+    if mode == "process":
+        # Don't fork the running server, start fresh interpreters instead.
+        return ProcessPoolExecutor(
+            max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    raise ValueError(
+        f"Invalid executor mode: {mode}. Valid executor modes: process, thread, none",
+    )
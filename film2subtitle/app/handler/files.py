@@ -0,0 +1,282 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from film2subtitle.app.handler.errors import FileTooLargeError
+
+__all__ = ["StoredFile", "FileDownload", "FileCacheStats", "FileWriter", "FileCache"]
+
+
+@dataclass
+class StoredFile:
+    """A file stored in the :class:`FileCache`."""
+
+    digest: str  # SHA-256 of the content
+    path: str
+    size: int
+    media_type: str
+    filename: str
+
+    @property
+    def etag(self) -> str:
+        """Return the strong ETag of the file (its digest)."""
+        return f'"{self.digest}"'
+
+
+class FileDownload:
+    """A file being downloaded from the upstream.
+
+    The :attr:`body` must be iterated to the end (or closed), which releases
+    the upstream connection.
+    """
+
+    __slots__ = ("status_code", "media_type", "filename", "headers", "body")
+
+    def __init__(
+        self,
+        status_code: int,
+        media_type: str,
+        filename: str,
+        headers: Dict[str, str],
+        body: AsyncIterator[bytes],
+    ) -> None:
+        self.status_code = status_code
+        self.media_type = media_type
+        self.filename = filename
+        # the `Content-Length`, `Content-Range` and `Last-Modified` of the file
+        self.headers = headers
+        self.body = body
+
+
+@dataclass
+class FileCacheStats:
+    """Usage and hit/miss counters of the file cache."""
+
+    files: int
+    size: int
+    max_size: int
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Return the ratio of cache hits to total lookups."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class FileWriter:
+    """Write a file into the :class:`FileCache` while it is being downloaded.
+
+    The content is written to a temporary file and hashed on the fly, and
+    :meth:`commit` moves it into place. Call :meth:`abort` to discard it.
+    """
+
+    __slots__ = ("cache", "key", "media_type", "filename", "_file", "_hash", "_size")
+
+    def __init__(self, cache: "FileCache", key: str, media_type: str, filename: str):
+        self.cache = cache
+        self.key = key
+        self.media_type = media_type
+        self.filename = filename
+        self._file = tempfile.NamedTemporaryFile(dir=cache.tmp_path, delete=False)
+        self._hash = hashlib.sha256()
+        self._size = 0
+
+    def write(self, chunk: bytes) -> None:
+        """Write a chunk of the file.
+
+        Raises:
+            :class:`FileTooLargeError`: If the file gets larger than the
+            :attr:`FileCache.max_file_size` (the written file is discarded).
+        """
+        self._size += len(chunk)
+        if self.cache.max_file_size and self._size > self.cache.max_file_size:
+            self.abort()
+            raise FileTooLargeError()
+        self._file.write(chunk)
+        self._hash.update(chunk)
+
+    def commit(self) -> StoredFile:
+        """Store the written file and return it."""
+        self._file.close()
+        return self.cache.commit(
+            self.key,
+            self._file.name,
+            self._hash.hexdigest(),
+            self._size,
+            self.media_type,
+            self.filename,
+        )
+
+    def abort(self) -> None:
+        """Discard the written file."""
+        self._file.close()
+        with suppress(FileNotFoundError):
+            os.unlink(self._file.name)
+
+
+class FileCache:
+    """A content-addressed cache of files on disk.
+
+    The files are stored by the SHA-256 digest of their content (so the same
+    file downloaded from different URLs is stored once), and each key (e.g.
+    the URL of a file) refers to the digest of its file. When the total size
+    of the files exceeds :param:`max_size`, the least recently used files are
+    evicted first. Keys that refer to an evicted file are dropped on lookup.
+
+    Parameters:
+        path (`str`): The directory to store the files in.
+        max_size (`int`): The maximum total size of the files in bytes.
+        max_file_size (`int`): The maximum size of each file in bytes (`0` for no
+        limit), so a single file can't fill the cache.
+
+    Note:
+        Multiple workers can share the same directory, since the files are
+        moved into place atomically. Each worker evicts files by its own
+        view of the directory.
+    """
+
+    __slots__ = (
+        "path",
+        "max_size",
+        "max_file_size",
+        "tmp_path",
+        "_lock",
+        "_size",
+        "_hits",
+        "_misses",
+        "_evictions",
+    )
+
+    def __init__(self, path: str, max_size: int, max_file_size: int = 0) -> None:
+        self.path = path
+        self.max_size = max_size
+        self.max_file_size = max_file_size
+        self.tmp_path = os.path.join(path, "tmp")
+        for directory in ("objects", "refs", "tmp"):
+            os.makedirs(os.path.join(path, directory), exist_ok=True)
+        self._lock = threading.Lock()
+        self._size = sum(size for _, _, size in self._scan())
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.path, "objects", digest[:2], digest)
+
+    def _ref_path(self, key: str) -> str:
+        name = hashlib.sha256(key.encode()).hexdigest()
+        return os.path.join(self.path, "refs", f"{name}.json")
+
+    def _scan(self) -> List[Tuple[float, str, int]]:
+        """Return the (last access time, path, size) of the stored files."""
+        files = []
+        for directory, _, names in os.walk(os.path.join(self.path, "objects")):
+            for name in names:
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, path, stat.st_size))
+        return files
+
+    def get(self, key: str) -> Optional[StoredFile]:
+        """Return the stored file of :param:`key`, or `None` if it's not stored."""
+        ref_path = self._ref_path(key)
+        try:
+            with open(ref_path, encoding="utf-8") as file:
+                ref = json.load(file)
+            path = self._object_path(ref["digest"])
+        except (FileNotFoundError, ValueError, KeyError):
+            self._misses += 1
+            return None
+        try:
+            # the modification time is the last access time of the LRU
+            os.utime(path)
+        except FileNotFoundError:
+            # the file has been evicted
+            with suppress(FileNotFoundError):
+                os.unlink(ref_path)
+            self._misses += 1
+            return None
+        self._hits += 1
+        return StoredFile(path=path, **ref)
+
+    def writer(self, key: str, media_type: str, filename: str) -> FileWriter:
+        """Return a writer to store the file of :param:`key` with."""
+        return FileWriter(self, key, media_type, filename)
+
+    def commit(
+        self,
+        key: str,
+        tmp_path: str,
+        digest: str,
+        size: int,
+        media_type: str,
+        filename: str,
+    ) -> StoredFile:
+        """Move a written file into place and refer :param:`key` to it."""
+        path = self._object_path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._lock:
+            if os.path.exists(path):
+                # the same content is already stored
+                os.unlink(tmp_path)
+                os.utime(path)
+            else:
+                os.replace(tmp_path, path)
+                self._size += size
+        ref = {
+            "digest": digest,
+            "size": size,
+            "media_type": media_type,
+            "filename": filename,
+        }
+        with tempfile.NamedTemporaryFile(
+            "w",
+            dir=self.tmp_path,
+            delete=False,
+            encoding="utf-8",
+        ) as file:
+            json.dump(ref, file)
+        os.replace(file.name, self._ref_path(key))
+        if self._size > self.max_size:
+            self._evict(keep=path)
+        return StoredFile(path=path, **ref)
+
+    def _evict(self, keep: str) -> None:
+        """Remove the least recently used files (except :param:`keep`) until
+        the cache fits.
+        """
+        with self._lock:
+            files = sorted(self._scan())
+            self._size = sum(size for _, _, size in files)
+            for _, path, size in files:
+                if self._size <= self.max_size:
+                    break
+                if path == keep:
+                    continue
+                with suppress(FileNotFoundError):
+                    os.unlink(path)
+                self._size -= size
+                self._evictions += 1
+
+    @property
+    def stats(self) -> FileCacheStats:
+        """Return a snapshot of the usage and hit/miss counters."""
+        return FileCacheStats(
+            files=len(self._scan()),
+            size=self._size,
+            max_size=self.max_size,
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+        )
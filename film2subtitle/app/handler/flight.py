@@ -0,0 +1,66 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+__all__ = ["SingleFlight"]
+
+T = TypeVar("T")
+
+
+class _Call:
+    """An in-flight call and the number of callers waiting for its result."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Future") -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key onto a single call.
+
+    The first caller of a key starts the call as a separate task and every
+    other caller of the same key waits for that task instead of starting a
+    new one. All the callers get the same result (or the same exception).
+
+    A caller that is cancelled stops waiting without cancelling the shared
+    call for the others. The shared call itself is only cancelled when every
+    caller has gone away.
+    """
+
+    __slots__ = ("_calls", "calls", "shared")
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, _Call] = {}
+        # number of calls actually made and number of callers that joined them
+        self.calls = 0
+        self.shared = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """Return the result of :param:`func`, sharing the call with other
+        concurrent callers of the same :param:`key`.
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(func()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            self.calls += 1
+        else:
+            self.shared += 1
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # nobody is interested in the result anymore
+                self._forget(key, call)
+                call.task.cancel()
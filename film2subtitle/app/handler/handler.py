@@ -1,23 +1,245 @@
-from typing import TYPE_CHECKING, Optional
+import asyncio
+import logging
+import mimetypes
+import posixpath
+import zipfile
+from contextlib import AsyncExitStack, contextmanager
+from contextvars import ContextVar
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    ClassVar,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
+from urllib.parse import unquote, urlencode, urlsplit
 
-from film2subtitle.app.handler.errors import InvalidUrlError
-from film2subtitle.app.handler.sess import AsyncSession
+from film2subtitle.app.handler.cache import (
+    CacheBackend,
+    CacheEntry,
+    CacheStatus,
+    page_key,
+    search_key,
+)
+from film2subtitle.app.handler.converter import (
+    ArchiveEntry,
+    entry_format,
+    find_entry,
+    iter_subtitle,
+    list_entries,
+)
+from film2subtitle.app.handler.errors import (
+    BadRequestError,
+    FileTooLargeError,
+    InvalidArchiveError,
+    InvalidUrlError,
+    NotFoundError,
+)
+from film2subtitle.app.handler.files import FileCache, FileDownload, StoredFile
+from film2subtitle.app.handler.lxml_parsers import (
+    LxmlDownloadPageParser,
+    LxmlLegacySearchParser,
+)
+from film2subtitle.app.handler.pool import HostLimiter
+from film2subtitle.app.handler.sess import AsyncSession, _iter_elements, _scrape_key
 from film2subtitle.app.handler.utils import valid_film2subtitle_url
+from film2subtitle.app.handler.wp_json import POST_FIELDS, parse_posts
 
 from film2subtitle.app.handler.parsers import (  # isort:skip
     DownloadPageParser,
     LegacySearchParser,
 )
+from film2subtitle.app.handler.types import LegacySearchResult  # isort:skip
 
 if TYPE_CHECKING:
+    from httpx import Response
+
     from film2subtitle.app.handler.types import (  # isort:skip
         DownloadPage,
-        LegacySearchResult,
+        EpisodeIndex,
+        SubtitleArticle,
     )
 
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+# the cache status of the lookups made in the current context (see `track_cache`)
+_cache_status: ContextVar[Optional[CacheStatus]] = ContextVar(
+    "cache_status",
+    default=None,
+)
+
+# request the files as they are, so their `Content-Length` can be passed on
+_FILE_HEADERS = {"Accept-Encoding": "identity"}
+# the elements of a search page that are parsed while it is streamed
+_SEARCH_CLASSES = {"sub-article-detail", "page-numbers"}
+# media types of the converted subtitle files
+_SUBTITLE_MEDIA_TYPES = {"vtt": "text/vtt", "srt": "application/x-subrip"}
+
+
+def _file_info(url: str, response: "Response") -> Tuple[str, str]:
+    """Return the media type and the name of a downloaded file."""
+    filename = posixpath.basename(unquote(urlsplit(url).path)) or "subtitle"
+    media_type = response.headers.get("Content-Type", "").split(";")[0].strip()
+    if not media_type or media_type == "application/octet-stream":
+        media_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    return media_type, filename
+
+
+def _content_length(response: "Response") -> int:
+    """Return the `Content-Length` of a response (`0` if it's unknown)."""
+    try:
+        return int(response.headers.get("Content-Length", 0))
+    except ValueError:
+        return 0
+
+
+def _search_url(query: str, page: int) -> str:
+    """Return the URL of a page of the legacy search results."""
+    params = urlencode({"s": query})
+    return f"/page/{page}/?{params}" if page > 1 else f"/?{params}"
+
 
 class Film2Subtitle(AsyncSession):
-    """API handler to interact with main features of `film2subtitle.com` website."""
+    """API handler to interact with main features of `film2subtitle.com` website.
+
+    Parameters:
+        html_parser (`str`): The HTML parser to use for parsing the responses.
+        cache (:class:`CacheBackend`): An optional cache backend to store the
+        parsed search results and download pages in.
+        files (:class:`FileCache`): An optional on-disk cache to store the
+        downloaded subtitle files in.
+        max_file_downloads (`int`): The maximum number of subtitle files
+        downloaded from each host at the same time. Their bodies are read
+        outside the upstream limiter, which only waits for the headers.
+        max_file_size (`int`): The maximum size of a subtitle file in bytes (`0`
+        for no limit). Larger files are rejected by their `Content-Length` or
+        when their body gets larger.
+        kwargs: Additional keyword arguments to pass to :class:`AsyncSession`.
+
+    Note:
+        If the cache backend has a grace period, an expired result is returned
+        immediately (stale-while-revalidate) and refreshed in the background.
+        Only one refresh runs for each key at a time.
+    """
+
+    # Parser classes of each parser backend
+    LEGACY_SEARCH_PARSERS: ClassVar[Dict[str, type]] = {
+        "bs4": LegacySearchParser,
+        "lxml": LxmlLegacySearchParser,
+    }
+    DOWNLOAD_PAGE_PARSERS: ClassVar[Dict[str, type]] = {
+        "bs4": DownloadPageParser,
+        "lxml": LxmlDownloadPageParser,
+    }
+
+    __slots__ = ("cache", "files", "max_file_size", "_file_downloads", "_refreshes")
+
+    def __init__(
+        self,
+        html_parser: Optional[str] = None,
+        cache: Optional[CacheBackend] = None,
+        files: Optional[FileCache] = None,
+        max_file_downloads: int = 20,
+        max_file_size: int = 0,
+        **kwargs,
+    ) -> None:
+        super().__init__(html_parser, **kwargs)
+        self.cache = cache
+        self.files = files
+        self.max_file_size = max_file_size
+        self._file_downloads = HostLimiter(max_file_downloads)
+        self._refreshes: Dict[str, "asyncio.Task[None]"] = {}
+
+    @staticmethod
+    @contextmanager
+    def track_cache() -> Iterator[CacheStatus]:
+        """Record how the cached lookups made inside the block were answered.
+
+        Example:
+            >>> with api.track_cache() as cache_status:
+            ...     result = await api.search("Avengers")
+            >>> cache_status.state, cache_status.age
+            ('STALE', 312.5)
+        """
+        cache_status = CacheStatus()
+        token = _cache_status.set(cache_status)
+        try:
+            yield cache_status
+        finally:
+            _cache_status.reset(token)
+
+    async def _cached(self, key: str, fetch: Callable[[], Awaitable[T]]) -> T:
+        """Return the cached result of :param:`key` or fetch and cache it.
+
+        A stale result (expired, but within the grace period of the cache) is
+        returned as is, and refreshed in the background.
+        """
+        if self.cache is None:
+            return await fetch()
+        entry = await self._lookup(key, fetch)
+        if entry is not None:
+            return entry.value
+        result = await fetch()
+        await self._store(key, result)
+        return result
+
+    async def _lookup(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[T]],
+    ) -> Optional[CacheEntry]:
+        """Return the cached entry of :param:`key`, or `None` on a miss.
+
+        A stale entry is refreshed in the background with :param:`fetch`.
+        """
+        entry = await self.cache.aget_entry(key)
+        if entry is not None:
+            if not entry.fresh:
+                self._revalidate(key, fetch)
+            cache_status = _cache_status.get()
+            if cache_status is not None:
+                cache_status.state = "HIT" if entry.fresh else "STALE"
+                cache_status.age = entry.age
+        return entry
+
+    async def _store(self, key: str, result: Any) -> None:
+        """Cache the result of :param:`key` fetched on a miss."""
+        await self.cache.aset(key, result)
+        cache_status = _cache_status.get()
+        if cache_status is not None:
+            cache_status.state = "MISS"
+            cache_status.age = 0.0
+
+    def _revalidate(self, key: str, fetch: Callable[[], Awaitable[T]]) -> None:
+        """Refresh the cached result of :param:`key` in the background, unless
+        it is already being refreshed.
+        """
+        if key in self._refreshes:
+            return
+
+        async def refresh() -> None:
+            try:
+                await self.cache.aset(key, await fetch())
+            except Exception as e:  # noqa
+                # keep serving the stale result until it leaves the grace period
+                logger.warning("Failed to refresh %s: %r", key, e)
+
+        task = asyncio.ensure_future(refresh())
+        # a task cancelled before it starts (e.g. by `close`) never runs its
+        # `finally` blocks, the callback runs however the task ends
+        task.add_done_callback(lambda _: self._refreshes.pop(key, None))
+        self._refreshes[key] = task
 
     async def legacy_search(
         self,
@@ -39,11 +261,261 @@ class Film2Subtitle(AsyncSession):
             If the requested page for :param:`query` is not found,
             might raise a :class:`NotFoundError`.
         """
-        if not isinstance(page, int) and page < 1:
+        if not isinstance(page, int) or page < 1:
             raise ValueError("Page number must be an integer greater than 0.")
-        url = f"/page/{page}/?s={query}" if page > 1 else f"/?s={query}"
-        soup = await self.html(url)
-        return LegacySearchParser(soup).parse()
+        return await self._cached(
+            search_key(query, page),
+            self._legacy_search_fetch(query, page),
+        )
+
+    def _legacy_search_fetch(
+        self,
+        query: str,
+        page: int,
+    ) -> Callable[[], Awaitable["LegacySearchResult"]]:
+        """Return the function that fetches and parses a search page."""
+        url = _search_url(query, page)
+        return lambda: self.scrape(
+            url,
+            self.LEGACY_SEARCH_PARSERS[self.parser_backend],
+        )
+
+    async def search(
+        self,
+        query: str,
+        page: int = 1,
+        per_page: int = 10,
+    ) -> "LegacySearchResult":
+        """
+        Search for a Movie or TV show using the WordPress REST API
+        (`/wp-json/wp/v2/posts`) of `film2subtitle.com` website.
+
+        The JSON response is much smaller and cheaper to decode than the HTML
+        of the search page, so this method is preferred over
+        :meth:`Film2Subtitle.legacy_search`. The posts are mapped to the same
+        :class:`SubtitleArticle` objects.
+
+        Parameters:
+            query (`str`): The query to search for.
+            page (`int`): The page number to search for. Defaults to `1`.
+            per_page (`int`): The number of articles in each page (at most `100`).
+
+        Returns:
+            :class:`LegacySearchResult`: The parsed search result object.
+
+        Raises:
+            :class:`NotFoundError`: If the requested page for :param:`query` is
+            out of range.
+        """
+        if not isinstance(page, int) or page < 1:
+            raise ValueError("Page number must be an integer greater than 0.")
+        if not 1 <= per_page <= 100:
+            raise ValueError("Number of articles per page must be between 1 and 100.")
+        params = {
+            "search": query,
+            "page": str(page),
+            "per_page": str(per_page),
+            "_fields": POST_FIELDS,
+        }
+        url = f"/wp-json/wp/v2/posts?{urlencode(params)}"
+
+        async def fetch() -> "LegacySearchResult":
+            try:
+                return await self._get_parsed(
+                    "WP-SEARCH",
+                    url,
+                    lambda r: parse_posts(
+                        r.json(),
+                        int(r.headers.get("X-WP-TotalPages", 0)),
+                    ),
+                )
+            except BadRequestError as e:
+                # WordPress answers "rest_post_invalid_page_number" for out of range
+                raise NotFoundError("The requested search page is not found.") from e
+
+        return await self._cached(
+            search_key(query, page, kind=f"wp-search-{per_page}"),
+            fetch,
+        )
+
+    async def iter_search_articles(
+        self,
+        query: str,
+        page: int = 1,
+        result: Optional["LegacySearchResult"] = None,
+    ) -> AsyncIterator["SubtitleArticle"]:
+        """
+        Iterate over the subtitle articles of a search page while the page is
+        being downloaded.
+
+        With the `lxml` parser backend, the page is parsed incrementally and
+        every article is yielded as soon as its HTML is received, without
+        building the tree of the whole page. The page is requested like
+        :meth:`AsyncSession.scrape` does: conditionally if its validators are
+        known, and shared with the concurrent scrapes of the same page. The
+        other backends parse the whole page (see :meth:`legacy_search`). The
+        whole page is cached at the end, and a cached page is returned from
+        the cache.
+
+        Parameters:
+            query (`str`): The query to search for.
+            page (`int`): The page number to search for. Defaults to `1`.
+            result (:class:`LegacySearchResult`): An optional result to fill
+            with the articles and the total pages of the page.
+
+        Yields:
+            :class:`SubtitleArticle`: The parsed subtitle articles.
+        """
+        if not isinstance(page, int) or page < 1:
+            raise ValueError("Page number must be an integer greater than 0.")
+        if result is None:
+            result = LegacySearchResult(total_pages=1, results=[])
+        if self.parser_backend != "lxml":
+            value = await self.legacy_search(query, page)
+            result.total_pages, result.results = value.total_pages, value.results
+            for article in result.results:
+                yield article
+            return
+        key = search_key(query, page)
+        entry = (
+            await self._lookup(key, self._legacy_search_fetch(query, page))
+            if self.cache is not None
+            else None
+        )
+        if entry is not None:
+            result.total_pages = entry.value.total_pages
+            result.results = entry.value.results
+            for article in result.results:
+                yield article
+            return
+
+        _url = self.resolve(_search_url(query, page))
+        articles: "asyncio.Queue[SubtitleArticle]" = asyncio.Queue()
+
+        async def fetch() -> "LegacySearchResult":
+            stored, headers = self._conditional_headers(_url)
+            async with self.stream(_url, headers=headers) as response:
+                if response.status_code == 304 and stored is not None:
+                    return stored.value
+                async for element in _iter_elements(response, _SEARCH_CLASSES):
+                    if "sub-article-detail" in element.get("class", "").split():
+                        article = LxmlLegacySearchParser.parse_article(element)
+                        result.results.append(article)
+                        articles.put_nowait(article)
+                    elif element.tag == "a":
+                        number = LxmlLegacySearchParser.page_number(element)
+                        if number is not None:
+                            result.total_pages = max(result.total_pages, number)
+            self._remember(_url, response, result)
+            return result
+
+        # the scrapes of the same page (e.g. by `legacy_search`) share this one
+        flight = asyncio.ensure_future(
+            self._flights.do(_scrape_key(_url, LxmlLegacySearchParser), fetch),
+        )
+        getter: Optional["asyncio.Future[SubtitleArticle]"] = None
+        try:
+            while True:
+                getter = asyncio.ensure_future(articles.get())
+                await asyncio.wait(
+                    {getter, flight}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not getter.done():
+                    break
+                yield getter.result()
+            value = flight.result()
+            while not articles.empty():
+                yield articles.get_nowait()
+        finally:
+            if getter is not None:
+                getter.cancel()
+            flight.cancel()
+        if value is not result:
+            # not modified, or parsed by another scrape of the page
+            result.total_pages, result.results = value.total_pages, value.results
+            for article in result.results:
+                yield article
+        if self.cache is not None:
+            await self._store(key, result)
+
+    async def iter_legacy_search(
+        self,
+        query: str,
+        max_pages: Optional[int] = None,
+        concurrency: int = 5,
+        unique: bool = True,
+    ) -> AsyncIterator["SubtitleArticle"]:
+        """
+        Iterate over the search results of all the pages for a query.
+
+        The first page is fetched to find the number of total pages, then the
+        rest of the pages are fetched concurrently and their articles are
+        yielded as soon as each page is parsed (not in page order).
+
+        Parameters:
+            query (`str`): The query to search for.
+            max_pages (`int`): The maximum number of pages to fetch. Defaults to all pages.
+            concurrency (`int`): The maximum number of pages to fetch at the same time.
+            unique (`bool`): Whether to skip articles with an already yielded URL.
+
+        Yields:
+            :class:`SubtitleArticle`: The parsed subtitle articles.
+        """
+        if concurrency < 1:
+            raise ValueError("Concurrency must be an integer greater than 0.")
+        seen: Set[str] = set()
+
+        def articles_of(result: "LegacySearchResult") -> List["SubtitleArticle"]:
+            if not unique:
+                return result.results
+            articles = [a for a in result.results if a.url not in seen]
+            seen.update(a.url for a in articles)
+            return articles
+
+        # the articles of the first page are streamed while it is downloaded,
+        # and its page numbers (at the end of the page) tell the total pages
+        first_page = LegacySearchResult(total_pages=1, results=[])
+        try:
+            async for article in self.iter_search_articles(query, 1, first_page):
+                if not unique or article.url not in seen:
+                    seen.add(article.url)
+                    yield article
+        except NotFoundError:
+            return
+
+        total_pages = first_page.total_pages
+        if max_pages is not None:
+            total_pages = min(total_pages, max_pages)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(page: int) -> Optional["LegacySearchResult"]:
+            async with semaphore:
+                try:
+                    return await self.legacy_search(query, page)
+                except NotFoundError:
+                    return None
+
+        tasks = [asyncio.ensure_future(fetch(p)) for p in range(2, total_pages + 1)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                if result := await next_done:
+                    for article in articles_of(result):
+                        yield article
+        finally:
+            # the consumer may stop early (e.g. the client disconnects)
+            for task in tasks:
+                task.cancel()
+
+    @staticmethod
+    def _validate_url(url: str) -> None:
+        """Raise :class:`InvalidUrlError` if :param:`url` is not a valid
+        `film2subtitle.com` URL.
+        """
+        if not valid_film2subtitle_url(url):
+            raise InvalidUrlError(
+                "The provided URL is not a valid film2subtitle.com URL.",
+                url=url,
+            )
 
     async def download_page(self, url: str) -> "DownloadPage":
         """Get the download page of a subtitle.
@@ -58,10 +530,327 @@ class Film2Subtitle(AsyncSession):
             :class:`InvalidUrlError`: If the URL is not a valid `film2subtitle.com` URL.
             :class:`NotFoundError`: If the subtitle page is not found.
         """
-        if not valid_film2subtitle_url(url):
-            raise InvalidUrlError(
-                "The provided URL is not a valid film2subtitle.com URL.",
-                url=url,
+        self._validate_url(url)
+        return await self._cached(
+            page_key(url),
+            lambda: self.scrape(url, self.DOWNLOAD_PAGE_PARSERS[self.parser_backend]),
+        )
+
+    async def episode_index(self, url: str) -> "EpisodeIndex":
+        """Get the season/episode index of a series download page.
+
+        The index is built once when the download page is parsed, and it's
+        cached along with the page.
+
+        Parameters:
+            url (`str`): The URL of the series subtitle.
+
+        Returns:
+            :class:`EpisodeIndex`: The index of the download links.
+
+        Raises:
+            :class:`InvalidUrlError`: If the URL is not a valid `film2subtitle.com` URL.
+            :class:`NotFoundError`: If the page is not found or it's not a series.
+        """
+        page = await self.download_page(url)
+        if page.download_box.episodes is None:
+            raise NotFoundError("The download page is not a series.")
+        return page.download_box.episodes
+
+    async def download_pages(
+        self,
+        urls: List[str],
+        concurrency: int = 10,
+        timeout: Optional[float] = None,
+    ) -> List[Union["DownloadPage", Exception]]:
+        """Get the download pages of multiple subtitles concurrently.
+
+        A failed page doesn't fail the others, its exception is returned in
+        place of its result instead (like :func:`asyncio.gather` does with
+        `return_exceptions=True`).
+
+        Parameters:
+            urls (`List[str]`): The URLs of the subtitles.
+            concurrency (`int`): The maximum number of pages to fetch at the same time.
+            timeout (`float`): The maximum number of seconds to wait for each page
+            (after it gets a free slot). Defaults to no timeout.
+
+        Returns:
+            `List[Union[DownloadPage, Exception]]`: The download page or the
+            exception (e.g. :class:`NotFoundError`, :class:`InvalidUrlError`
+            or :class:`asyncio.TimeoutError`) of each URL, in the same order.
+        """
+        if concurrency < 1:
+            raise ValueError("Concurrency must be an integer greater than 0.")
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(url: str) -> "DownloadPage":
+            async with semaphore:
+                return await asyncio.wait_for(self.download_page(url), timeout)
+
+        return await asyncio.gather(
+            *(fetch(url) for url in urls),
+            return_exceptions=True,
+        )
+
+    def _check_file_size(self, size: int) -> None:
+        """Raise :class:`FileTooLargeError` if :param:`size` is larger than
+        :attr:`max_file_size`.
+        """
+        if self.max_file_size and size > self.max_file_size:
+            raise FileTooLargeError()
+
+    def cached_file(self, url: str) -> Optional[StoredFile]:
+        """Return the stored subtitle file of :param:`url` from the file cache.
+
+        It reads the disk, call it in a thread from the event loop.
+
+        Raises:
+            :class:`InvalidUrlError`: If the URL is not a valid `film2subtitle.com` URL.
+        """
+        self._validate_url(url)
+        if self.files is None:
+            return None
+        return self.files.get(f"file:{url}")
+
+    async def store_file(
+        self,
+        url: str,
+        files: Optional[FileCache] = None,
+    ) -> StoredFile:
+        """Download a subtitle file (e.g. a link of a download box) into the
+        file cache, without holding it in memory.
+
+        Concurrent calls for the same URL share a single download.
+
+        Parameters:
+            url (`str`): The URL of the subtitle file.
+            files (:class:`FileCache`): The file cache to store the file in
+            (e.g. a temporary one when :attr:`files` is disabled). Defaults
+            to :attr:`files`.
+
+        Returns:
+            :class:`StoredFile`: The stored file.
+
+        Raises:
+            :class:`InvalidUrlError`: If the URL is not a valid `film2subtitle.com` URL.
+            :class:`NotFoundError`: If the file is not found.
+            :class:`FileTooLargeError`: If the file is larger than :attr:`max_file_size`.
+        """
+        files = files or self.files
+        if files is None:
+            raise RuntimeError("The file cache is disabled.")
+        self._validate_url(url)
+        stored = await asyncio.to_thread(files.get, f"file:{url}")
+        if stored is not None:
+            return stored
+
+        async def fetch() -> StoredFile:
+            async with self._file_downloads.acquire(urlsplit(url).netloc):
+                async with self.stream(url, headers=_FILE_HEADERS) as response:
+                    self._check_file_size(_content_length(response))
+                    writer = await asyncio.to_thread(
+                        files.writer,
+                        f"file:{url}",
+                        *_file_info(url, response),
+                    )
+                    try:
+                        received = 0
+                        async for chunk in response.aiter_bytes():
+                            received += len(chunk)
+                            self._check_file_size(received)
+                            await asyncio.to_thread(writer.write, chunk)
+                    except BaseException:
+                        writer.abort()
+                        raise
+            return await asyncio.to_thread(writer.commit)
+
+        # the downloads into different caches are not shared
+        return await self._flights.do(("FILE", id(files), url), fetch)
+
+    async def open_file(
+        self,
+        url: str,
+        range_header: Optional[str] = None,
+    ) -> FileDownload:
+        """Start downloading a subtitle file to stream its body chunk by chunk.
+
+        The whole file is stored in the file cache (if any) while its body is
+        iterated. A partial file (of a :param:`range_header`) is not stored.
+
+        Parameters:
+            url (`str`): The URL of the subtitle file.
+            range_header (`str`): The `Range` header to pass on to the upstream.
+
+        Returns:
+            :class:`FileDownload`: The status, headers and body of the file.
+
+        Raises:
+            :class:`InvalidUrlError`: If the URL is not a valid `film2subtitle.com` URL.
+            :class:`NotFoundError`: If the file is not found.
+            :class:`FileTooLargeError`: If the file is larger than :attr:`max_file_size`
+            (the body stops with this error if it gets larger than its `Content-Length`).
+        """
+        self._validate_url(url)
+        headers = dict(_FILE_HEADERS)
+        if range_header:
+            headers["Range"] = range_header
+        stack = AsyncExitStack()
+        try:
+            # the body is read at the pace of the client, so only a limited
+            # number of files are downloaded at the same time
+            await stack.enter_async_context(
+                self._file_downloads.acquire(urlsplit(url).netloc),
             )
-        soup = await self.html(url)
-        return DownloadPageParser(soup).parse()
+            response = await stack.enter_async_context(
+                self.stream(url, headers=headers),
+            )
+            self._check_file_size(_content_length(response))
+            media_type, filename = _file_info(url, response)
+            writer = (
+                await asyncio.to_thread(
+                    self.files.writer,
+                    f"file:{url}",
+                    media_type,
+                    filename,
+                )
+                if self.files is not None and response.status_code == 200
+                else None
+            )
+        except BaseException:
+            await stack.aclose()
+            raise
+
+        async def body() -> AsyncIterator[bytes]:
+            try:
+                received = 0
+                async for chunk in response.aiter_bytes():
+                    received += len(chunk)
+                    self._check_file_size(received)
+                    if writer is not None:
+                        await asyncio.to_thread(writer.write, chunk)
+                    yield chunk
+            except BaseException:
+                # e.g. the client disconnected, don't store a partial file
+                if writer is not None:
+                    writer.abort()
+                raise
+            else:
+                if writer is not None:
+                    await asyncio.to_thread(writer.commit)
+            finally:
+                await stack.aclose()
+
+        return FileDownload(
+            response.status_code,
+            media_type,
+            filename,
+            {
+                name: response.headers[name]
+                for name in ("Content-Length", "Content-Range", "Last-Modified")
+                if name in response.headers
+            },
+            body(),
+        )
+
+    async def archive_entries(
+        self,
+        url: str,
+        files: Optional[FileCache] = None,
+    ) -> List[ArchiveEntry]:
+        """Return the files in a subtitle archive (e.g. a link of a download box).
+
+        The whole archive is downloaded into the file cache first (zip archives
+        are read from their central directory at the end of the file).
+
+        Parameters:
+            url (`str`): The URL of the subtitle archive.
+            files (:class:`FileCache`): The file cache to download the archive
+            into. Defaults to :attr:`files`.
+
+        Raises:
+            :class:`InvalidUrlError`: If the URL is not a valid `film2subtitle.com` URL.
+            :class:`NotFoundError`: If the archive is not found.
+            :class:`InvalidArchiveError`: If the file is not a zip archive.
+        """
+        archive = await self.store_file(url, files)
+        return await asyncio.to_thread(list_entries, archive.path)
+
+    async def convert_subtitle(
+        self,
+        url: str,
+        entry: Optional[str] = None,
+        target: str = "vtt",
+        files: Optional[FileCache] = None,
+    ) -> StoredFile:
+        """Extract a subtitle file from an archive and convert it to UTF-8
+        encoded :param:`target` format (`vtt` or `srt`).
+
+        The conversion starts once the whole archive is downloaded into the
+        file cache (a zip archive can't be read before its central directory at
+        the end of the file). Then the subtitle file is decompressed and
+        converted chunk by chunk (in a thread) into the file cache too. The
+        converted files are stored by the digest of their archive, so they are
+        converted only once.
+
+        Parameters:
+            url (`str`): The URL of the subtitle archive.
+            entry (`str`): The name of the file in the archive. Defaults to the
+            first subtitle file.
+            target (`str`): The format to convert the subtitle file to.
+            files (:class:`FileCache`): The file cache to store the archive and
+            the converted file in. Defaults to :attr:`files`.
+
+        Returns:
+            :class:`StoredFile`: The converted subtitle file.
+
+        Raises:
+            :class:`InvalidUrlError`: If the URL is not a valid `film2subtitle.com` URL.
+            :class:`NotFoundError`: If the archive or the entry is not found.
+            :class:`InvalidArchiveError`: If the file is not a zip archive.
+            `ValueError`: If the entry can't be converted to :param:`target`.
+        """
+        files = files or self.files
+        archive = await self.store_file(url, files)
+        key = f"{target}:{archive.digest}:{entry or ''}"
+        stored = await asyncio.to_thread(files.get, key)
+        if stored is not None:
+            return stored
+
+        def convert() -> StoredFile:
+            try:
+                with zipfile.ZipFile(archive.path) as zip_file:
+                    info = find_entry(zip_file, entry)
+                    stem = posixpath.splitext(posixpath.basename(info.filename))[0]
+                    writer = files.writer(
+                        key,
+                        _SUBTITLE_MEDIA_TYPES[target],
+                        f"{stem}.{target}",
+                    )
+                    try:
+                        with zip_file.open(info) as stream:
+                            for chunk in iter_subtitle(
+                                stream,
+                                entry_format(info.filename),
+                                target,
+                            ):
+                                writer.write(chunk)
+                    except BaseException:
+                        writer.abort()
+                        raise
+            except zipfile.BadZipFile as e:
+                raise InvalidArchiveError() from e
+            return writer.commit()
+
+        return await self._flights.do(
+            ("CONVERT", id(files), key), lambda: asyncio.to_thread(convert)
+        )
+
+    async def close(self) -> None:
+        """Close the API session and the cache backend."""
+        for task in list(self._refreshes.values()):
+            task.cancel()
+        await asyncio.gather(*self._refreshes.values(), return_exceptions=True)
+        await super().close()
+        if self.cache is not None:
+            self.cache.close()
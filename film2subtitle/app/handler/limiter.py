@@ -0,0 +1,274 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass
+from typing import AsyncIterator, Deque, Optional
+
+from httpx import TimeoutException
+
+from film2subtitle.app.handler.errors import OverloadedError
+
+__all__ = ["LimiterStats", "TokenBucket", "Permit", "AdaptiveLimiter"]
+
+
+@dataclass
+class LimiterStats:
+    """Concurrency window, rate and queue statistics of the upstream limiter."""
+
+    limit: int
+    min_limit: int
+    max_limit: int
+    rate: float
+    in_flight: int = 0
+    waiting: int = 0
+    max_queue: int = 0
+    requests: int = 0
+    rejected: int = 0
+    increases: int = 0
+    decreases: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    @property
+    def avg_wait(self) -> float:
+        """Return the average time (in seconds) requests waited in the queue."""
+        return self.total_wait / self.requests if self.requests else 0.0
+
+
+class TokenBucket:
+    """Allow :param:`rate` calls per second on average, with bursts of up to
+    :param:`burst` calls.
+
+    Parameters:
+        rate (`float`): The number of tokens added to the bucket every second.
+        burst (`int`): The capacity of the bucket.
+    """
+
+    __slots__ = ("rate", "burst", "_tokens", "_updated_at", "_lock")
+
+    def __init__(self, rate: float, burst: int) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0.")
+        if burst < 1:
+            raise ValueError("burst must be greater than 0.")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.burst,
+            self._tokens + (now - self._updated_at) * self.rate,
+        )
+        self._updated_at = now
+
+    async def take(self) -> None:
+        """Wait until a token is available and take it (first come, first served)."""
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+class Permit:
+    """A permit to send a request, the status code of the response is used to
+    adapt the concurrency window when the permit is released.
+    """
+
+    __slots__ = ("status_code",)
+
+    def __init__(self) -> None:
+        self.status_code: Optional[int] = None
+
+
+class AdaptiveLimiter:
+    """Limit the requests sent to the upstream with a token bucket and an
+    adaptive concurrency window (AIMD).
+
+    The window grows by one request per window of responses that are faster
+    than :param:`latency_target`, and is halved (at most once per
+    :param:`latency_target`) when a request times out or the server answers
+    with `429 Too Many Requests` or a `5xx` status code. Requests that don't
+    fit in the window or the rate wait in a queue, and new requests are rejected
+    with :class:`OverloadedError` once :param:`max_queue` requests are waiting.
+
+    Parameters:
+        rate (`float`): The maximum number of requests per second (`None` for no limit).
+        burst (`int`): The maximum number of requests sent at once after an idle period.
+        min_limit (`int`): The minimum size of the concurrency window.
+        max_limit (`int`): The maximum size of the concurrency window.
+        initial_limit (`int`): The initial size of the concurrency window.
+        latency_target (`float`): The latency (in seconds) considered healthy.
+        max_queue (`int`): The maximum number of requests waiting in the queue.
+    """
+
+    __slots__ = (
+        "min_limit",
+        "max_limit",
+        "latency_target",
+        "max_queue",
+        "_limit",
+        "_bucket",
+        "_in_flight",
+        "_waiters",
+        "_queued",
+        "_last_decrease",
+        "_stats",
+    )
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: int = 1,
+        min_limit: int = 1,
+        max_limit: int = 100,
+        initial_limit: int = 10,
+        latency_target: float = 2.0,
+        max_queue: int = 1000,
+    ) -> None:
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError(
+                "The limits must satisfy 1 <= min_limit <= initial_limit <= max_limit.",
+            )
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.max_queue = max_queue
+        self._limit = float(initial_limit)
+        self._bucket = TokenBucket(rate, burst) if rate else None
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._queued = 0
+        self._last_decrease = 0.0
+        self._stats = LimiterStats(
+            limit=initial_limit,
+            min_limit=min_limit,
+            max_limit=max_limit,
+            rate=rate or 0.0,
+            max_queue=max_queue,
+        )
+
+    @property
+    def limit(self) -> int:
+        """Return the current size of the concurrency window."""
+        return int(self._limit)
+
+    def _wake_up(self) -> None:
+        """Hand the free slots of the window to the waiting requests."""
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+    async def _acquire_slot(self) -> None:
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # the slot was handed to us right before the cancellation
+                self._release_slot()
+            else:
+                # `_wake_up` drops the cancelled waiters it comes across
+                with suppress(ValueError):
+                    self._waiters.remove(waiter)
+            raise
+
+    def _release_slot(self) -> None:
+        self._in_flight -= 1
+        self._wake_up()
+
+    def _adapt(self, latency: float, overloaded: bool) -> None:
+        """Grow or shrink the concurrency window based on a response."""
+        stats = self._stats
+        if overloaded:
+            now = time.monotonic()
+            if now - self._last_decrease >= self.latency_target:
+                self._last_decrease = now
+                self._limit = max(float(self.min_limit), self._limit / 2)
+                stats.decreases += 1
+        elif latency <= self.latency_target and self._limit < self.max_limit:
+            previous = self.limit
+            self._limit = min(float(self.max_limit), self._limit + 1 / self._limit)
+            if self.limit > previous:
+                stats.increases += 1
+                self._wake_up()
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Permit]:
+        """Wait for a slot in the window and a token and hold the slot until exit.
+
+        Set the `status_code` of the yielded :class:`Permit` to the status code
+        of the response so the window can adapt to it.
+
+        Raises:
+            :class:`OverloadedError`: If too many requests are already waiting.
+        """
+        stats = self._stats
+        if self._queued >= self.max_queue:
+            stats.rejected += 1
+            raise OverloadedError()
+        self._queued += 1
+        started = time.perf_counter()
+        try:
+            await self._acquire_slot()
+            try:
+                if self._bucket is not None:
+                    await self._bucket.take()
+            except BaseException:
+                self._release_slot()
+                raise
+        finally:
+            self._queued -= 1
+        waited = time.perf_counter() - started
+        stats.requests += 1
+        stats.total_wait += waited
+        stats.max_wait = max(stats.max_wait, waited)
+
+        permit = Permit()
+        sent_at = time.perf_counter()
+        try:
+            yield permit
+        except TimeoutException:
+            self._adapt(time.perf_counter() - sent_at, overloaded=True)
+            raise
+        else:
+            status_code = permit.status_code
+            if status_code is not None:
+                self._adapt(
+                    time.perf_counter() - sent_at,
+                    overloaded=status_code == 429 or status_code >= 500,
+                )
+        finally:
+            self._release_slot()
+
+    @property
+    def stats(self) -> LimiterStats:
+        """Return a snapshot of the limiter statistics."""
+        stats = self._stats
+        return LimiterStats(
+            limit=self.limit,
+            min_limit=self.min_limit,
+            max_limit=self.max_limit,
+            rate=stats.rate,
+            in_flight=self._in_flight,
+            waiting=self._queued,
+            max_queue=self.max_queue,
+            requests=stats.requests,
+            rejected=stats.rejected,
+            increases=stats.increases,
+            decreases=stats.decreases,
+            total_wait=stats.total_wait,
+            max_wait=stats.max_wait,
+        )
@@ -0,0 +1,201 @@
+import re
+from abc import ABC, abstractmethod
+from typing import Any, Iterator, List, Optional
+
+from lxml import etree
+from lxml.html import HtmlElement, document_fromstring
+
+from film2subtitle.app.handler.errors import NotFoundError
+
+from film2subtitle.app.handler.parsers import (  # isort:skip
+    _build_download_box,
+    _build_metadata,
+    _build_subtitle_article,
+)
+from film2subtitle.app.handler.types import (  # isort:skip
+    DownloadBox,
+    DownloadPage,
+    LegacySearchResult,
+    SubtitleArticle,
+    SubtitleMetadata,
+)
+
+__all__ = [
+    "LxmlParser",
+    "LxmlLegacySearchParser",
+    "LxmlDownloadPageParser",
+]
+
+
+def _has_class(name: str) -> str:
+    """Return an XPath predicate matching elements with the given class."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# Precompiled XPath selectors used by the parsers.
+_ARTICLES = etree.XPath(f"//*[{_has_class('sub-article-detail')}]")
+_PAGE_NUMBERS = etree.XPath(f"//a[{_has_class('page-numbers')}]")
+_DOWNLOAD_BOX = etree.XPath(f"(//*[{_has_class('sub-download-box')}])[1]")
+# Elements with a class that starts with "sub-meta" (e.g. `li.sub-meta-item`).
+_META_ITEMS = etree.XPath(
+    ".//*[contains(concat(' ', normalize-space(@class)), ' sub-meta')]",
+)
+_META_LEFT = etree.XPath(f"(.//*[{_has_class('sub-meta-left')}])[1]")
+_META_RIGHT = etree.XPath(f"(.//*[{_has_class('sub-meta-right')}])[1]")
+_HREFS = etree.XPath(".//*/@href")
+_FIRST_H1 = etree.XPath("(.//h1)[1]")
+_FIRST_IMG = etree.XPath("(.//img)[1]")
+_LINKS = etree.XPath(".//a")
+_IMDB_REGEX = re.compile("imdb.com")
+
+# Text inside these tags is not part of the text of an element (same as bs4).
+_NON_TEXT_TAGS = frozenset({"script", "style", "template", "rt", "rp"})
+
+
+def _iter_strings(element: HtmlElement) -> Iterator[str]:
+    """Iterate over the text nodes of an element, skipping comments and scripts."""
+    if isinstance(element.tag, str) and element.tag not in _NON_TEXT_TAGS:
+        if element.text:
+            yield element.text
+    for child in element:
+        yield from _iter_strings(child)
+        if child.tail:
+            yield child.tail
+
+
+def _text(element: HtmlElement, strip: bool = False) -> str:
+    """Return the text of an element like `bs4.Tag.get_text` does."""
+    if strip:
+        return "".join(s.strip() for s in _iter_strings(element) if s.strip())
+    return "".join(_iter_strings(element))
+
+
+def _first(xpath: etree.XPath, element: HtmlElement) -> Optional[Any]:
+    result = xpath(element)
+    return result[0] if result else None
+
+
+def _parse_metadata(element: HtmlElement) -> dict:
+    """Parse the metadata of a subtitle article."""
+    sides: List[str] = []
+    for item in _META_ITEMS(element):
+        for selector in (_META_LEFT, _META_RIGHT):
+            if (side := _first(selector, item)) is not None:
+                sides.append(_text(side, strip=True))
+    imdb_href = next(
+        (href for href in _HREFS(element) if _IMDB_REGEX.search(href)),
+        None,
+    )
+    return _build_metadata(sides, imdb_href)
+
+
+def _parse_subtitle_article(element: HtmlElement) -> dict:
+    """Return parsed subtitle article."""
+    return {
+        "title": _text(_first(_FIRST_H1, element), strip=True),
+        "url": _LINKS(element)[0].get("href"),
+        "thumbnail": _first(_FIRST_IMG, element).get("src"),
+        "metadata": _parse_metadata(element),
+    }
+
+
+class LxmlParser(ABC):
+    """Abstract base class for the parsers working on raw `lxml` trees.
+
+    These parsers produce the same objects as the `BeautifulSoup` based
+    parsers, but use precompiled XPath selectors instead of searching the
+    soup, which is considerably faster.
+    """
+
+    def __init__(self, document: HtmlElement) -> None:
+        if not isinstance(document, HtmlElement):
+            raise TypeError(
+                "LxmlParser requires a lxml.html.HtmlElement object as input. "
+                f"Got {type(document)} instead.",
+            )
+        self._document = document
+
+    @classmethod
+    def from_markup(cls, markup: str, html_parser: str = "lxml") -> "LxmlParser":
+        """Create the parser from the HTML markup of a page.
+
+        Parameters:
+            markup (`str`): The HTML markup to parse.
+            html_parser (`str`): Ignored, the markup is always parsed by `lxml`.
+        """
+        return cls(document_fromstring(markup))
+
+    @abstractmethod
+    def parse(self) -> Any:
+        """Parse the HTML tree and return the parsed data as a specific dataclass."""
+        raise NotImplementedError
+
+
+class LxmlLegacySearchParser(LxmlParser):
+    """Parser for the legacy search endpoint."""
+
+    @staticmethod
+    def parse_article(element: HtmlElement) -> SubtitleArticle:
+        """Parse a `sub-article-detail` element (e.g. a streamed one)."""
+        return _build_subtitle_article(_parse_subtitle_article(element))
+
+    @staticmethod
+    def page_number(element: HtmlElement) -> Optional[int]:
+        """Return the number of a `page-numbers` link, or `None` if it has none
+        (e.g. the "next page" link).
+        """
+        text = _text(element)
+        return int(text) if text.isdigit() else None
+
+    def iter_articles(self) -> Iterator[SubtitleArticle]:
+        """Iterate over the subtitle articles parsed from the search results."""
+        for article in _ARTICLES(self._document):
+            yield self.parse_article(article)
+
+    @property
+    def total_pages(self) -> int:
+        """Return the total number of pages for the search results."""
+        if page_numbers := _PAGE_NUMBERS(self._document):
+            numbers = (self.page_number(page_number) for page_number in page_numbers)
+            return max(number for number in numbers if number is not None)
+        return 1
+
+    def parse(self) -> LegacySearchResult:
+        """Parse the search results and return a :class:`LegacySearchResult`."""
+        return LegacySearchResult(
+            total_pages=self.total_pages,
+            results=list(self.iter_articles()),
+        )
+
+
+class LxmlDownloadPageParser(LxmlParser):
+    """Parser for the download pages."""
+
+    def __init__(self, document: HtmlElement) -> None:
+        super().__init__(document)
+        self._download_box = _first(_DOWNLOAD_BOX, self._document)
+        if self._download_box is None:
+            raise NotFoundError("No download box found.")
+
+    @property
+    def articles(self) -> List[SubtitleArticle]:
+        """Return the list of subtitle articles as :class:`SubtitleArticle` objects."""
+        return [
+            _build_subtitle_article(_parse_subtitle_article(article))
+            for article in _ARTICLES(self._document)
+            if _FIRST_H1(article)
+        ]
+
+    @property
+    def download_box(self) -> DownloadBox:
+        """Return the parsed download box object."""
+        return DownloadBox(
+            **_build_download_box(
+                _text(self._download_box),
+                (link.get("href") for link in _LINKS(self._download_box)),
+            ),
+        )
+
+    def parse(self) -> DownloadPage:
+        """Parse the download page and return a :class:`DownloadPage` object."""
+        return DownloadPage(articles=self.articles, download_box=self.download_box)
@@ -1,8 +1,17 @@
 import re
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    ClassVar,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+)
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
 from film2subtitle.app.handler.errors import NotFoundError
 from film2subtitle.app.schemas.subtitles import MediaType
@@ -34,6 +43,12 @@ METADATA_MAP = {
     "نویسنده": "writers",
 }
 
+# The season and the episode of a series link, searched for anywhere in the
+# link (e.g. `S01E01`, `S01.E01` or `S01.720p.E01`). A link without an episode
+# is the link to the whole season (e.g. `S01.Complete`).
+_SEASON_REGEX = re.compile(r"s\d+", re.IGNORECASE)
+_EPISODE_REGEX = re.compile(r"e\d+", re.IGNORECASE)
+
 
 def _metadata_mapper(metadata: Dict[str, Any], key: str, value: str) -> None:
     """Map the metadata key to the metadata value based on the mapping table."""
@@ -53,28 +68,36 @@ def _metadata_mapper(metadata: Dict[str, Any], key: str, value: str) -> None:
             metadata[v] = value
 
 
+def _build_metadata(sides: Iterable[str], imdb_href: Optional[str]) -> Dict[str, Any]:
+    """Build the metadata of a subtitle article from the texts of its
+    `sub-meta-left`/`sub-meta-right` elements and the URL of its IMDb page.
+    """
+    metadata: Dict[str, Any] = {}
+    for text in sides:
+        key, value = text.split(":", 1)
+        # clean up the key and value
+        key = key.replace(" ", "").replace("-", "").lower()
+        value = value.replace("\n", "").strip()
+        # map the key and value to the metadata dict
+        _metadata_mapper(metadata, key, value)
+    if imdb_href:
+        # IMDb ID pattern: tt\d+
+        if match := re.search(r"tt\d+", imdb_href):
+            metadata["imdb_id"] = match.group()
+    return metadata
+
+
 def _parse_metadata(tag_obj: "Tag") -> Dict[str, Any]:
     """Parse the metadata of a subtitle article."""
     # TODO: Parse metadata in subtitle article header wrapper. (e.g. release date)
-    metadata: Dict[str, Any] = {}
+    sides: List[str] = []
     meta_li_tags: List["Tag"] = tag_obj.find_all(class_=re.compile("^sub-meta-*"))
     for li in meta_li_tags:
         left: Optional["Tag"] = li.find(class_="sub-meta-left")
         right: Optional["Tag"] = li.find(class_="sub-meta-right")
-        for side in (left, right):
-            if not side:
-                continue
-            key, value = side.get_text(strip=True).split(":", 1)
-            # clean up the key and value
-            key = key.replace(" ", "").replace("-", "").lower()
-            value = value.replace("\n", "").strip()
-            # map the key and value to the metadata dict
-            _metadata_mapper(metadata, key, value)
-    if imdb_url := tag_obj.find(href=re.compile("imdb.com")):
-        # IMDb ID pattern: tt\d+
-        if match := re.search(r"tt\d+", imdb_url.get("href")):
-            metadata["imdb_id"] = match.group()
-    return metadata
+        sides.extend(side.get_text(strip=True) for side in (left, right) if side)
+    imdb_url: Optional["Tag"] = tag_obj.find(href=re.compile("imdb.com"))
+    return _build_metadata(sides, imdb_url.get("href") if imdb_url else None)
 
 
 def _parse_subtitle_article(tag_obj: "Tag") -> Dict[str, Any]:
@@ -87,24 +110,29 @@ def _parse_subtitle_article(tag_obj: "Tag") -> Dict[str, Any]:
     }
 
 
-def _parse_download_box(dl_box: "Tag") -> Dict[str, Any]:
-    """Return parsed download box from the download page."""
+def _build_subtitle_article(article: Dict[str, Any]) -> SubtitleArticle:
+    """Build a :class:`SubtitleArticle` from a parsed subtitle article."""
+    metadata = article.pop("metadata")
+    return SubtitleArticle(**article, metadata=SubtitleMetadata(**metadata))
+
+
+def _build_download_box(text: str, hrefs: Iterable[str]) -> Dict[str, Any]:
+    """Build the download box from its text and the URLs of its links."""
     dl: Dict[str, Any] = {
         "links": {},
         "media_type": MediaType.UNKNOWN,
     }
-    if not dl_box.text:
+    if not text:
         return dl
-    dl["media_type"] = MediaType.SERIES if "فصل" in dl_box.text else MediaType.MOVIE
-    for link in dl_box.find_all("a"):
-        href: str = link.get("href")
+    dl["media_type"] = MediaType.SERIES if "فصل" in text else MediaType.MOVIE
+    for href in hrefs:
         if dl["media_type"] == MediaType.SERIES:
-            if season_match := re.search(r"s\d+", href, re.IGNORECASE):
+            if season_match := _SEASON_REGEX.search(href):
                 season: Dict[str, str] = dl["links"].setdefault(
                     season_match.group(),
                     {},  # if the season is not found, create a new dict for it.
                 )
-                if episode_match := re.search(r"e\d+", href, re.IGNORECASE):
+                if episode_match := _EPISODE_REGEX.search(href):
                     season[episode_match.group()] = href
                 else:
                     season["all"] = href
@@ -116,8 +144,36 @@ def _parse_download_box(dl_box: "Tag") -> Dict[str, Any]:
     return dl
 
 
+def _parse_download_box(dl_box: "Tag") -> Dict[str, Any]:
+    """Return parsed download box from the download page."""
+    return _build_download_box(
+        dl_box.text,
+        (link.get("href") for link in dl_box.find_all("a")),
+    )
+
+
+def class_strainer(*classes: str) -> SoupStrainer:
+    """Return a :class:`SoupStrainer` that only keeps the elements (and their
+    children) having any of the given classes.
+
+    The strainer gets the raw `class` attribute while the document is being
+    parsed, so the attribute is split and matched class by class.
+    """
+    names = frozenset(classes)
+    return SoupStrainer(
+        class_=lambda value: bool(value) and not names.isdisjoint(value.split()),
+    )
+
+
 class Parser(ABC):
-    """Abstract base class for all parsers."""
+    """Abstract base class for all parsers.
+
+    Subclasses can declare a :attr:`PARSE_ONLY` filter for the parts of the
+    page they need, so only those subtrees are built when the parser is created
+    from markup using :meth:`Parser.from_markup`.
+    """
+
+    PARSE_ONLY: ClassVar[Optional[SoupStrainer]] = None
 
     def __init__(self, soup_obj: BeautifulSoup) -> None:
         if not isinstance(soup_obj, BeautifulSoup):
@@ -127,6 +183,21 @@ class Parser(ABC):
             )
         self._soup = soup_obj
 
+    @classmethod
+    def from_markup(cls, markup: str, html_parser: str) -> "Parser":
+        """Create the parser from the HTML markup of a page.
+
+        Parameters:
+            markup (`str`): The HTML markup to parse.
+            html_parser (`str`): The HTML parser to build the soup with (e.g. `lxml`).
+
+        Note:
+            The :attr:`PARSE_ONLY` filter is not supported by `html5lib`, so
+            the whole page is parsed with that parser.
+        """
+        parse_only = cls.PARSE_ONLY if html_parser != "html5lib" else None
+        return cls(BeautifulSoup(markup, html_parser, parse_only=parse_only))
+
     @abstractmethod
     def parse(self) -> Any:
         """Parse the HTML soup and return the parsed data as a specific dataclass."""
@@ -136,6 +207,8 @@ class Parser(ABC):
 class LegacySearchParser(Parser):
     """Parser for the legacy search endpoint."""
 
+    PARSE_ONLY = class_strainer("sub-article-detail", "page-numbers")
+
     def __init__(self, soup_obj: BeautifulSoup) -> None:
         super().__init__(soup_obj)
 
@@ -143,12 +216,7 @@ class LegacySearchParser(Parser):
         """Iterate over the subtitle articles parsed from the search results."""
         articles: List["Tag"] = self._soup.find_all(class_="sub-article-detail")
         for article in articles:
-            article_dict = _parse_subtitle_article(article)
-            metadata = article_dict.pop("metadata")
-            yield SubtitleArticle(
-                **article_dict,
-                metadata=SubtitleMetadata(**metadata),
-            )
+            yield _build_subtitle_article(_parse_subtitle_article(article))
 
     @property
     def total_pages(self) -> int:
@@ -173,6 +241,8 @@ class LegacySearchParser(Parser):
 class DownloadPageParser(Parser):
     """Parser for the download pages."""
 
+    PARSE_ONLY = class_strainer("sub-article-detail", "sub-download-box")
+
     def __init__(self, soup_obj: BeautifulSoup) -> None:
         super().__init__(soup_obj)
         self._download_box = self._soup.find(class_="sub-download-box")
@@ -184,7 +254,7 @@ class DownloadPageParser(Parser):
         """Return the list of subtitle articles as :class:`SubtitleArticle` objects."""
         articles: List["Tag"] = self._soup.find_all(class_="sub-article-detail")
         return [
-            SubtitleArticle(**_parse_subtitle_article(article))
+            _build_subtitle_article(_parse_subtitle_article(article))
             for article in articles
             if article and article.find("h1")
         ]
@@ -0,0 +1,87 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict
+
+__all__ = ["PoolStats", "HostLimiter"]
+
+
+@dataclass
+class PoolStats:
+    """Occupancy and wait-time statistics of the upstream connection pool."""
+
+    max_connections_per_host: int
+    in_use: int = 0
+    waiting: int = 0
+    requests: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    per_host: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def avg_wait(self) -> float:
+        """Return the average time (in seconds) requests waited for a connection."""
+        return self.total_wait / self.requests if self.requests else 0.0
+
+
+class HostLimiter:
+    """Limit the number of concurrent requests sent to each host.
+
+    Requests that exceed the limit wait for a free slot instead of queuing
+    inside the connection pool of the client, which lets us measure how long
+    requests wait for a connection.
+
+    Parameters:
+        max_per_host (`int`): The maximum number of concurrent requests per host.
+    """
+
+    __slots__ = ("max_per_host", "_semaphores", "_in_use", "_stats")
+
+    def __init__(self, max_per_host: int) -> None:
+        if max_per_host < 1:
+            raise ValueError("max_per_host must be greater than 0.")
+        self.max_per_host = max_per_host
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._in_use: Dict[str, int] = {}
+        self._stats = PoolStats(max_connections_per_host=max_per_host)
+
+    @asynccontextmanager
+    async def acquire(self, host: str) -> AsyncIterator[None]:
+        """Wait for a free slot for :param:`host` and hold it until exit."""
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._semaphores[host] = asyncio.Semaphore(self.max_per_host)
+        stats = self._stats
+        stats.waiting += 1
+        started = time.perf_counter()
+        try:
+            await semaphore.acquire()
+        finally:
+            stats.waiting -= 1
+        waited = time.perf_counter() - started
+        stats.requests += 1
+        stats.total_wait += waited
+        stats.max_wait = max(stats.max_wait, waited)
+        stats.in_use += 1
+        self._in_use[host] = self._in_use.get(host, 0) + 1
+        try:
+            yield
+        finally:
+            stats.in_use -= 1
+            self._in_use[host] -= 1
+            semaphore.release()
+
+    @property
+    def stats(self) -> PoolStats:
+        """Return a snapshot of the pool statistics."""
+        stats = self._stats
+        return PoolStats(
+            max_connections_per_host=self.max_per_host,
+            in_use=stats.in_use,
+            waiting=stats.waiting,
+            requests=stats.requests,
+            total_wait=stats.total_wait,
+            max_wait=stats.max_wait,
+            per_host={host: n for host, n in self._in_use.items() if n},
+        )
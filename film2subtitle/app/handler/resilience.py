@@ -0,0 +1,317 @@
+import asyncio
+import random
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    ClassVar,
+    Deque,
+    FrozenSet,
+    Optional,
+    TypeVar,
+)
+
+from httpx import TransportError
+
+from film2subtitle.app.handler.errors import (
+    CircuitOpenError,
+    Film2SubtitleAPIError,
+    OverloadedError,
+)
+
+__all__ = [
+    "ResilienceStats",
+    "RetryPolicy",
+    "CircuitBreaker",
+    "Hedger",
+    "is_upstream_failure",
+]
+
+T = TypeVar("T")
+
+
+def is_upstream_failure(exc: BaseException) -> bool:
+    """Return `True` if :param:`exc` means the upstream failed to answer.
+
+    Transport errors (connection errors, timeouts, etc.) and `5xx` responses
+    are failures. Errors raised locally (e.g. by the limiter or an open circuit
+    breaker) and `4xx` responses are not.
+    """
+    if isinstance(exc, (OverloadedError, CircuitOpenError)):
+        return False
+    if isinstance(exc, Film2SubtitleAPIError):
+        return exc.status_code >= 500
+    return isinstance(exc, TransportError)
+
+
+@dataclass
+class ResilienceStats:
+    """Retry, circuit breaker and hedging statistics of the upstream requests."""
+
+    retries: int = 0
+    breaker_state: str = "disabled"
+    breaker_opened: int = 0
+    breaker_rejected: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    hedge_delay: Optional[float] = None
+
+
+class RetryPolicy:
+    """Retry idempotent requests with exponential backoff and full jitter.
+
+    The n-th retry waits a random delay between `0` and
+    `min(max_backoff, backoff * 2 ** n)` seconds, so the retries of concurrent
+    requests don't hit the server at the same time.
+
+    Parameters:
+        retries (`int`): The maximum number of retries of a request.
+        backoff (`float`): The base delay (in seconds) of the backoff.
+        max_backoff (`float`): The maximum delay (in seconds) between attempts.
+        statuses (`FrozenSet[int]`): The response status codes to retry.
+    """
+
+    DEFAULT_STATUSES: ClassVar[FrozenSet[int]] = frozenset({502, 503, 504})
+
+    __slots__ = ("retries", "backoff", "max_backoff", "statuses", "count")
+
+    def __init__(
+        self,
+        retries: int = 2,
+        backoff: float = 0.2,
+        max_backoff: float = 2.0,
+        statuses: Optional[FrozenSet[int]] = None,
+    ) -> None:
+        if retries < 0:
+            raise ValueError("retries must not be negative.")
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = self.DEFAULT_STATUSES if statuses is None else statuses
+        # total number of retries
+        self.count = 0
+
+    def should_retry(self, exc: BaseException) -> bool:
+        """Return `True` if the request that raised :param:`exc` can be retried."""
+        if isinstance(exc, (OverloadedError, CircuitOpenError)):
+            return False
+        if isinstance(exc, Film2SubtitleAPIError):
+            return exc.status_code in self.statuses
+        return isinstance(exc, TransportError)
+
+    def delay(self, retry: int) -> float:
+        """Return the delay (in seconds) before the :param:`retry`-th retry."""
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**retry))
+
+    async def run(self, func: Callable[[], Awaitable[T]]) -> T:
+        """Call :param:`func` until it succeeds, fails with an error that can't
+        be retried or runs out of retries.
+        """
+        retry = 0
+        while True:
+            try:
+                return await func()
+            except Exception as e:
+                if retry >= self.retries or not self.should_retry(e):
+                    raise
+            await asyncio.sleep(self.delay(retry))
+            retry += 1
+            self.count += 1
+
+
+class CircuitBreaker:
+    """Fail fast while the upstream keeps failing.
+
+    The breaker opens after :param:`failure_threshold` consecutive failures
+    (see :func:`is_upstream_failure`) and rejects the requests with
+    :class:`CircuitOpenError` for :param:`recovery_timeout` seconds. Then a
+    single probe request is let through (half-open): the breaker closes if it
+    succeeds and opens again if it fails.
+
+    Only the requests answered by the upstream count as successes. Errors that
+    are not upstream failures (e.g. a full limiter queue, an invalid URL or a
+    `4xx` response) are not recorded, and a probe that raises one of them
+    leaves the breaker half-open for the next probe.
+
+    Parameters:
+        failure_threshold (`int`): The number of consecutive failures that
+        open the breaker.
+        recovery_timeout (`float`): The time (in seconds) the breaker stays open.
+    """
+
+    CLOSED: ClassVar[str] = "closed"
+    OPEN: ClassVar[str] = "open"
+    HALF_OPEN: ClassVar[str] = "half-open"
+
+    __slots__ = (
+        "failure_threshold",
+        "recovery_timeout",
+        "opened",
+        "rejected",
+        "_failures",
+        "_opened_at",
+        "_probing",
+    )
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be greater than 0.")
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        # number of times the breaker has opened and requests it has rejected
+        self.opened = 0
+        self.rejected = 0
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        """Return the state of the breaker (`closed`, `open` or `half-open`)."""
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at < self.recovery_timeout:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def _before_request(self) -> bool:
+        """Reject the request if the breaker is open and return whether it is
+        the probe request of a half-open breaker.
+        """
+        state = self.state
+        if state == self.CLOSED:
+            return False
+        if state == self.HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        self.rejected += 1
+        raise CircuitOpenError()
+
+    def _on_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+
+    def _on_failure(self) -> None:
+        self._failures += 1
+        if self._opened_at is not None or self._failures >= self.failure_threshold:
+            if self._opened_at is None or self.state == self.HALF_OPEN:
+                self.opened += 1
+            self._opened_at = time.monotonic()
+
+    @asynccontextmanager
+    async def guard(self) -> AsyncIterator[None]:
+        """Let a request through the breaker and record its outcome on exit.
+
+        Raises:
+            :class:`CircuitOpenError`: If the breaker is open.
+        """
+        probe = self._before_request()
+        try:
+            yield
+        except Exception as e:
+            if is_upstream_failure(e):
+                self._on_failure()
+            raise
+        else:
+            self._on_success()
+        finally:
+            if probe:
+                self._probing = False
+
+
+class Hedger:
+    """Send a second (hedged) request when the first one is slower than the
+    :param:`quantile` of the recent latencies, and return the response that
+    arrives first.
+
+    Only up to :param:`max_ratio` of the requests are hedged, so a slow
+    upstream doesn't receive twice as many requests.
+
+    Parameters:
+        quantile (`float`): The latency quantile to wait for before hedging.
+        min_samples (`int`): The number of latencies to record before hedging.
+        max_ratio (`float`): The maximum ratio of hedged requests.
+        window (`int`): The number of recent latencies to keep.
+    """
+
+    __slots__ = (
+        "quantile",
+        "min_samples",
+        "max_ratio",
+        "requests",
+        "hedges",
+        "wins",
+        "_latencies",
+    )
+
+    def __init__(
+        self,
+        quantile: float = 0.95,
+        min_samples: int = 20,
+        max_ratio: float = 0.1,
+        window: int = 200,
+    ) -> None:
+        if not 0 < quantile < 1:
+            raise ValueError("quantile must be between 0 and 1.")
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.max_ratio = max_ratio
+        self.requests = 0
+        # number of hedged requests and hedged requests that answered first
+        self.hedges = 0
+        self.wins = 0
+        self._latencies: Deque[float] = deque(maxlen=window)
+
+    @property
+    def delay(self) -> Optional[float]:
+        """Return the delay (in seconds) before hedging a request, or `None`
+        if not enough latencies are recorded yet.
+        """
+        if len(self._latencies) < self.min_samples:
+            return None
+        latencies = sorted(self._latencies)
+        return latencies[min(len(latencies) - 1, int(self.quantile * len(latencies)))]
+
+    async def _timed(self, func: Callable[[], Awaitable[T]]) -> T:
+        started = time.perf_counter()
+        result = await func()
+        self._latencies.append(time.perf_counter() - started)
+        return result
+
+    async def run(self, func: Callable[[], Awaitable[T]]) -> T:
+        """Call :param:`func` and call it again if it takes longer than
+        :property:`delay`, returning the first successful result.
+        """
+        self.requests += 1
+        delay = self.delay
+        if delay is None:
+            return await self._timed(func)
+        first = asyncio.ensure_future(self._timed(func))
+        pending = {first}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if done or self.hedges >= self.max_ratio * self.requests:
+                return await first
+            self.hedges += 1
+            second = asyncio.ensure_future(self._timed(func))
+            pending.add(second)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            self.wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
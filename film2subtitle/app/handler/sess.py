@@ -1,14 +1,57 @@
-from typing import TYPE_CHECKING, Any, ClassVar, Dict, Optional, Set
-from urllib.parse import urljoin
+import asyncio
+from concurrent.futures import Executor
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    ClassVar,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+from urllib.parse import urljoin, urlsplit, urlunsplit
 
-from bs4 import BeautifulSoup
-from httpx import AsyncClient
+from bs4 import BeautifulSoup, SoupStrainer
+from httpx import AsyncClient, Limits, Timeout
+from lxml import etree
+from lxml.html import HtmlElementClassLookup
+
+from film2subtitle.app.handler.cache import MemoryCache
 
 # skipcq: PYL-W0614
 from film2subtitle.app.handler.errors import *  # noqa: F401, F403
+from film2subtitle.app.handler.executor import parse_markup
+from film2subtitle.app.handler.flight import SingleFlight
+from film2subtitle.app.handler.limiter import AdaptiveLimiter, LimiterStats, Permit
+from film2subtitle.app.handler.pool import HostLimiter, PoolStats
+from film2subtitle.app.handler.proxies import ProxyPool, ProxyStats, Route
+
+from film2subtitle.app.handler.resilience import (  # isort:skip
+    CircuitBreaker,
+    Hedger,
+    ResilienceStats,
+    RetryPolicy,
+)
 
 if TYPE_CHECKING:
     from httpx import Response
+    from lxml.html import HtmlElement
+
+    from film2subtitle.app.handler.lxml_parsers import LxmlParser
+    from film2subtitle.app.handler.parsers import Parser
+
+T = TypeVar("T")
 
 
 def _validate_response(response: "Response") -> "Response":
@@ -19,7 +62,7 @@ def _validate_response(response: "Response") -> "Response":
         404: NotFoundError,  # noqa: F405
     }
 
-    if response.status_code not in (200, 301, 302, 304):
+    if response.status_code not in (200, 206, 301, 302, 304):
         if err := error_map.get(response.status_code):
             raise err()
         raise Film2SubtitleAPIError(  # noqa: F405
@@ -29,20 +72,145 @@ def _validate_response(response: "Response") -> "Response":
     return response
 
 
+def _flight_key(method: str, url: str, params: Optional[Dict[str, str]]) -> Hashable:
+    """Return the key used to coalesce identical in-flight requests."""
+    return method, url, tuple(sorted((params or {}).items()))
+
+
+def _scrape_key(_url: str, parser_cls: type) -> Hashable:
+    """Return the key used to coalesce the scrapes of a page with a parser."""
+    return _flight_key("SCRAPE", _url, {"parser": parser_cls.__qualname__})
+
+
+class _Validated(NamedTuple):
+    """Cache validators of an upstream page and the result parsed from it."""
+
+    etag: Optional[str]
+    last_modified: Optional[str]
+    value: Any
+
+
+class _ElementStream:
+    """An incremental HTML parser that yields the elements with the given
+    classes once they are closed and discards the rest of the document.
+    """
+
+    __slots__ = ("_classes", "_parser", "_open_matches")
+
+    def __init__(self, classes: Set[str], encoding: Optional[str] = None) -> None:
+        self._classes = classes
+        self._parser = etree.HTMLPullParser(
+            events=("start", "end"),
+            encoding=encoding or "utf-8",
+        )
+        self._parser.set_element_class_lookup(HtmlElementClassLookup())
+        # number of matched elements that are open at the moment
+        self._open_matches = 0
+
+    def _matches(self, element: "HtmlElement") -> bool:
+        return not self._classes.isdisjoint(element.get("class", "").split())
+
+    def _read_events(self) -> Iterator["HtmlElement"]:
+        for event, element in self._parser.read_events():
+            if event == "start":
+                if self._matches(element):
+                    self._open_matches += 1
+                continue
+            if self._matches(element):
+                self._open_matches -= 1
+                yield element
+            if self._open_matches:
+                # still inside a matched element, keep its children
+                continue
+            element.clear(keep_tail=True)
+            # drop the already processed siblings from the tree
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+
+    def feed(self, data: bytes) -> Iterator["HtmlElement"]:
+        """Feed a chunk of the document and yield the closed matched elements."""
+        self._parser.feed(data)
+        return self._read_events()
+
+    def close(self) -> Iterator["HtmlElement"]:
+        """Finish parsing and yield the remaining matched elements."""
+        self._parser.close()
+        return self._read_events()
+
+
+async def _iter_elements(
+    response: "Response",
+    classes: Set[str],
+) -> AsyncIterator["HtmlElement"]:
+    """Incrementally parse the body of a streamed response and yield the
+    elements with any of the given classes (see :meth:`AsyncSession.iter_elements`).
+    """
+    stream = _ElementStream(classes, response.charset_encoding)
+    async for chunk in response.aiter_bytes():
+        for element in stream.feed(chunk):
+            yield element
+    for element in stream.close():
+        yield element
+
+
 class AsyncSession:
     """An asynchronous session for requesting `film2subtitle.com` endpoints.
 
     Parameters:
         html_parser (`str`): The HTML parser to use for parsing the responses
         as `bs4.BeautifulSoup` objects.
+        parser_backend (`str`): The backend of the page parsers, either `bs4`
+        (BeautifulSoup parsers) or `lxml` (XPath selectors on raw `lxml` trees).
+        max_validators (`int`): The maximum number of upstream pages to remember
+        the cache validators (`ETag` and `Last-Modified`) and parsed results for.
+        Set it to `0` to disable conditional requests.
+        limits (:class:`httpx.Limits`): The connection pool limits of the client
+        (maximum connections, keep-alive connections and keep-alive expiry).
+        max_connections_per_host (`int`): The maximum number of concurrent
+        requests sent to a single host. Defaults to the maximum number of connections.
+        http2 (`bool`): Whether to enable HTTP/2 multiplexing.
+        timeout (:class:`httpx.Timeout`): The default timeout of the requests.
+        executor (:class:`concurrent.futures.Executor`): An optional thread or
+        process pool to run the page parsers in, so that parsing large pages
+        does not block the event loop. The session doesn't shut it down.
+        base_url (`str`): The URL of the upstream website. Defaults to
+        `https://film2subtitle.com/`. Absolute `film2subtitle.com` URLs are
+        requested from this URL instead (e.g. a local stand-in server).
+        limiter (:class:`AdaptiveLimiter`): An optional global limiter of the
+        upstream requests (rate and adaptive concurrency window). Requests are
+        rejected with :class:`OverloadedError` when its queue is full.
+        retry (:class:`RetryPolicy`): An optional policy to retry the idempotent
+        requests that fail with a transport error or a `502`, `503` or `504`.
+        breaker (:class:`CircuitBreaker`): An optional circuit breaker that
+        rejects the requests with :class:`CircuitOpenError` while the upstream
+        keeps failing.
+        hedger (:class:`Hedger`): An optional hedger that sends a second `GET`
+        request when the first one is slower than the recent p95 latency.
+        proxies (`Sequence[str]`): The URLs of the proxies to route the requests
+        through. Every proxy gets its own connection pool (with the same limits)
+        and the requests are routed by the health and latency of the proxies.
+        proxy_max_failures (`int`): The number of consecutive failures that eject
+        a proxy from the pool.
+        proxy_ejection_time (`float`): The time (in seconds) an ejected proxy is
+        left out before it is probed again.
 
     Note:
         - The `html_parser` parameter is optional. If not provided, the default
-        HTML parser will be used (`lxml`).
+        HTML parser will be used (`lxml`). It has no effect on the `lxml`
+        parser backend.
 
         - To request a URL that is not a `film2subtitle.com` endpoint, use the
         `request` method on the :class:`httpx.AsyncClient` object returned by
         :property:`AsyncSession.client` property.
+
+        - Concurrent identical `GET` requests (same URL and parameters, without
+        custom headers) are coalesced into a single upstream request and
+        their response is shared between all the callers.
+
+        - Pages requested through :meth:`AsyncSession.scrape` are revalidated
+        with conditional requests. When the upstream answers with
+        `304 Not Modified`, the stored parsed result is returned without
+        downloading or parsing the page again.
     """
 
     BASE_URL: ClassVar[str] = "https://film2subtitle.com/"
@@ -52,14 +220,58 @@ class AsyncSession:
         "html5lib",
         "html.parser",
     }
+    DEFAULT_PARSER_BACKEND: ClassVar[str] = "bs4"
+    VALID_PARSER_BACKENDS: ClassVar[Set[str]] = {"bs4", "lxml"}
     DEFAULT_HEADERS: ClassVar[Dict[str, str]] = {
         "Host": "film2subtitle.com",
         "User-Agent": "Film2SubtitleAPI/v1",
     }
 
-    __slots__ = ("_client", "html_parser")
+    DEFAULT_LIMITS: ClassVar[Limits] = Limits(
+        max_connections=100,
+        max_keepalive_connections=20,
+        keepalive_expiry=30.0,
+    )
+    DEFAULT_TIMEOUT: ClassVar[Timeout] = Timeout(10.0, connect=5.0)
 
-    def __init__(self, html_parser: Optional[str] = None) -> None:
+    __slots__ = (
+        "_client",
+        "_breaker",
+        "_executor",
+        "_flights",
+        "_hedger",
+        "_host_limiter",
+        "_limiter",
+        "_proxies",
+        "_retry",
+        "_validators",
+        "base_url",
+        "headers",
+        "html_parser",
+        "http2",
+        "limits",
+        "parser_backend",
+    )
+
+    def __init__(
+        self,
+        html_parser: Optional[str] = None,
+        parser_backend: Optional[str] = None,
+        max_validators: int = 1024,
+        limits: Optional[Limits] = None,
+        max_connections_per_host: Optional[int] = None,
+        http2: bool = False,
+        timeout: Optional[Timeout] = None,
+        executor: Optional[Executor] = None,
+        base_url: Optional[str] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        hedger: Optional[Hedger] = None,
+        proxies: Optional[Sequence[str]] = None,
+        proxy_max_failures: int = 3,
+        proxy_ejection_time: float = 30.0,
+    ) -> None:
         self.html_parser = html_parser or self.DEFAULT_HTML_PARSER
         # check if the HTML parser is valid
         if self.html_parser not in self.VALID_HTML_PARSERS:
@@ -67,7 +279,59 @@ class AsyncSession:
                 f"Invalid HTML parser: {self.html_parser}. "
                 f"Valid HTML parsers: {', '.join(self.VALID_HTML_PARSERS)}",
             )
-        self._client = AsyncClient(verify=False)
+        self.parser_backend = parser_backend or self.DEFAULT_PARSER_BACKEND
+        if self.parser_backend not in self.VALID_PARSER_BACKENDS:
+            raise ValueError(
+                f"Invalid parser backend: {self.parser_backend}. "
+                f"Valid parser backends: {', '.join(self.VALID_PARSER_BACKENDS)}",
+            )
+        self.base_url = base_url or self.BASE_URL
+        if not self.base_url.endswith("/"):
+            self.base_url += "/"
+        # the Host header must match the upstream the requests are sent to
+        self.headers = {
+            **self.DEFAULT_HEADERS,
+            "Host": urlsplit(self.base_url).netloc,
+        }
+        self.limits = limits or self.DEFAULT_LIMITS
+        self.http2 = http2
+        timeout = timeout or self.DEFAULT_TIMEOUT
+        self._client = AsyncClient(
+            verify=False,
+            limits=self.limits,
+            http2=http2,
+            timeout=timeout,
+        )
+        self._proxies = (
+            ProxyPool(
+                proxies,
+                lambda proxy_url: AsyncClient(
+                    verify=False,
+                    limits=self.limits,
+                    http2=http2,
+                    timeout=timeout,
+                    proxies=proxy_url,
+                ),
+                max_failures=proxy_max_failures,
+                ejection_time=proxy_ejection_time,
+            )
+            if proxies
+            else None
+        )
+        self._host_limiter = HostLimiter(
+            max_connections_per_host or self.limits.max_connections or 100,
+        )
+        self._limiter = limiter
+        self._retry = retry
+        self._breaker = breaker
+        self._hedger = hedger
+        self._flights = SingleFlight()
+        self._executor = executor
+        self._validators = (
+            MemoryCache(ttl=float("inf"), max_entries=max_validators)
+            if max_validators > 0
+            else None
+        )
 
     def __enter__(self) -> "AsyncSession":
         return self
@@ -83,6 +347,53 @@ class AsyncSession:
         """Return the :class:`httpx.AsyncClient` object used for making requests."""
         return self._client
 
+    @property
+    def pool_stats(self) -> PoolStats:
+        """Return the occupancy and wait-time statistics of the connection pool."""
+        return self._host_limiter.stats
+
+    @property
+    def limiter_stats(self) -> Optional[LimiterStats]:
+        """Return the window, rate and queue statistics of the upstream limiter."""
+        return self._limiter.stats if self._limiter is not None else None
+
+    @property
+    def proxy_stats(self) -> List[ProxyStats]:
+        """Return the health and latency statistics of the proxies."""
+        return self._proxies.stats if self._proxies is not None else []
+
+    @property
+    def resilience_stats(self) -> ResilienceStats:
+        """Return the retry, circuit breaker and hedging statistics."""
+        stats = ResilienceStats()
+        if self._retry is not None:
+            stats.retries = self._retry.count
+        if self._breaker is not None:
+            stats.breaker_state = self._breaker.state
+            stats.breaker_opened = self._breaker.opened
+            stats.breaker_rejected = self._breaker.rejected
+        if self._hedger is not None:
+            stats.hedges = self._hedger.hedges
+            stats.hedge_wins = self._hedger.wins
+            stats.hedge_delay = self._hedger.delay
+        return stats
+
+    def resolve(self, url: str) -> str:
+        """Return the absolute URL of :param:`url` on the base URL.
+
+        Relative URLs are joined with the base URL and absolute URLs of the
+        `film2subtitle.com` website (e.g. the links found on the pages) are moved
+        onto it. Other absolute URLs are returned unchanged.
+        """
+        parts = urlsplit(url)
+        host = urlsplit(self.BASE_URL).netloc
+        if self.base_url != self.BASE_URL and parts.netloc.lower() in (
+            host,
+            f"www.{host}",
+        ):
+            url = urlunsplit(("", "", parts.path, parts.query, parts.fragment))
+        return urljoin(self.base_url, url)
+
     async def request(
         self,
         method: str,
@@ -104,30 +415,129 @@ class AsyncSession:
             data (`dict`): The data to send in the request.
             headers (`dict`): The headers to send in the request.
             allow_redirects (`bool`): Whether to allow redirects.
-            timeout (`float`): The timeout for the request.
+            timeout (`float`): The timeout for the request. Defaults to the session timeout.
             kwargs: Additional keyword arguments to pass to :meth:`httpx.AsyncClient.request`.
 
         Returns:
             :class:`httpx.Response`: The response.
         """
         # join the base URL with the URL
-        _url = urljoin(self.BASE_URL, url)
-        # create the headers
-        _headers = self.DEFAULT_HEADERS.copy()
-        if headers:
-            _headers.update(headers)
-        # make the request
-        response = await self._client.request(
+        _url = self.resolve(url)
+        if self._can_coalesce(method, data=data, headers=headers, **kwargs):
+            return await self._flights.do(
+                _flight_key("GET", _url, params),
+                lambda: self._send(
+                    method,
+                    _url,
+                    params=params,
+                    allow_redirects=allow_redirects,
+                    timeout=timeout,
+                ),
+            )
+        return await self._send(
             method,
             _url,
             params=params,
             data=data,
-            headers=_headers,
-            follow_redirects=allow_redirects,
+            headers=headers,
+            allow_redirects=allow_redirects,
             timeout=timeout,
             **kwargs,
         )
-        return _validate_response(response)
+
+    @staticmethod
+    def _can_coalesce(method: str, **kwargs) -> bool:
+        """Return `True` if a request can share the response of an identical
+        in-flight request. Only plain `GET` requests are coalesced.
+        """
+        return method.upper() == "GET" and not any(kwargs.values())
+
+    async def _send(
+        self,
+        method: str,
+        _url: str,
+        *,
+        params: Optional[Dict[str, str]] = None,
+        data: Optional[Dict[str, str]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        allow_redirects: bool = True,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> "Response":
+        """Send a request to an absolute URL and validate the response.
+
+        `GET` requests are hedged and retried if the session is configured to,
+        and all the requests go through the circuit breaker.
+        """
+        # create the headers
+        _headers = self.headers.copy()
+        if headers:
+            _headers.update(headers)
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+
+        host = urlsplit(_url).netloc
+
+        async def send() -> "Response":
+            async with self._acquire(host) as permit, self._route() as route:
+                response = await route.client.request(
+                    method,
+                    _url,
+                    params=params,
+                    data=data,
+                    headers=_headers,
+                    follow_redirects=allow_redirects,
+                    **kwargs,
+                )
+                permit.status_code = route.status_code = response.status_code
+            return _validate_response(response)
+
+        async def attempt() -> "Response":
+            if self._breaker is None:
+                return await send()
+            async with self._breaker.guard():
+                return await send()
+
+        if method.upper() != "GET":
+            return await attempt()
+
+        async def hedged() -> "Response":
+            if self._hedger is None:
+                return await attempt()
+            return await self._hedger.run(attempt)
+
+        if self._retry is None:
+            return await hedged()
+        return await self._retry.run(hedged)
+
+    @asynccontextmanager
+    async def _route(self) -> AsyncIterator[Route]:
+        """Choose the client to send a request with (through a proxy, if any)."""
+        if self._proxies is None:
+            yield Route(self._client)
+            return
+        async with self._proxies.route() as route:
+            yield route
+
+    @asynccontextmanager
+    async def _guard(self) -> AsyncIterator[None]:
+        """Let a request through the circuit breaker (if any)."""
+        if self._breaker is None:
+            yield
+            return
+        async with self._breaker.guard():
+            yield
+
+    @asynccontextmanager
+    async def _acquire(self, host: str) -> AsyncIterator[Permit]:
+        """Wait for the global limiter (if any) and then for the host limiter."""
+        if self._limiter is None:
+            async with self._host_limiter.acquire(host):
+                yield Permit()
+            return
+        async with self._limiter.acquire() as permit:
+            async with self._host_limiter.acquire(host):
+                yield permit
 
     async def json(self, url: str, **kwargs) -> Any:
         """Get the JSON response from a URL.
@@ -139,22 +549,198 @@ class AsyncSession:
         Returns:
             `Any`: The JSON response.
         """
-        response = await self.request("GET", url, **kwargs)
-        return response.json()
+        return await self._get_parsed("JSON", url, lambda r: r.json(), **kwargs)
 
-    async def html(self, url: str, **kwargs) -> BeautifulSoup:
+    async def html(
+        self,
+        url: str,
+        parse_only: Optional[SoupStrainer] = None,
+        **kwargs,
+    ) -> BeautifulSoup:
         """Get the parsed HTML response from a URL as a `bs4.BeautifulSoup` object.
 
         Parameters:
             url (`str`): The URL to request (relative to the base URL).
+            parse_only (:class:`bs4.SoupStrainer`): An optional filter to only
+            parse the matching parts of the document (see :func:`class_strainer`).
             kwargs: Additional keyword arguments to pass to :meth:`AsyncSession.request`.
 
         Returns:
             :class:`bs4.BeautifulSoup`: The HTML response.
         """
-        response = await self.request("GET", url, **kwargs)
-        return BeautifulSoup(response.text, self.html_parser)
+        return await self._get_parsed(
+            "HTML" if parse_only is None else f"HTML:{id(parse_only)}",
+            url,
+            lambda r: BeautifulSoup(r.text, self.html_parser, parse_only=parse_only),
+            **kwargs,
+        )
+
+    async def iter_elements(
+        self,
+        url: str,
+        classes: Set[str],
+    ) -> AsyncIterator["HtmlElement"]:
+        """Incrementally parse the HTML response of a URL while it is being
+        downloaded and yield the elements with any of the given classes as
+        soon as they are closed.
+
+        The rest of the document is discarded while parsing, so the memory
+        usage stays proportional to the size of a single matched element
+        instead of the whole page.
+
+        Parameters:
+            url (`str`): The URL to request (relative to the base URL).
+            classes (`Set[str]`): The class names of the elements to yield.
+
+        Yields:
+            :class:`lxml.html.HtmlElement`: The matched elements in document order.
+
+        Note:
+            A yielded element (and its children) is cleared when the iteration
+            continues, so it must be processed before requesting the next one.
+        """
+        # the response is validated after its outcome is recorded by the
+        # limiter and the proxy pool (see `stream`)
+        async with self.stream(url) as response:
+            async for element in _iter_elements(response, classes):
+                yield element
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> AsyncIterator["Response"]:
+        """Send a streaming `GET` request to a URL (e.g. a subtitle file).
+
+        The body of the response is not read, iterate over it with
+        :meth:`httpx.Response.aiter_bytes` inside the block. The limiter and
+        host slots are released (and the outcome is recorded) once the headers
+        of the response arrive, so slow readers of the body don't hold them.
+
+        Parameters:
+            url (`str`): The URL to request (relative to the base URL).
+            headers (`dict`): The headers to send in the request.
+
+        Yields:
+            :class:`httpx.Response`: The validated response.
+        """
+        _url = self.resolve(url)
+        host = urlsplit(_url).netloc
+        # the files may be on another host (e.g. `dl.film2subtitle.com`)
+        _headers = {**self.headers, "Host": host, **(headers or {})}
+        async with AsyncExitStack() as stack:
+            async with self._guard(), self._acquire(host) as permit:
+                async with self._route() as route:
+                    response = await stack.enter_async_context(
+                        route.client.stream(
+                            "GET",
+                            _url,
+                            headers=_headers,
+                            follow_redirects=True,
+                        ),
+                    )
+                    permit.status_code = route.status_code = response.status_code
+            yield _validate_response(response)
+
+    async def scrape(
+        self,
+        url: str,
+        parser_cls: Type[Union["Parser", "LxmlParser"]],
+    ) -> Any:
+        """Get the HTML response from a URL and parse it using a parser class.
+
+        The page is requested conditionally (`If-None-Match` and
+        `If-Modified-Since`) when its validators are known, and the previously
+        parsed result is returned if the page has not been modified.
+
+        Parameters:
+            url (`str`): The URL to request (relative to the base URL).
+            parser_cls (`Type[Parser]`): The parser class to parse the page with
+            (either a `bs4` or an `lxml` parser).
+
+        Returns:
+            `Any`: The result of :meth:`Parser.parse`.
+        """
+        _url = self.resolve(url)
+
+        async def fetch() -> Any:
+            stored, headers = self._conditional_headers(_url)
+            response = await self.request("GET", _url, headers=headers)
+            if response.status_code == 304 and stored is not None:
+                return stored.value
+            value = await self._parse(parser_cls, response.text)
+            self._remember(_url, response, value)
+            return value
+
+        return await self._flights.do(_scrape_key(_url, parser_cls), fetch)
+
+    def _conditional_headers(
+        self,
+        _url: str,
+    ) -> Tuple[Optional[_Validated], Dict[str, str]]:
+        """Return the stored validators of a page and the headers to request
+        it conditionally with (`If-None-Match` and `If-Modified-Since`).
+        """
+        stored: Optional[_Validated] = (
+            self._validators.get(_url) if self._validators is not None else None
+        )
+        headers = {}
+        if stored is not None:
+            if stored.etag:
+                headers["If-None-Match"] = stored.etag
+            if stored.last_modified:
+                headers["If-Modified-Since"] = stored.last_modified
+        return stored, headers
+
+    def _remember(self, _url: str, response: "Response", value: Any) -> None:
+        """Store the validators of a page with the result parsed from it."""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if self._validators is not None and (etag or last_modified):
+            self._validators.set(_url, _Validated(etag, last_modified, value))
+
+    async def _parse(
+        self,
+        parser_cls: Type[Union["Parser", "LxmlParser"]],
+        markup: str,
+    ) -> Any:
+        """Parse the markup of a page, in the executor if the session has one."""
+        if self._executor is None:
+            return parse_markup(parser_cls, markup, self.html_parser)
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor,
+            parse_markup,
+            parser_cls,
+            markup,
+            self.html_parser,
+        )
+
+    async def _get_parsed(
+        self,
+        kind: str,
+        url: str,
+        parse: Callable[["Response"], T],
+        **kwargs,
+    ) -> T:
+        """Make a `GET` request and parse the response using :param:`parse`.
+
+        Concurrent identical calls share both the response and the parsed
+        result, so the page is downloaded and parsed only once.
+        """
+        if not self._can_coalesce("GET", **kwargs):
+            return parse(await self.request("GET", url, **kwargs))
+
+        async def fetch() -> T:
+            return parse(await self.request("GET", url))
+
+        return await self._flights.do(
+            _flight_key(kind, self.resolve(url), None),
+            fetch,
+        )
 
     async def close(self) -> None:
         """Close the API session."""
         await self._client.aclose()
+        if self._proxies is not None:
+            await self._proxies.close()
@@ -1,10 +1,13 @@
-from dataclasses import dataclass, field
-from typing import List
+import sys
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar
 
 __all__ = [
     "SubtitleArticle",
     "SubtitleMetadata",
     "LegacySearchResult",
+    "EpisodeIndex",
     "DownloadBox",
     "DownloadPage",
 ]
@@ -12,12 +15,65 @@ __all__ = [
 # Common types used in the API (e.g. legacy search and download page).
 from film2subtitle.app.schemas.subtitles import MediaType
 
+T = TypeVar("T")
 
+
+def _add_slots(cls: Type[T]) -> Type[T]:
+    """Recreate a dataclass with `__slots__` for its fields.
+
+    Instances of slotted classes don't have a `__dict__`, which makes them much
+    smaller (like `dataclass(slots=True)` of Python 3.10+). They are pickled by
+    their field values, so unpickling them goes through `__init__` (and
+    `__post_init__`) again.
+
+    The names in the `__slots__` of the class are added as slots too, for the
+    attributes derived from the fields in `__post_init__` (they are not pickled).
+    """
+    names = tuple(f.name for f in fields(cls))
+    extra_slots = tuple(cls.__dict__.get("__slots__", ()))
+    cls_dict = dict(cls.__dict__)
+    cls_dict["__slots__"] = names + extra_slots
+    for name in names + extra_slots:
+        # the class attributes of the default values would shadow the slots
+        cls_dict.pop(name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+
+    def __reduce__(self) -> Tuple[type, Tuple[Any, ...]]:
+        return type(self), tuple(getattr(self, name) for name in names)
+
+    cls_dict["__reduce__"] = __reduce__
+    slotted = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    slotted.__qualname__ = cls.__qualname__
+    return slotted
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Return the interned copy of a string (`None` is returned as is).
+
+    :func:`sys.intern` only accepts exact `str` objects, so subclasses (e.g. the
+    `_ElementUnicodeResult` strings of `lxml`) are converted to `str` first.
+    """
+    return None if value is None else sys.intern(str(value))
+
+
+def _intern_keys(mapping: Dict[str, Any]) -> Dict[str, Any]:
+    """Return :param:`mapping` with interned keys (and nested dict keys)."""
+    return {
+        _intern(k): _intern_keys(v) if isinstance(v, dict) else v
+        for k, v in mapping.items()
+    }
+
+
+@_add_slots
 @dataclass
 class SubtitleMetadata:
     """The metadata parsed from a subtitle article.
     This metadata can be retrieved from a legacy search result or
     from the download page of a subtitle.
+
+    The low-cardinality fields (language, country, file format and quality)
+    are interned, so the cached articles share a single copy of each value.
     """
 
     name: str
@@ -31,7 +87,14 @@ class SubtitleMetadata:
     actors: List[str] = field(default_factory=list)
     writers: List[str] = field(default_factory=list)
 
+    def __post_init__(self) -> None:
+        self.language = _intern(self.language)
+        self.country = _intern(self.country)
+        self.subtitle_file_format = _intern(self.subtitle_file_format)
+        self.quality = _intern(self.quality)
 
+
+@_add_slots
 @dataclass
 class SubtitleArticle:
     """
@@ -45,6 +108,7 @@ class SubtitleArticle:
 
 
 # Types used in the legacy search API.
+@_add_slots
 @dataclass
 class LegacySearchResult:
     """A dataclass containing the results for a legacy search and the number of total pages."""
@@ -53,14 +117,110 @@ class LegacySearchResult:
     results: List[SubtitleArticle]
 
 
+def _number(key: str) -> Optional[int]:
+    """Return the number of a season or episode key (e.g. `S01` or `E01`)."""
+    number = key[1:]
+    return int(number) if number.isdigit() else None
+
+
+class EpisodeIndex:
+    """A season/episode index of the links of a series download box.
+
+    The seasons and the episodes of each season are sorted by their numbers,
+    and the link of an episode is looked up by its numbers in O(1).
+    """
+
+    __slots__ = ("seasons", "_episodes", "_links", "_packs")
+
+    def __init__(self) -> None:
+        self.seasons: Tuple[int, ...] = ()
+        self._episodes: Dict[int, Tuple[int, ...]] = {}
+        self._links: Dict[Tuple[int, int], str] = {}
+        self._packs: Dict[int, str] = {}
+
+    @classmethod
+    def from_links(cls, links: Dict[str, Dict[str, str]]) -> "EpisodeIndex":
+        """Build the index from the links of a series download box
+        (e.g. `{"S01": {"E01": url, "all": url}}`).
+        """
+        index = cls()
+        episodes: Dict[int, List[int]] = {}
+        for season_key, season_links in links.items():
+            season = _number(season_key)
+            if season is None:
+                continue
+            numbers = episodes.setdefault(season, [])
+            for episode_key, url in season_links.items():
+                if episode_key == "all":
+                    index._packs[season] = url
+                elif (episode := _number(episode_key)) is not None:
+                    if (season, episode) not in index._links:
+                        numbers.append(episode)
+                    index._links[season, episode] = url
+        index.seasons = tuple(sorted(episodes))
+        index._episodes = {
+            season: tuple(sorted(numbers)) for season, numbers in episodes.items()
+        }
+        return index
+
+    def __len__(self) -> int:
+        """Return the number of episodes."""
+        return len(self._links)
+
+    def episodes(self, season: int) -> Tuple[int, ...]:
+        """Return the sorted episode numbers of a season."""
+        return self._episodes.get(season, ())
+
+    def get(self, season: int, episode: int) -> Optional[str]:
+        """Return the link of an episode, or `None` if it's not in the index."""
+        return self._links.get((season, episode))
+
+    def season_pack(self, season: int) -> Optional[str]:
+        """Return the link of the whole season, or `None` if it has none."""
+        return self._packs.get(season)
+
+    def range(
+        self,
+        season: int,
+        first: Optional[int] = None,
+        last: Optional[int] = None,
+    ) -> List[Tuple[int, str]]:
+        """Return the (episode, link) pairs of a season from episode
+        :param:`first` to :param:`last` (inclusive), sorted by episode.
+        """
+        numbers = self._episodes.get(season, ())
+        start = bisect_left(numbers, first) if first is not None else 0
+        end = bisect_right(numbers, last) if last is not None else len(numbers)
+        return [
+            (episode, self._links[season, episode]) for episode in numbers[start:end]
+        ]
+
+
+@_add_slots
 @dataclass
 class DownloadBox:
-    """A download box containing links to download a subtitle."""
+    """A download box containing links to download a subtitle.
+
+    The season, episode and quality keys of the links (e.g. `S01` and `E01`)
+    are interned, and the links of a series are indexed by their season and
+    episode numbers in :attr:`episodes`.
+    """
+
+    __slots__ = ("episodes",)
 
     media_type: MediaType
     links: dict
 
+    def __post_init__(self) -> None:
+        self.links = _intern_keys(self.links)
+        self.episodes: Optional[EpisodeIndex] = (
+            EpisodeIndex.from_links(self.links)
+            if self.media_type == MediaType.SERIES
+            else None
+        )
+
 
+@_add_slots
 @dataclass
 class DownloadPage:
     """Represents download page of a subtitle."""
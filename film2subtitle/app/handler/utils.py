@@ -1,4 +1,6 @@
 import re
+import unicodedata
+from urllib.parse import urlsplit
 
 HTTP_URL_REGEX = re.compile(
     r"https?://(www\.)?[-a-zA-Z\d@:%._+~#=]{1,256}"
@@ -6,6 +8,64 @@ HTTP_URL_REGEX = re.compile(
 )
 
 
+FILM2SUBTITLE_HOST = "film2subtitle.com"
+
+
 def valid_film2subtitle_url(url: str) -> bool:
-    """Return `True` if the given URL is a valid Film2Subtitle URL."""
-    return bool(HTTP_URL_REGEX.match(url) and "film2subtitle.com" in url)
+    """Return `True` if the given URL is a valid Film2Subtitle URL.
+
+    The URL must be an `http(s)` URL of `film2subtitle.com` (or one of its
+    subdomains, e.g. `dl.film2subtitle.com`) without credentials, so the URLs
+    requested on behalf of the clients can't point to other hosts.
+    """
+    if not HTTP_URL_REGEX.match(url):
+        return False
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return False
+    hostname = parts.hostname or ""
+    return (
+        parts.scheme in ("http", "https")
+        and "@" not in parts.netloc
+        and (
+            hostname == FILM2SUBTITLE_HOST
+            or hostname.endswith(f".{FILM2SUBTITLE_HOST}")
+        )
+    )
+
+
+# Arabic letters commonly typed instead of their Persian forms, Persian/Arabic
+# digits and the zero-width non-joiner (used inside Persian words).
+_PERSIAN_TRANSLATION = str.maketrans(
+    {
+        "ي": "ی",
+        "ى": "ی",
+        "ئ": "ی",
+        "ك": "ک",
+        "ة": "ه",
+        "ۀ": "ه",
+        "أ": "ا",
+        "إ": "ا",
+        "آ": "ا",
+        "ؤ": "و",
+        "\u200c": " ",
+        **{chr(0x06F0 + i): str(i) for i in range(10)},  # Persian digits
+        **{chr(0x0660 + i): str(i) for i in range(10)},  # Arabic digits
+    },
+)
+# Arabic diacritics (harakat), superscript alef and tatweel
+_DIACRITICS_REGEX = re.compile("[\u064b-\u065f\u0670\u0640]")
+_NON_WORD_REGEX = re.compile(r"[\W_]+")
+
+
+def normalize_text(text: str) -> str:
+    """Normalize Persian and English text for full-text search.
+
+    The text is case-folded, Arabic letters and digits are replaced with their
+    Persian and ASCII forms, diacritics are removed and the words are separated
+    by a single space, so different spellings of the same words match.
+    """
+    text = unicodedata.normalize("NFKC", text).translate(_PERSIAN_TRANSLATION)
+    text = _DIACRITICS_REGEX.sub("", text.casefold())
+    return _NON_WORD_REGEX.sub(" ", text).strip()
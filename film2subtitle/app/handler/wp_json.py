@@ -0,0 +1,85 @@
+import html
+import re
+from typing import Any, Dict, List, Mapping
+
+from film2subtitle.app.handler.parsers import _build_metadata
+
+from film2subtitle.app.handler.types import (  # isort:skip
+    LegacySearchResult,
+    SubtitleArticle,
+    SubtitleMetadata,
+)
+
+__all__ = ["POST_FIELDS", "parse_posts"]
+
+# Only request the fields we map, to keep the responses small.
+POST_FIELDS = "link,title,excerpt,jetpack_featured_media_url"
+
+_TAG_REGEX = re.compile(r"<[^>]+>")
+_HREF_REGEX = re.compile(r"""href=["']([^"']+)["']""")
+_IMDB_REGEX = re.compile("imdb.com")
+# "دانلود زیرنویس فارسی سریال Ozark" -> "Ozark"
+_TITLE_PREFIX_REGEX = re.compile(
+    r"^دانلود\s+زیرنویس\s+فارسی\s+(?:فیلم|سریال|انیمیشن)?\s*"
+)
+_REQUIRED_METADATA = (
+    "name",
+    "duration",
+    "language",
+    "country",
+    "subtitle_file_format",
+    "quality",
+)
+
+
+def _rendered(post: Mapping[str, Any], field: str) -> str:
+    value = post.get(field) or ""
+    return value.get("rendered", "") if isinstance(value, dict) else value
+
+
+def _text_lines(markup: str) -> List[str]:
+    """Return the non-empty lines of text of a rendered HTML fragment."""
+    text = html.unescape(_TAG_REGEX.sub("\n", markup))
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+def _post_metadata(post: Mapping[str, Any], title: str) -> Dict[str, Any]:
+    """Build the metadata of a post from the `key: value` lines of its excerpt."""
+    markup = _rendered(post, "excerpt")
+    imdb_href = next(
+        (href for href in _HREF_REGEX.findall(markup) if _IMDB_REGEX.search(href)),
+        None,
+    )
+    metadata = _build_metadata(
+        (line for line in _text_lines(markup) if ":" in line),
+        imdb_href,
+    )
+    if not metadata.get("name"):
+        metadata["name"] = _TITLE_PREFIX_REGEX.sub("", title)
+    for key in _REQUIRED_METADATA:
+        metadata.setdefault(key, "")
+    return metadata
+
+
+def parse_posts(posts: List[Mapping[str, Any]], total_pages: int) -> LegacySearchResult:
+    """Map the posts of the WordPress REST API to subtitle articles.
+
+    Parameters:
+        posts (`List[dict]`): The posts returned by `/wp-json/wp/v2/posts`.
+        total_pages (`int`): The value of the `X-WP-TotalPages` header.
+
+    Returns:
+        :class:`LegacySearchResult`: The parsed search result object.
+    """
+    results = []
+    for post in posts:
+        title = " ".join(_text_lines(_rendered(post, "title")))
+        results.append(
+            SubtitleArticle(
+                title=title,
+                url=post["link"],
+                thumbnail=post.get("jetpack_featured_media_url") or "",
+                metadata=SubtitleMetadata(**_post_metadata(post, title)),
+            ),
+        )
+    return LegacySearchResult(total_pages=total_pages, results=results)
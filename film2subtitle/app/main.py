@@ -9,8 +9,10 @@ from httpx import RequestError
 from film2subtitle.app.api import router as api_router
 from film2subtitle.app.api.dependency import get_db
 from film2subtitle.app.core.config import settings
+from film2subtitle.app.core.http import CompressionMiddleware
 from film2subtitle.app.db.init_db import init_db
-from film2subtitle.app.handler import api_handler
+from film2subtitle.app.handler import api_handler, parser_executor
+from film2subtitle.app.handler.errors import CircuitOpenError, OverloadedError
 
 openapi_tags = [
     {
@@ -53,6 +55,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# compress the responses with brotli or gzip
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+
 # add the API router
 app.include_router(api_router)
 
@@ -69,7 +80,12 @@ async def http_exception_handler(_, exc: HTTPException) -> JSONResponse:
         405: "METHOD_NOT_ALLOWED",
         406: "NOT_ACCEPTABLE",
         409: "CONFLICT",
+        413: "PAYLOAD_TOO_LARGE",
+        416: "RANGE_NOT_SATISFIABLE",
         500: "INTERNAL_SERVER_ERROR",
+        501: "NOT_IMPLEMENTED",
+        502: "BAD_GATEWAY",
+        503: "SERVICE_UNAVAILABLE",
     }
     content = {
         "error": ecode_mapping.get(exc.status_code, "UNKNOWN_ERROR"),
@@ -97,11 +113,46 @@ async def api_client_error_handler(_, __) -> JSONResponse:
     )
 
 
+@app.exception_handler(OverloadedError)
+async def overloaded_error_handler(_, __) -> JSONResponse:
+    """Upstream limiter queue overflow handler."""
+    return JSONResponse(
+        content={
+            "error": "SERVICE_UNAVAILABLE",
+            "message": (
+                "The server is receiving too many requests at the moment. "
+                "Please try again later."
+            ),
+        },
+        status_code=503,
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.exception_handler(CircuitOpenError)
+async def circuit_open_error_handler(_, exc: CircuitOpenError) -> JSONResponse:
+    """Open circuit breaker handler."""
+    return JSONResponse(
+        content={
+            "error": "SERVICE_UNAVAILABLE",
+            "message": (
+                "The API is temporarily unavailable because Film2Subtitle is not "
+                "responding. Please try again later."
+            ),
+        },
+        status_code=exc.status_code,
+        headers={"Retry-After": str(int(settings.UPSTREAM_BREAKER_RECOVERY))},
+    )
+
+
 @app.on_event("shutdown")
 async def clean_up_on_shutdown() -> None:
     """Clean up the resources before shutdown."""
     # close the api handler session
     await api_handler.close()
+    # stop the workers of the page parsers
+    if parser_executor is not None:
+        parser_executor.shutdown(wait=False, cancel_futures=True)
 
 
 @app.on_event("startup")
@@ -1 +1,3 @@
+from .article import Article  # noqa: F401
+from .crawl_state import CrawlState  # noqa: F401
 from .user import User  # noqa: F401
@@ -0,0 +1,40 @@
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import DDL, JSON, Column, DateTime, Float, Integer, String, Text, event
+
+from film2subtitle.app.db.base_class import Base
+
+
+class Article(Base):
+    """Model representing an indexed subtitle article and its metadata."""
+
+    id_: int = Column(Integer, primary_key=True, index=True)
+    url: str = Column(String, unique=True, index=True, nullable=False)
+    title: str = Column(String, nullable=False)
+    thumbnail: str = Column(String, nullable=False, default="")
+    name: str = Column(String, nullable=False, default="")
+    duration: str = Column(String, nullable=False, default="")
+    language: str = Column(String, nullable=False, default="")
+    country: str = Column(String, nullable=False, default="")
+    subtitle_file_format: str = Column(String, nullable=False, default="")
+    quality: str = Column(String, nullable=False, default="")
+    imdb_id: str = Column(String, index=True, nullable=False, default="")
+    imdb_rating: float = Column(Float, nullable=False, default=0.0)
+    actors: List[str] = Column(JSON, nullable=False, default=list)
+    writers: List[str] = Column(JSON, nullable=False, default=list)
+    # normalized text of the searchable fields (see `normalize_text`)
+    search_text: str = Column(Text, nullable=False, default="")
+    indexed_at: datetime = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+# PostgreSQL full-text index of the searchable text. The `simple` configuration
+# is used since the text is already normalized and PostgreSQL has no Persian one.
+event.listen(
+    Article.__table__,
+    "after_create",
+    DDL(
+        "CREATE INDEX ix_article_search_text_tsv ON %(table)s "
+        "USING gin (to_tsvector('simple', search_text))",
+    ).execute_if(dialect="postgresql"),
+)
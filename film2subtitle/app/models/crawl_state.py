@@ -0,0 +1,28 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Column, DateTime, Integer, String
+
+from film2subtitle.app.db.base_class import Base
+
+
+class CrawlState(Base):
+    """Model representing the crawl state of a download page.
+
+    `source_hash` is the hash of what the listing (sitemap `lastmod` or search
+    article) said about the page when it was last seen, and `content_hash` is
+    the hash of the parsed page when it was last crawled.
+    """
+
+    PENDING = "pending"
+    DONE = "done"
+    FAILED = "failed"
+
+    id_: int = Column(Integer, primary_key=True, index=True)
+    url: str = Column(String, unique=True, index=True, nullable=False)
+    status: str = Column(String, index=True, nullable=False, default=PENDING)
+    source_hash: str = Column(String, nullable=False, default="")
+    content_hash: str = Column(String, nullable=False, default="")
+    failures: int = Column(Integer, nullable=False, default=0)
+    last_seen_at: datetime = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_crawled_at: Optional[datetime] = Column(DateTime, nullable=True)
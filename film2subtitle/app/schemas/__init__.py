@@ -1,11 +1,28 @@
-from .health import HealthCheck  # noqa: F401
+from .health import (  # noqa: F401
+    CacheStats,
+    ConnectionPoolStats,
+    CrawlerStats,
+    FileCacheStats,
+    HealthCheck,
+    LimiterStats,
+    ProxyStats,
+    ResilienceStats,
+)
 from .token import Token, TokenPayload  # noqa: F401
 from .user import User, UserCreate, UserInDB, UserUpdate  # noqa: F401
 
 from .subtitles import (  # isort:skip  # noqa: F401
+    ArchiveEntry,
+    BatchDownloadError,
+    BatchDownloadItem,
+    BatchDownloadRequest,
+    BatchDownloadResult,
     DownloadBox,
     DownloadPage,
+    EpisodeLink,
     LegacySearchResult,
+    SeasonLinks,
     SubtitleArticle,
+    SubtitleFormat,
     SubtitleMetadata,
 )
@@ -1,4 +1,6 @@
+from datetime import datetime
 from enum import Enum
+from typing import Dict, Optional
 
 from pydantic import BaseModel, Field
 
@@ -18,3 +20,139 @@ class HealthCheck(BaseModel):
         title="Health check status",
         description="Shows whether the service is available or not.",
     )
+
+
+class CacheStats(BaseModel):
+    """Response model for the result cache statistics."""
+
+    enabled: bool = Field(..., description="Whether the result cache is enabled.")
+    backend: str = Field("none", description="The name of the cache backend.")
+    hits: int = Field(0, description="Number of lookups answered from the cache.")
+    stale_hits: int = Field(
+        0,
+        description="Number of lookups answered with an expired entry (refreshed "
+        "in the background).",
+    )
+    misses: int = Field(0, description="Number of lookups not found in the cache.")
+    evictions: int = Field(0, description="Number of entries evicted by the LRU.")
+    size: int = Field(0, description="Number of entries currently in the cache.")
+    max_entries: int = Field(0, description="Maximum number of entries to keep.")
+    hit_ratio: float = Field(0.0, description="Ratio of hits to total lookups.")
+
+
+class FileCacheStats(BaseModel):
+    """Response model for the subtitle file cache statistics."""
+
+    enabled: bool = Field(..., description="Whether the file cache is enabled.")
+    files: int = Field(0, description="Number of files stored on disk.")
+    size: int = Field(0, description="Total size of the stored files in bytes.")
+    max_size: int = Field(0, description="Maximum total size of the files in bytes.")
+    hits: int = Field(0, description="Number of downloads served from the disk.")
+    misses: int = Field(0, description="Number of files not found on the disk.")
+    evictions: int = Field(0, description="Number of files evicted by the LRU.")
+    hit_ratio: float = Field(0.0, description="Ratio of hits to total lookups.")
+
+
+class ConnectionPoolStats(BaseModel):
+    """Response model for the upstream connection pool statistics."""
+
+    http2: bool = Field(..., description="Whether HTTP/2 multiplexing is enabled.")
+    max_connections: int = Field(..., description="Maximum number of connections.")
+    max_keepalive_connections: int = Field(
+        ...,
+        description="Maximum number of idle keep-alive connections.",
+    )
+    keepalive_expiry: float = Field(
+        ...,
+        description="Seconds an idle keep-alive connection is kept open.",
+    )
+    max_connections_per_host: int = Field(
+        ...,
+        description="Maximum number of concurrent requests per host.",
+    )
+    in_use: int = Field(..., description="Number of requests currently in flight.")
+    waiting: int = Field(..., description="Number of requests waiting for a slot.")
+    requests: int = Field(..., description="Total number of requests sent.")
+    avg_wait: float = Field(..., description="Average wait time in seconds.")
+    max_wait: float = Field(..., description="Maximum wait time in seconds.")
+    per_host: Dict[str, int] = Field(
+        ...,
+        description="Number of requests currently in flight per host.",
+    )
+
+
+class LimiterStats(BaseModel):
+    """Response model for the upstream limiter statistics."""
+
+    enabled: bool = Field(..., description="Whether the upstream limiter is enabled.")
+    limit: int = Field(0, description="Current size of the concurrency window.")
+    min_limit: int = Field(0, description="Minimum size of the concurrency window.")
+    max_limit: int = Field(0, description="Maximum size of the concurrency window.")
+    rate: float = Field(0.0, description="Maximum number of requests per second.")
+    in_flight: int = Field(0, description="Number of requests currently in flight.")
+    waiting: int = Field(0, description="Number of requests waiting in the queue.")
+    max_queue: int = Field(0, description="Maximum number of waiting requests.")
+    requests: int = Field(0, description="Total number of admitted requests.")
+    rejected: int = Field(0, description="Number of requests shed with a 503.")
+    increases: int = Field(0, description="Number of times the window has grown.")
+    decreases: int = Field(0, description="Number of times the window has shrunk.")
+    avg_wait: float = Field(0.0, description="Average queue wait time in seconds.")
+    max_wait: float = Field(0.0, description="Maximum queue wait time in seconds.")
+
+
+class ProxyStats(BaseModel):
+    """Response model for the health and latency statistics of a proxy."""
+
+    url: str = Field(..., description="URL of the proxy (without credentials).")
+    healthy: bool = Field(..., description="Whether the proxy is in the pool.")
+    in_flight: int = Field(..., description="Number of requests currently in flight.")
+    requests: int = Field(..., description="Total number of requests sent.")
+    failures: int = Field(..., description="Number of failed requests.")
+    ejections: int = Field(..., description="Number of times the proxy was ejected.")
+    success_rate: float = Field(
+        ...,
+        description="Moving average of the success rate of the requests.",
+    )
+    latency: float = Field(
+        ...,
+        description="Moving average of the latency in seconds.",
+    )
+
+
+class ResilienceStats(BaseModel):
+    """Response model for the upstream retry, circuit breaker and hedging
+    statistics.
+    """
+
+    retries: int = Field(..., description="Number of retried requests.")
+    breaker_state: str = Field(
+        ...,
+        description="State of the circuit breaker (closed, open, half-open or "
+        "disabled).",
+    )
+    breaker_opened: int = Field(..., description="Number of times the breaker opened.")
+    breaker_rejected: int = Field(
+        ...,
+        description="Number of requests rejected by the open breaker.",
+    )
+    hedges: int = Field(..., description="Number of hedged requests.")
+    hedge_wins: int = Field(
+        ...,
+        description="Number of hedged requests that answered first.",
+    )
+    hedge_delay: Optional[float] = Field(
+        None,
+        description="Current delay (in seconds) before hedging a request.",
+    )
+
+
+class CrawlerStats(BaseModel):
+    """Response model for the crawl state of the download pages."""
+
+    pending: int = Field(0, description="Number of pages waiting to be crawled.")
+    done: int = Field(0, description="Number of crawled pages.")
+    failed: int = Field(0, description="Number of pages that failed to be crawled.")
+    last_crawled_at: Optional[datetime] = Field(
+        None,
+        description="When a page was last crawled (UTC).",
+    )
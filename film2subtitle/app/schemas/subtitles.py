@@ -1,8 +1,10 @@
 from enum import Enum
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel, Field, HttpUrl
 
+from film2subtitle.app.core.config import settings
+
 
 class MediaType(str, Enum):
     """The type of media that the subtitle is for. (e.g. `movie` or `series`)"""
@@ -123,3 +125,113 @@ class DownloadPage(BaseModel):
             "containing the subtitle download links."
         ),
     )
+
+
+class EpisodeLink(BaseModel):
+    """Represents the download link of an episode of a series."""
+
+    season: int = Field(..., title="Season number", example=1)
+    episode: int = Field(..., title="Episode number", example=1)
+    url: str = Field(
+        ...,
+        title="Download link",
+        description="The link of the subtitle file of the episode.",
+    )
+
+
+class SeasonLinks(BaseModel):
+    """Represents the download links of a season of a series."""
+
+    season: int = Field(..., title="Season number", example=1)
+    pack: Optional[str] = Field(
+        None,
+        title="Season pack link",
+        description="The link of the subtitle file of the whole season, if any.",
+    )
+    episodes: List[EpisodeLink] = Field(
+        ...,
+        title="Episode links",
+        description="The links of the episodes, sorted by episode number.",
+    )
+
+
+class BatchDownloadRequest(BaseModel):
+    """Represents a request for multiple download pages."""
+
+    urls: List[str] = Field(
+        ...,
+        title="Subtitle URLs",
+        description="The URLs of the subtitles to download.",
+        min_items=1,
+        max_items=settings.BATCH_DOWNLOAD_MAX_URLS,
+        example=[
+            "https://film2subtitle.com/ozark/",
+            "https://film2subtitle.com/dune/",
+        ],
+    )
+
+
+class BatchDownloadError(BaseModel):
+    """Represents the error of a download page in a batch."""
+
+    error: str = Field(
+        ...,
+        title="Error code",
+        description="The error code (e.g. `NOT_FOUND` or `GATEWAY_TIMEOUT`).",
+    )
+    message: str = Field(..., title="Error message")
+
+
+class BatchDownloadItem(BaseModel):
+    """Represents the result of a download page in a batch."""
+
+    url: str = Field(..., title="Subtitle URL")
+    result: Optional[DownloadPage] = Field(
+        None,
+        title="Download page",
+        description="The download page if it was downloaded successfully.",
+    )
+    error: Optional[BatchDownloadError] = Field(
+        None,
+        title="Error",
+        description="The error if the download page could not be downloaded.",
+    )
+
+
+class BatchDownloadResult(BaseModel):
+    """Represents the results of a batch of download pages."""
+
+    results: List[BatchDownloadItem] = Field(
+        ...,
+        title="Results",
+        description="The result or error of every requested URL (in the same order).",
+    )
+
+
+class SubtitleFormat(str, Enum):
+    """The format to convert a subtitle file to."""
+
+    VTT = "vtt"
+    SRT = "srt"
+
+
+class ArchiveEntry(BaseModel):
+    """Represents a file in a subtitle archive."""
+
+    name: str = Field(
+        ...,
+        title="Entry name",
+        description="The name (path) of the file in the archive.",
+        example="Ozark.S01E01.WEB-DL.srt",
+    )
+    size: int = Field(..., title="Size", description="The size of the file in bytes.")
+    compressed_size: int = Field(
+        ...,
+        title="Compressed size",
+        description="The compressed size of the file in bytes.",
+    )
+    subtitle: bool = Field(
+        ...,
+        title="Subtitle file",
+        description="Whether the file is a subtitle file (`srt` or `vtt`).",
+    )
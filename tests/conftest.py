@@ -0,0 +1,25 @@
+import os
+
+# Importing the application loads its settings, provide dummy values for the
+# required ones so the tests run without a `.env` file.
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("FIRST_SUPERUSER", "test")
+os.environ.setdefault("FIRST_SUPERUSER_EMAIL", "test@example.com")
+os.environ.setdefault("FIRST_SUPERUSER_PASSWORD", "test")
+
+
+def make_api(config=None, **kwargs):
+    """Return a :class:`Film2Subtitle` handler that sends its requests to the
+    stand-in upstream of the benchmarks (`benchmarks.upstream`), configured
+    with an optional `UpstreamConfig`.
+    """
+    import httpx
+
+    from benchmarks.upstream import UpstreamConfig, create_app
+    from film2subtitle.app.handler import Film2Subtitle
+
+    api = Film2Subtitle(base_url="http://upstream/", **kwargs)
+    api._client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(create_app(config or UpstreamConfig())),
+    )
+    return api
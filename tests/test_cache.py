@@ -0,0 +1,49 @@
+import asyncio
+import threading
+
+from film2subtitle.app.handler.cache import MemoryCache, SQLiteCache
+
+
+def test_sqlite_cache_runs_the_queries_in_a_thread(tmp_path, monkeypatch) -> None:
+    cache = SQLiteCache(str(tmp_path / "cache.db"), ttl=60, max_entries=2)
+    threads = set()
+    get, set_ = cache._get, cache._set
+
+    def _get(key):
+        threads.add(threading.get_ident())
+        return get(key)
+
+    def _set(key, entry):
+        threads.add(threading.get_ident())
+        return set_(key, entry)
+
+    monkeypatch.setattr(cache, "_get", _get)
+    monkeypatch.setattr(cache, "_set", _set)
+
+    async def main() -> None:
+        assert await cache.aget_entry("a") is None
+        for key in "abc":
+            await cache.aset(key, key.upper())
+        entry = await cache.aget_entry("c")
+        assert entry is not None and entry.value == "C"
+
+    try:
+        asyncio.run(main())
+        assert threading.get_ident() not in threads
+        stats = cache.stats
+        assert (stats.hits, stats.misses, stats.evictions) == (1, 1, 1)
+        assert stats.size == len(cache) == 2
+    finally:
+        cache.close()
+
+
+def test_memory_cache_async_methods() -> None:
+    cache = MemoryCache(ttl=60, max_entries=10)
+
+    async def main() -> None:
+        await cache.aset("a", 1)
+        entry = await cache.aget_entry("a")
+        assert entry is not None and entry.value == 1
+
+    asyncio.run(main())
+    assert cache.stats.hits == 1
@@ -0,0 +1,103 @@
+import asyncio
+import subprocess
+import sys
+from types import SimpleNamespace
+from typing import Dict, Iterator
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from film2subtitle.app import crawler as crawler_module
+from film2subtitle.app import crud
+from film2subtitle.app.crawler import Crawler
+from film2subtitle.app.db.base import Base
+from film2subtitle.app.models import Article, CrawlState
+from tests.conftest import make_api
+
+
+@pytest.fixture()
+def session_factory(tmp_path, monkeypatch) -> Iterator[sessionmaker]:
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(crawler_module, "SessionLocal", factory)
+    yield factory
+    engine.dispose()
+
+
+def test_crawl_once_indexes_the_sitemap_pages(session_factory: sessionmaker) -> None:
+    crawler = Crawler(make_api(), concurrency=4, rate_limit=1000)
+
+    async def main() -> None:
+        try:
+            await crawler.crawl_once()
+        finally:
+            await crawler.api.close()
+
+    asyncio.run(main())
+    with session_factory() as db:
+        counts = crud.crawl_state.count_by_status(db)
+        assert counts.get(CrawlState.DONE, 0) > 0
+        assert CrawlState.PENDING not in counts
+        assert db.query(Article).count() > 0
+    assert crawler.stats.crawled == counts[CrawlState.DONE]
+
+
+def test_sitemap_entities_are_not_resolved(tmp_path) -> None:
+    secret = tmp_path / "secret"
+    secret.write_text("secret")
+    sitemap = (
+        f'<!DOCTYPE u [<!ENTITY e SYSTEM "{secret.as_uri()}">]>'
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        "<url><loc>https://film2subtitle.com/&e;</loc></url></urlset>"
+    )
+    index = (
+        '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        "<sitemap><loc>https://film2subtitle.com/wp-sitemap-posts-post-1.xml</loc>"
+        "</sitemap></sitemapindex>"
+    )
+    crawler = Crawler(make_api(), rate_limit=1000)
+
+    async def get(url: str) -> SimpleNamespace:
+        body = index if url == "/wp-sitemap.xml" else sitemap
+        return SimpleNamespace(content=body.encode())
+
+    crawler._get = get
+    sources = asyncio.run(crawler._discover_sitemap())
+    assert list(sources) == ["https://film2subtitle.com/"]
+
+
+def test_importing_crawler_does_not_build_api_handler() -> None:
+    code = (
+        "import sys, film2subtitle.app.crawler, film2subtitle.app.handler as h;"
+        "sys.exit(bool(h._shared))"
+    )
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
+
+
+def test_seed_queries_are_encoded(session_factory: sessionmaker) -> None:
+    crawler = Crawler(
+        make_api(),
+        sources=["search"],
+        seed_queries=["a&b c"],
+        listing_pages=1,
+        rate_limit=1000,
+    )
+    paths = []
+
+    async def discover_listing(path: str) -> Dict[str, str]:
+        paths.append(path)
+        return {}
+
+    crawler._discover_listing = discover_listing
+
+    async def main() -> None:
+        try:
+            with session_factory() as db:
+                await crawler.discover(db)
+        finally:
+            await crawler.api.close()
+
+    asyncio.run(main())
+    assert paths == ["?s=a%26b+c"]
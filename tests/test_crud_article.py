@@ -0,0 +1,70 @@
+from typing import Iterator
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from film2subtitle.app import crud
+from film2subtitle.app.db.base import Base
+from film2subtitle.app.handler.types import SubtitleArticle, SubtitleMetadata
+from film2subtitle.app.models import Article
+
+
+def _article(url: str, title: str) -> SubtitleArticle:
+    return SubtitleArticle(
+        title=title,
+        url=url,
+        thumbnail="",
+        metadata=SubtitleMetadata(
+            name=title,
+            duration="120",
+            language="فارسی",
+            country="USA",
+            subtitle_file_format="SRT",
+            quality="WEB-DL",
+        ),
+    )
+
+
+@pytest.fixture()
+def session_factory(tmp_path) -> Iterator[sessionmaker]:
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+def test_upsert_inserts_and_updates(session_factory: sessionmaker) -> None:
+    with session_factory() as db:
+        articles = [_article("https://a", "Ozark"), _article("https://b", "Dark")]
+        assert crud.article.upsert_many(db, articles=articles) == 2
+        crud.article.upsert_many(db, articles=[_article("https://a", "Ozark S02")])
+        assert db.query(Article).count() == 2
+        assert crud.article.get_by_url(db, url="https://a").title == "Ozark S02"
+        results, total = crud.article.search(db, query="ozark")
+        assert total == 1 and results[0].url == "https://a"
+
+
+def test_upsert_retries_concurrent_insert(
+    session_factory: sessionmaker,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    merge_rows = crud.article._merge_rows
+    calls = 0
+
+    def racing_merge_rows(db: Session, rows: dict) -> None:
+        nonlocal calls
+        calls += 1
+        merge_rows(db, rows)
+        if calls == 1:
+            # another worker inserts the same URL before this one commits
+            with session_factory() as other:
+                other.add(Article(url="https://a", title="A"))
+                other.commit()
+
+    monkeypatch.setattr(crud.article, "_merge_rows", racing_merge_rows)
+    with session_factory() as db:
+        crud.article.upsert_many(db, articles=[_article("https://a", "Ozark")])
+        assert calls == 2
+        assert db.query(Article).count() == 1
+        assert crud.article.get_by_url(db, url="https://a").title == "Ozark"
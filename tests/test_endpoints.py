@@ -0,0 +1,43 @@
+import asyncio
+from types import SimpleNamespace
+
+import orjson
+
+from film2subtitle.app.api.v1.endpoints import subtitles
+from film2subtitle.app.handler.errors import Film2SubtitleAPIError
+from film2subtitle.app.handler.types import SubtitleArticle, SubtitleMetadata
+
+
+def test_search_stream_ends_with_the_error(monkeypatch) -> None:
+    article = SubtitleArticle(
+        title="Ozark",
+        url="https://film2subtitle.com/ozark/",
+        thumbnail="",
+        metadata=SubtitleMetadata(
+            name="Ozark",
+            duration="60",
+            language="English",
+            country="USA",
+            subtitle_file_format="SRT",
+            quality="WEB-DL",
+        ),
+    )
+
+    async def iter_legacy_search(query, **kwargs):
+        yield article
+        raise Film2SubtitleAPIError("The upstream is down")
+
+    monkeypatch.setattr(
+        subtitles,
+        "api_handler",
+        SimpleNamespace(iter_legacy_search=iter_legacy_search),
+    )
+
+    async def main() -> list:
+        response = await subtitles.legacy_search_stream("ozark", None, True)
+        return [orjson.loads(line) async for line in response.body_iterator]
+
+    records = asyncio.run(main())
+    assert records[0]["url"] == article.url
+    assert records[1]["error"] == "BAD_GATEWAY"
+    assert len(records) == 2
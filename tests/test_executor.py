@@ -0,0 +1,27 @@
+import subprocess
+import sys
+
+from benchmarks import load_fixture
+from film2subtitle.app.handler import Film2Subtitle
+from film2subtitle.app.handler.executor import create_executor, parse_markup
+
+
+def _handler_built() -> bool:
+    return bool(sys.modules["film2subtitle.app.handler"]._shared)
+
+
+def test_importing_handler_does_not_build_api_handler() -> None:
+    code = "import sys, film2subtitle.app.handler as h; sys.exit(bool(h._shared))"
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
+
+
+def test_process_executor_parses_without_building_api_handler() -> None:
+    parser = Film2Subtitle.DOWNLOAD_PAGE_PARSERS["lxml"]
+    markup = load_fixture("synthetic_movie_download_page.html")
+    executor = create_executor("process", max_workers=1)
+    try:
+        result = executor.submit(parse_markup, parser, markup, "lxml").result()
+        assert result == parser.from_markup(markup).parse()
+        assert executor.submit(_handler_built).result() is False
+    finally:
+        executor.shutdown()
@@ -0,0 +1,173 @@
+import asyncio
+import os
+
+import pytest
+
+from film2subtitle.app.handler import handler as handler_module
+from film2subtitle.app.handler.errors import FileTooLargeError, InvalidUrlError
+from film2subtitle.app.handler.files import FileCache
+from film2subtitle.app.handler.limiter import AdaptiveLimiter
+from tests.conftest import make_api
+
+ARCHIVE_URL = "https://www.film2subtitle.com/2022/Ozark.S01E01.zip"
+
+
+def _store(cache: FileCache, key: str, content: bytes):
+    writer = cache.writer(key, "application/zip", "file.zip")
+    writer.write(content)
+    return writer.commit()
+
+
+def test_store_and_get(tmp_path) -> None:
+    cache = FileCache(str(tmp_path), max_size=1024)
+    stored = _store(cache, "a", b"content")
+    assert cache.get("a") == stored
+    with open(stored.path, "rb") as file:
+        assert file.read() == b"content"
+    assert cache.get("missing") is None
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_same_content_is_stored_once(tmp_path) -> None:
+    cache = FileCache(str(tmp_path), max_size=1024)
+    first = _store(cache, "a", b"content")
+    second = _store(cache, "b", b"content")
+    assert first.path == second.path
+    assert cache.stats.files == 1
+    assert cache.stats.size == len(b"content")
+
+
+def test_least_recently_used_files_are_evicted(tmp_path) -> None:
+    cache = FileCache(str(tmp_path), max_size=20)
+    old = _store(cache, "old", b"o" * 10)
+    _store(cache, "recent", b"r" * 10)
+    os.utime(old.path, (0, 0))
+    _store(cache, "new", b"n" * 10)
+    assert cache.get("old") is None
+    assert cache.get("recent") is not None
+    assert cache.get("new") is not None
+    assert cache.stats.evictions == 1
+
+
+def test_aborted_writer_leaves_nothing(tmp_path) -> None:
+    cache = FileCache(str(tmp_path), max_size=1024)
+    writer = cache.writer("a", "application/zip", "file.zip")
+    writer.write(b"partial")
+    writer.abort()
+    assert cache.get("a") is None
+    assert os.listdir(cache.tmp_path) == []
+
+
+def test_writer_rejects_files_larger_than_max_file_size(tmp_path) -> None:
+    cache = FileCache(str(tmp_path), max_size=1024, max_file_size=10)
+    writer = cache.writer("a", "application/zip", "file.zip")
+    writer.write(b"x" * 10)
+    with pytest.raises(FileTooLargeError):
+        writer.write(b"x")
+    assert cache.get("a") is None
+    assert os.listdir(cache.tmp_path) == []
+
+
+def test_open_file_releases_limiter_before_body(tmp_path) -> None:
+    async def main() -> None:
+        limiter = AdaptiveLimiter(initial_limit=1)
+        api = make_api(
+            files=FileCache(str(tmp_path), max_size=1 << 20), limiter=limiter
+        )
+        try:
+            download = await api.open_file(ARCHIVE_URL)
+            # the body is not read yet, but other requests can be sent
+            assert limiter.stats.in_flight == 0
+            body = b"".join([chunk async for chunk in download.body])
+            stored = api.cached_file(ARCHIVE_URL)
+            assert stored is not None and stored.size == len(body)
+        finally:
+            await api.close()
+
+    asyncio.run(main())
+
+
+def test_store_file_single_download(tmp_path) -> None:
+    async def main() -> None:
+        api = make_api(files=FileCache(str(tmp_path), max_size=1 << 20))
+        try:
+            first, second = await asyncio.gather(
+                api.store_file(ARCHIVE_URL),
+                api.store_file(ARCHIVE_URL),
+            )
+            assert first == second
+            assert api.files.stats.files == 1
+        finally:
+            await api.close()
+
+    asyncio.run(main())
+
+
+def test_files_larger_than_max_file_size_are_rejected(tmp_path) -> None:
+    async def main() -> None:
+        api = make_api(
+            files=FileCache(str(tmp_path), max_size=1 << 20), max_file_size=10
+        )
+        try:
+            with pytest.raises(FileTooLargeError):
+                await api.store_file(ARCHIVE_URL)
+            with pytest.raises(FileTooLargeError):
+                await api.open_file(ARCHIVE_URL)
+            assert api.cached_file(ARCHIVE_URL) is None
+            assert api.files.stats.files == 0
+        finally:
+            await api.close()
+
+    asyncio.run(main())
+
+
+def test_files_of_other_hosts_are_not_downloaded(tmp_path) -> None:
+    async def main() -> None:
+        api = make_api(files=FileCache(str(tmp_path), max_size=1 << 20))
+        try:
+            with pytest.raises(InvalidUrlError):
+                await api.open_file("http://169.254.169.254/x.zip#film2subtitle.com")
+            with pytest.raises(InvalidUrlError):
+                await api.store_file("https://evil.com/x.zip?film2subtitle.com")
+        finally:
+            await api.close()
+
+    asyncio.run(main())
+
+
+def test_body_larger_than_max_file_size_is_cut_off(tmp_path, monkeypatch) -> None:
+    # a body without (or with a wrong) Content-Length is counted as it arrives
+    monkeypatch.setattr(handler_module, "_content_length", lambda response: 0)
+
+    async def main() -> None:
+        api = make_api(
+            files=FileCache(str(tmp_path), max_size=1 << 20), max_file_size=10
+        )
+        try:
+            download = await api.open_file(ARCHIVE_URL)
+            with pytest.raises(FileTooLargeError):
+                async for _ in download.body:
+                    pass
+            assert api.cached_file(ARCHIVE_URL) is None
+        finally:
+            await api.close()
+
+    asyncio.run(main())
+
+
+def test_convert_subtitle_into_another_file_cache(tmp_path) -> None:
+    async def main() -> None:
+        # the file cache of the handler is disabled
+        api = make_api()
+        files = FileCache(str(tmp_path), max_size=1 << 20)
+        try:
+            entries = await api.archive_entries(ARCHIVE_URL, files)
+            assert [entry.name for entry in entries] == ["Ozark.S01E01.srt"]
+            stored = await api.convert_subtitle(ARCHIVE_URL, files=files)
+            with open(stored.path, "rb") as file:
+                assert file.read().startswith(b"WEBVTT")
+            assert files.stats.files == 2  # the archive and the converted file
+        finally:
+            await api.close()
+
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from film2subtitle.app.handler.flight import SingleFlight
+
+
+def test_concurrent_calls_are_shared() -> None:
+    async def main() -> None:
+        flight = SingleFlight()
+        started = 0
+
+        async def fetch() -> str:
+            nonlocal started
+            started += 1
+            await asyncio.sleep(0.01)
+            return "page"
+
+        results = await asyncio.gather(*(flight.do("key", fetch) for _ in range(5)))
+        assert results == ["page"] * 5
+        assert (started, flight.calls, flight.shared) == (1, 1, 4)
+        assert len(flight) == 0
+        # the key is forgotten once the call is done, the next call is new
+        assert await flight.do("key", fetch) == "page"
+        assert started == 2
+
+    asyncio.run(main())
+
+
+def test_exception_is_shared() -> None:
+    async def main() -> None:
+        flight = SingleFlight()
+
+        async def fail() -> None:
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream")
+
+        results = await asyncio.gather(
+            *(flight.do("key", fail) for _ in range(3)),
+            return_exceptions=True,
+        )
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flight.calls == 1
+
+    asyncio.run(main())
+
+
+def test_cancelled_caller_does_not_cancel_the_others() -> None:
+    async def main() -> None:
+        flight = SingleFlight()
+        done = asyncio.Event()
+
+        async def fetch() -> str:
+            await done.wait()
+            return "page"
+
+        first = asyncio.ensure_future(flight.do("key", fetch))
+        second = asyncio.ensure_future(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        done.set()
+        assert await second == "page"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+    asyncio.run(main())
+
+
+def test_call_is_cancelled_when_every_caller_is_gone() -> None:
+    async def main() -> None:
+        flight = SingleFlight()
+        cancelled = asyncio.Event()
+
+        async def fetch() -> None:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        callers = [asyncio.ensure_future(flight.do("key", fetch)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.wait_for(cancelled.wait(), 1)
+        assert len(flight) == 0
+
+    asyncio.run(main())
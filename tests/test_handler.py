@@ -0,0 +1,153 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from benchmarks.upstream import UpstreamConfig
+from film2subtitle.app.handler.cache import MemoryCache, search_key
+from film2subtitle.app.handler.types import LegacySearchResult
+from tests.conftest import make_api
+
+
+def _count_requests(api) -> List[str]:
+    """Record the URLs of the upstream requests of a handler."""
+    urls = []
+
+    async def record(request) -> None:
+        urls.append(str(request.url))
+
+    api.client.event_hooks["request"].append(record)
+    return urls
+
+
+@pytest.mark.parametrize("parser_backend", ["bs4", "lxml"])
+def test_iter_search_articles_matches_legacy_search(parser_backend: str) -> None:
+    async def main() -> None:
+        streaming = make_api(
+            cache=MemoryCache(ttl=60, max_entries=10),
+            parser_backend=parser_backend,
+        )
+        regular = make_api(parser_backend=parser_backend)
+        try:
+            result = LegacySearchResult(total_pages=1, results=[])
+            articles = [
+                article
+                async for article in streaming.iter_search_articles("ozark", 1, result)
+            ]
+            expected = await regular.legacy_search("ozark", 1)
+            assert articles == expected.results
+            assert result == expected
+            # the streamed page is cached like a regular search
+            assert streaming.cache.get(search_key("ozark", 1)) == expected
+            cached = [
+                article async for article in streaming.iter_search_articles("ozark")
+            ]
+            assert cached == expected.results
+        finally:
+            await streaming.close()
+            await regular.close()
+
+    asyncio.run(main())
+
+
+def test_iter_legacy_search_fetches_all_pages() -> None:
+    async def main() -> None:
+        api = make_api(UpstreamConfig(pages=3))
+        try:
+            articles = [
+                article
+                async for article in api.iter_legacy_search("ozark", unique=False)
+            ]
+            first = await api.legacy_search("ozark", 1)
+            # the pages after the third one are not found
+            assert first.total_pages > 3
+            assert len(articles) == 3 * len(first.results)
+        finally:
+            await api.close()
+
+    asyncio.run(main())
+
+
+def test_iter_search_articles_shares_the_scrape_of_the_page() -> None:
+    async def main() -> None:
+        api = make_api(UpstreamConfig(latency=0.05), parser_backend="lxml")
+        requests = _count_requests(api)
+
+        async def stream() -> list:
+            return [article async for article in api.iter_search_articles("ozark")]
+
+        try:
+            streamed, searched = await asyncio.gather(
+                stream(),
+                api.legacy_search("ozark", 1),
+            )
+            assert streamed == searched.results
+            assert len(requests) == 1
+        finally:
+            await api.close()
+
+    asyncio.run(main())
+
+
+def test_iter_search_articles_revalidates_the_page() -> None:
+    async def main() -> None:
+        api = make_api(UpstreamConfig(etag=True), parser_backend="lxml")
+        try:
+            first = [article async for article in api.iter_search_articles("ozark")]
+            result = LegacySearchResult(total_pages=1, results=[])
+            # answered with `304 Not Modified` and the stored result
+            second = [
+                article
+                async for article in api.iter_search_articles("ozark", 1, result)
+            ]
+            assert second == first
+            assert result.total_pages > 1
+        finally:
+            await api.close()
+
+    asyncio.run(main())
+
+
+def test_iter_search_articles_rejects_invalid_pages() -> None:
+    async def main() -> None:
+        api = make_api()
+        try:
+            with pytest.raises(ValueError):
+                async for _ in api.iter_search_articles("ozark", 0):
+                    pass
+        finally:
+            await api.close()
+
+    asyncio.run(main())
+
+
+def test_legacy_search_rejects_invalid_pages() -> None:
+    async def main() -> None:
+        api = make_api()
+        try:
+            for page in (0, -1, "1"):
+                with pytest.raises(ValueError):
+                    await api.legacy_search("ozark", page)
+        finally:
+            await api.close()
+
+    asyncio.run(main())
+
+
+def test_refresh_cancelled_before_it_starts_is_forgotten() -> None:
+    async def main() -> None:
+        api = make_api(cache=MemoryCache(ttl=60, max_entries=10, grace=60))
+        try:
+
+            async def fetch() -> None:
+                raise AssertionError("the refresh should not run")
+
+            api._revalidate("key", fetch)
+            task = api._refreshes["key"]
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            assert "key" not in api._refreshes
+        finally:
+            await api.close()
+
+    asyncio.run(main())
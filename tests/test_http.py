@@ -0,0 +1,77 @@
+import asyncio
+import gzip
+from typing import Dict, List, Tuple
+
+import brotli
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.types import ASGIApp, Message
+
+from film2subtitle.app.core.http import CompressionMiddleware
+
+BODY = b"subtitle " * 500
+
+
+def _request(app: ASGIApp, **headers: str) -> Tuple[Dict[str, str], bytes]:
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "query_string": b"",
+        "headers": [
+            (k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()
+        ],
+    }
+    messages: List[Message] = []
+
+    async def receive() -> Message:
+        # the client stays connected
+        await asyncio.Event().wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+
+    asyncio.run(CompressionMiddleware(app, minimum_size=100)(scope, receive, send))
+    response_headers = {k.decode(): v.decode() for k, v in messages[0]["headers"]}
+    return response_headers, b"".join(m.get("body", b"") for m in messages[1:])
+
+
+def _streaming_app() -> ASGIApp:
+    async def chunks():
+        for _ in range(3):
+            yield BODY
+
+    return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+
+def test_brotli_is_used_when_accepted() -> None:
+    app = PlainTextResponse(BODY)
+    headers, body = _request(app, accept_encoding="gzip, br")
+    assert headers["content-encoding"] == "br"
+    assert headers["content-length"] == str(len(body))
+    assert "Accept-Encoding" in headers["vary"]
+    assert brotli.decompress(body) == BODY
+
+
+def test_gzip_is_used_otherwise() -> None:
+    headers, body = _request(PlainTextResponse(BODY), accept_encoding="gzip")
+    assert headers["content-encoding"] == "gzip"
+    assert gzip.decompress(body) == BODY
+
+
+def test_streaming_responses_are_compressed() -> None:
+    for encoding, decompress in (("br", brotli.decompress), ("gzip", gzip.decompress)):
+        headers, body = _request(_streaming_app(), accept_encoding=encoding)
+        assert headers["content-encoding"] == encoding
+        assert decompress(body) == BODY * 3
+
+
+def test_small_and_range_responses_are_not_compressed() -> None:
+    headers, body = _request(PlainTextResponse(b"small"), accept_encoding="br")
+    assert "content-encoding" not in headers and body == b"small"
+    headers, body = _request(
+        PlainTextResponse(BODY),
+        accept_encoding="br",
+        range="bytes=0-9",
+    )
+    assert "content-encoding" not in headers and body == BODY
@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+from film2subtitle.app.handler.errors import OverloadedError
+from film2subtitle.app.handler.limiter import AdaptiveLimiter
+
+
+def test_window_limits_concurrency() -> None:
+    async def main() -> int:
+        limiter = AdaptiveLimiter(initial_limit=2, max_limit=2)
+        running = peak = 0
+
+        async def request() -> None:
+            nonlocal running, peak
+            async with limiter.acquire():
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*(request() for _ in range(6)))
+        assert limiter.stats.in_flight == 0
+        return peak
+
+    assert asyncio.run(main()) == 2
+
+
+def test_cancelled_waiter_then_release() -> None:
+    async def main() -> None:
+        limiter = AdaptiveLimiter(initial_limit=1)
+        holder = limiter.acquire()
+        await holder.__aenter__()
+        waiting = asyncio.ensure_future(limiter.acquire().__aenter__())
+        await asyncio.sleep(0)
+        waiting.cancel()
+        # the slot is released before the cancelled task resumes
+        await holder.__aexit__(None, None, None)
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        assert limiter.stats.in_flight == 0
+        async with limiter.acquire():
+            assert limiter.stats.in_flight == 1
+
+    asyncio.run(main())
+
+
+def test_cancelled_waiter_is_removed_from_queue() -> None:
+    async def main() -> None:
+        limiter = AdaptiveLimiter(initial_limit=1)
+        async with limiter.acquire():
+            waiting = asyncio.ensure_future(limiter.acquire().__aenter__())
+            await asyncio.sleep(0)
+            waiting.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiting
+            assert limiter.stats.waiting == 0
+        assert limiter.stats.in_flight == 0
+
+    asyncio.run(main())
+
+
+def test_rejects_when_queue_is_full() -> None:
+    async def main() -> None:
+        limiter = AdaptiveLimiter(initial_limit=1, max_queue=1)
+        async with limiter.acquire():
+            waiting = asyncio.ensure_future(limiter.acquire().__aenter__())
+            await asyncio.sleep(0)
+            with pytest.raises(OverloadedError):
+                async with limiter.acquire():
+                    pass
+            waiting.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiting
+        assert limiter.stats.rejected == 1
+
+    asyncio.run(main())
+
+
+def test_window_shrinks_on_overload() -> None:
+    async def main() -> None:
+        limiter = AdaptiveLimiter(initial_limit=8, latency_target=0.0)
+        async with limiter.acquire() as permit:
+            permit.status_code = 503
+        assert limiter.limit == 4
+
+    asyncio.run(main())
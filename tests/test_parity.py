@@ -0,0 +1,62 @@
+"""The `bs4` and `lxml` parser backends must return the same results."""
+
+import pytest
+from bs4 import BeautifulSoup
+
+from benchmarks import FIXTURES, load_fixture
+from film2subtitle.app.handler import Film2Subtitle
+from film2subtitle.app.handler.parsers import _build_download_box
+
+
+def _parsers(kind: str) -> dict:
+    return (
+        Film2Subtitle.LEGACY_SEARCH_PARSERS
+        if kind == "search"
+        else Film2Subtitle.DOWNLOAD_PAGE_PARSERS
+    )
+
+
+@pytest.mark.parametrize("html_parser", sorted(Film2Subtitle.VALID_HTML_PARSERS))
+@pytest.mark.parametrize("fixture", sorted(FIXTURES))
+def test_parse_only_matches_whole_soup(fixture: str, html_parser: str) -> None:
+    parsers = _parsers(FIXTURES[fixture])
+    markup = load_fixture(fixture)
+    expected = parsers["bs4"](BeautifulSoup(markup, html_parser)).parse()
+    assert parsers["bs4"].from_markup(markup, html_parser).parse() == expected
+
+
+@pytest.mark.parametrize("html_parser", sorted(Film2Subtitle.VALID_HTML_PARSERS))
+@pytest.mark.parametrize("fixture", sorted(FIXTURES))
+def test_lxml_matches_bs4(fixture: str, html_parser: str) -> None:
+    parsers = _parsers(FIXTURES[fixture])
+    markup = load_fixture(fixture)
+    expected = parsers["bs4"](BeautifulSoup(markup, html_parser)).parse()
+    assert parsers["lxml"].from_markup(markup).parse() == expected
+
+
+def test_download_box_links() -> None:
+    parser = Film2Subtitle.DOWNLOAD_PAGE_PARSERS["lxml"]
+    movie = parser.from_markup(
+        load_fixture("synthetic_movie_download_page.html")
+    ).parse()
+    assert set(movie.download_box.links) == {"download", "trailer"}
+    series = parser.from_markup(
+        load_fixture("synthetic_series_download_page.html")
+    ).parse()
+    assert series.download_box.links["S01"]["E01"].endswith("Ozark.S01E01.zip")
+    assert series.download_box.links["S01"]["all"].endswith("Ozark.S01.Complete.zip")
+
+
+@pytest.mark.parametrize(
+    "href, season, episode",
+    [
+        ("https://dl/Show.S01E01.zip", "S01", "E01"),
+        ("https://dl/Show.S01.E02.zip", "S01", "E02"),
+        ("https://dl/Show.s02-e10.zip", "s02", "e10"),
+        ("https://dl/Show.S01.720p.E03.zip", "S01", "E03"),
+        ("https://dl/Show.S01.Complete.zip", "S01", "all"),
+    ],
+)
+def test_series_link_season_and_episode(href: str, season: str, episode: str) -> None:
+    box = _build_download_box("دانلود فصل", [href])
+    assert box["links"] == {season: {episode: href}}
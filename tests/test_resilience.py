@@ -0,0 +1,76 @@
+import asyncio
+from typing import Optional
+
+import httpx
+import pytest
+
+from film2subtitle.app.handler.errors import (
+    CircuitOpenError,
+    InvalidUrlError,
+    OverloadedError,
+)
+from film2subtitle.app.handler.resilience import CircuitBreaker, RetryPolicy
+
+
+async def _call(breaker: CircuitBreaker, exc: Optional[Exception] = None) -> None:
+    async with breaker.guard():
+        if exc is not None:
+            raise exc
+
+
+def _fail(breaker: CircuitBreaker, exc: Exception) -> None:
+    with pytest.raises(type(exc)):
+        asyncio.run(_call(breaker, exc))
+
+
+def test_breaker_opens_after_consecutive_failures() -> None:
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+    _fail(breaker, httpx.ConnectError("refused"))
+    assert breaker.state == CircuitBreaker.CLOSED
+    _fail(breaker, httpx.ConnectError("refused"))
+    assert breaker.state == CircuitBreaker.OPEN
+    _fail(breaker, CircuitOpenError())
+    assert breaker.rejected == 1
+
+
+def test_local_errors_dont_reset_failures() -> None:
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+    _fail(breaker, httpx.ConnectError("refused"))
+    _fail(breaker, OverloadedError())
+    _fail(breaker, InvalidUrlError())
+    _fail(breaker, httpx.ConnectError("refused"))
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_local_error_on_probe_keeps_breaker_half_open() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+    _fail(breaker, httpx.ConnectError("refused"))
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    _fail(breaker, OverloadedError())
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # the probe is released, so the next request probes the upstream
+    asyncio.run(_call(breaker))
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_failed_probe_opens_breaker_again() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+    _fail(breaker, httpx.ConnectError("refused"))
+    _fail(breaker, httpx.ReadTimeout("timeout"))
+    assert breaker.opened == 2
+
+
+def test_retry_policy_retries_transport_errors_only() -> None:
+    policy = RetryPolicy(retries=2, backoff=0)
+    calls = 0
+
+    async def flaky() -> str:
+        nonlocal calls
+        calls += 1
+        if calls < 3:
+            raise httpx.ConnectError("refused")
+        return "ok"
+
+    assert asyncio.run(policy.run(flaky)) == "ok"
+    assert policy.count == 2
+    assert not policy.should_retry(OverloadedError())
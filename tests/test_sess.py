@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from benchmarks.upstream import UpstreamConfig
+from film2subtitle.app.handler.errors import Film2SubtitleAPIError
+from film2subtitle.app.handler.limiter import AdaptiveLimiter
+from tests.conftest import make_api
+
+
+def _overloaded_api() -> tuple:
+    limiter = AdaptiveLimiter(initial_limit=8, latency_target=0.0)
+    return make_api(UpstreamConfig(errors={503: 1.0}), limiter=limiter), limiter
+
+
+def test_stream_overload_shrinks_window() -> None:
+    async def main() -> None:
+        api, limiter = _overloaded_api()
+        try:
+            with pytest.raises(Film2SubtitleAPIError):
+                async with api.stream("2022/Ozark.S01E01.zip"):
+                    pass
+            assert limiter.limit == 4
+            assert limiter.stats.in_flight == 0
+        finally:
+            await api.close()
+
+    asyncio.run(main())
+
+
+def test_iter_elements_overload_shrinks_window() -> None:
+    async def main() -> None:
+        api, limiter = _overloaded_api()
+        try:
+            with pytest.raises(Film2SubtitleAPIError):
+                async for _ in api.iter_elements("", {"sub-article-detail"}):
+                    pass
+            assert limiter.limit == 4
+        finally:
+            await api.close()
+
+    asyncio.run(main())
+
+
+def test_iter_elements_yields_articles() -> None:
+    async def main() -> int:
+        api = make_api()
+        try:
+            return len(
+                [
+                    element
+                    async for element in api.iter_elements(
+                        "",
+                        {"sub-article-detail"},
+                    )
+                ],
+            )
+        finally:
+            await api.close()
+
+    assert asyncio.run(main()) == 10
@@ -0,0 +1,43 @@
+import pickle
+
+from lxml import etree
+
+from film2subtitle.app.handler.types import DownloadBox, SubtitleMetadata
+from film2subtitle.app.schemas.subtitles import MediaType
+
+
+def _metadata(**kwargs) -> SubtitleMetadata:
+    values = dict(
+        name="Ozark",
+        duration="60",
+        language="فارسی",
+        country="USA",
+        subtitle_file_format="SRT",
+        quality="WEB-DL",
+    )
+    values.update(kwargs)
+    return SubtitleMetadata(**values)
+
+
+def test_metadata_interns_lxml_strings() -> None:
+    quality = etree.fromstring("<p>WEB-DL</p>").xpath("text()")[0]
+    assert type(quality) is not str
+    metadata = _metadata(quality=quality, country=None)
+    assert type(metadata.quality) is str
+    assert metadata.quality is _metadata().quality
+    assert metadata.country is None
+
+
+def test_metadata_pickle_round_trip() -> None:
+    metadata = _metadata()
+    copy = pickle.loads(pickle.dumps(metadata))
+    assert copy == metadata
+    assert copy.language is metadata.language
+
+
+def test_download_box_interns_lxml_keys() -> None:
+    key = etree.fromstring("<p>S01</p>").xpath("text()")[0]
+    box = DownloadBox(
+        media_type=MediaType.SERIES, links={key: {"E01": "https://dl/e1"}}
+    )
+    assert [type(k) for k in box.links] == [str]
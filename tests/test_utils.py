@@ -0,0 +1,32 @@
+import pytest
+
+from film2subtitle.app.handler.utils import valid_film2subtitle_url
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://film2subtitle.com/ozark/",
+        "https://www.film2subtitle.com/2022/Ozark.S01E01.zip",
+        "http://dl.film2subtitle.com/Ozark.S01E01.zip",
+    ],
+)
+def test_film2subtitle_urls_are_valid(url: str) -> None:
+    assert valid_film2subtitle_url(url)
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "http://169.254.169.254/latest/meta-data/?film2subtitle.com",
+        "https://evil.com/x.zip#film2subtitle.com",
+        "http://10.0.0.1:8080/film2subtitle.com",
+        "https://film2subtitle.com.evil.com/x.zip",
+        "https://evilfilm2subtitle.com/x.zip",
+        "https://user@film2subtitle.com/x.zip",
+        "ftp://film2subtitle.com/x.zip",
+        "film2subtitle.com/x.zip",
+    ],
+)
+def test_other_urls_are_invalid(url: str) -> None:
+    assert not valid_film2subtitle_url(url)